@@ -0,0 +1,29 @@
+"""Lazily created services shared by the API routes.
+
+Services are only built when a route first needs them, so importing the
+application does not open database connections.
+"""
+
+from functools import lru_cache
+
+from auth_service.services.auth import AuthService
+from auth_service.services.token import TokenService
+from auth_service.services.user import UserService
+
+
+@lru_cache(maxsize=1)
+def get_auth_service() -> AuthService:
+    """Return the shared AuthService instance."""
+    return AuthService()
+
+
+@lru_cache(maxsize=1)
+def get_token_service() -> TokenService:
+    """Return the shared TokenService instance."""
+    return TokenService()
+
+
+@lru_cache(maxsize=1)
+def get_user_service() -> UserService:
+    """Return the shared UserService instance."""
+    return UserService()
@@ -0,0 +1,65 @@
+"""Routes for the authentication audit log."""
+
+import hmac
+from typing import Iterator
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from auth_service.core.config import settings
+from auth_service.services.audit import AuditLog, get_audit_log
+
+audit_router = APIRouter(prefix="/audit", tags=["audit"])
+
+security = HTTPBearer()
+
+
+def _ndjson(events) -> Iterator[bytes]:
+    """Serialize events one per line, exposing `_id` as `id`."""
+    for event in events:
+        event["id"] = str(event.pop("_id"))
+        yield orjson.dumps(
+            event, option=orjson.OPT_NAIVE_UTC | orjson.OPT_APPEND_NEWLINE
+        )
+
+
+@audit_router.get("/events")
+async def export_events(
+    limit: int = Query(1000, ge=1, le=100000),
+    after: str | None = Query(None),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    audit_log: AuditLog = Depends(get_audit_log),
+):
+    """Stream audit events as NDJSON, oldest first.
+
+    Requires the `AUDIT_EXPORT_TOKEN` as bearer token. To resume an export,
+    pass the `id` of the last event received as `after`.
+
+    ### Args:
+    - **limit** (`int`): The maximum number of events to return.
+    - **after** (`str`): The `id` of the last event already exported.
+
+    ### Returns:
+    - **StreamingResponse**: One JSON event per line.
+    """
+    if not settings.AUDIT_EXPORT_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if not hmac.compare_digest(
+        credentials.credentials.encode(), settings.AUDIT_EXPORT_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid audit export token",
+        )
+    try:
+        events = audit_log.export(after=after, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    return StreamingResponse(
+        _ndjson(events), media_type="application/x-ndjson"
+    )
@@ -1,35 +1,55 @@
 """Routes for the auth service"""
 
+import math
+
 from fastapi import (
     APIRouter,
     Depends,
     status,
     Request,
     HTTPException,
-    Response,
 )
-from fastapi.responses import JSONResponse
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from fastapi.security import HTTPBearer
 
+from auth_service.api.dependencies import (
+    get_auth_service,
+    get_token_service,
+    get_user_service,
+)
 from auth_service.db.enums import TokenType
-from auth_service.db.schemas import UserCreate, LoginRequest
+from auth_service.db.schemas import (
+    AccessTokenResponse,
+    LoginRequest,
+    MessageResponse,
+    UserCreate,
+)
 from auth_service.services.auth import AuthService
+from auth_service.services.lockout import AccountLocked
 from auth_service.services.token import (
     TokenService,
     TokenRefreshError,
     TokenReuseDetected,
 )
+from auth_service.services.user import UserService
+from auth_service.core.breached_passwords import BreachedPasswordError
 from auth_service.core.config import settings
 
 auth_router = APIRouter(prefix="/auth", tags=["authentication"])
-auth_service = AuthService()
-token_service = TokenService()
 
 security = HTTPBearer()
 
 
-@auth_router.post("/register")
-async def register(user: UserCreate):
+@auth_router.post(
+    "/register",
+    status_code=status.HTTP_201_CREATED,
+    response_model=MessageResponse,
+)
+async def register(
+    user: UserCreate,
+    auth_service: AuthService = Depends(get_auth_service),
+):
     """
     Register endpoint to create a user and sent account activation email.
 
@@ -37,12 +57,12 @@ async def register(user: UserCreate):
     - **user** (`UserCreate`): The user to register.
 
     ### Returns:
-    - **dict**: The registered user.
+    - **MessageResponse**: The registration status message.
     """
     try:
         response = await auth_service.register_user(user)
         if response:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=status.HTTP_201_CREATED,
                 content={
                     "message": "User registered successfully. "
@@ -54,6 +74,11 @@ async def register(user: UserCreate):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Failed to register user",
             )
+    except BreachedPasswordError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -61,12 +86,34 @@ async def register(user: UserCreate):
         )
 
 
+@auth_router.get("/verify", response_model=MessageResponse)
+async def verify_email(
+    token: str,
+    auth_service: AuthService = Depends(get_auth_service),
+    user_service: UserService = Depends(get_user_service),
+):
+    """
+    Verify endpoint to activate a user's email with the emailed token.
+
+    ### Args:
+    - **token** (`str`): The activation token from the verification email.
+
+    ### Returns:
+    - **MessageResponse**: The verification status message.
+    """
+    return await auth_service.verify_user_email(token, user_service)
+
+
 @auth_router.post(
     "/login",
     status_code=status.HTTP_200_OK,
+    response_model=AccessTokenResponse,
 )
 async def login(
-    credentials: LoginRequest, request: Request, response: Response
+    credentials: LoginRequest,
+    request: Request,
+    auth_service: AuthService = Depends(get_auth_service),
+    token_service: TokenService = Depends(get_token_service),
 ):
     """
     Login endpoint to authenticate a user and provide access tokens.
@@ -74,12 +121,26 @@ async def login(
     ### Args:
     - **credentials** (`LoginRequest`): The user's login credentials.
     - **request** (`Request`): The incoming HTTP request.
-    - **response** (`Response`): The outgoing HTTP response.
 
     ### Returns:
-    - **dict**: The access token.
+    - **AccessTokenResponse**: The access token.
     """
-    user = auth_service.authenticate_user(credentials)
+    device_info = request.headers.get("User-Agent", "unknown")
+    ip_address = request.client.host if request.client else "unknown"
+
+    try:
+        # bcrypt runs off the event loop so logins do not stall other routes.
+        user = await run_in_threadpool(
+            auth_service.authenticate_user, credentials, ip_address
+        )
+    except AccountLocked as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
+    except ValueError:
+        user = None
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -87,15 +148,15 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    device_info = request.headers.get("User-Agent", "unknown")
-    ip_address = request.client.host if request.client else "unknown"
-
     token_pair = await token_service.create_token_pair(
         user_data=user,
         device_info=device_info,
         ip_address=ip_address,
     )
 
+    response = ORJSONResponse(
+        content={"access_token": token_pair.access_token}
+    )
     response.set_cookie(
         key="refresh_token",
         value=token_pair.refresh_token,
@@ -104,22 +165,23 @@ async def login(
         samesite="lax",
         max_age=settings.JWT_REFRESH_TOKEN_EXPIRE_MINUTES * 60,
     )
-    return {"access_token": token_pair.access_token}
+    return response
 
 
 @auth_router.get(
     "/refresh",
     status_code=status.HTTP_200_OK,
+    response_model=AccessTokenResponse,
 )
 async def refresh_token(
     request: Request,
-    response: Response,
+    token_service: TokenService = Depends(get_token_service),
 ):
     """
     Refresh access token using refresh token.
 
     ### Returns:
-    - **dict**: New access and refresh tokens.
+    - **AccessTokenResponse**: The new access token.
 
     ### Raises:
     - **HTTPException**: If token is invalid or reused.
@@ -132,6 +194,9 @@ async def refresh_token(
         new_tokens = await token_service.refresh_access_token(
             refresh_token, device_info=device_info, ip_address=ip_address
         )
+        response = ORJSONResponse(
+            content={"access_token": new_tokens.access_token}
+        )
         response.set_cookie(
             key="refresh_token",
             value=new_tokens.refresh_token,
@@ -140,8 +205,7 @@ async def refresh_token(
             samesite="lax",
             max_age=settings.JWT_REFRESH_TOKEN_EXPIRE_MINUTES * 60,
         )
-        response.status_code = status.HTTP_200_OK
-        return {"access_token": new_tokens.access_token}
+        return response
     except TokenReuseDetected as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -156,12 +220,19 @@ async def refresh_token(
         )
 
 
-@auth_router.get("/logout", status_code=status.HTTP_200_OK)
-async def logout(request: Request, response: Response):
+@auth_router.get(
+    "/logout",
+    status_code=status.HTTP_200_OK,
+    response_model=MessageResponse,
+)
+async def logout(
+    request: Request,
+    token_service: TokenService = Depends(get_token_service),
+):
     """Logout a user by revoking their access token.
 
     ### Returns:
-    - **JSONResponse**: Logout status message.
+    - **MessageResponse**: Logout status message.
     """
     try:
         refresh_token = request.cookies.get("refresh_token", "")
@@ -176,15 +247,17 @@ async def logout(request: Request, response: Response):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid token",
             )
-        if token_service.revoke_token(jti):
+        if await token_service.revoke_token(jti, payload.get("username")):
+            response = ORJSONResponse(
+                content={"message": "Successfully logged out"}
+            )
             response.delete_cookie(
                 key="refresh_token",
                 httponly=True,
                 secure=False,
                 samesite="lax",
             )
-            response.status_code = status.HTTP_200_OK
-            return {"message": "Successfully logged out"}
+            return response
         else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
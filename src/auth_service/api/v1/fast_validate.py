@@ -0,0 +1,140 @@
+"""Raw ASGI fast path for token validation.
+
+Serves `GET /api/v1/token/validate` without dependency resolution, request
+and response objects or response model handling: the Authorization header
+is parsed straight from the ASGI scope, validation is delegated to the same
+`TokenService.validate_token` as the FastAPI route and the body is written
+with prebuilt headers. Error bodies are built once; success bodies are
+cached per user status, so repeated validations for a user whose status is
+unchanged skip serialization. Responses, including errors, match the
+FastAPI route.
+"""
+
+import orjson
+from fastapi import HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.security.utils import get_authorization_scheme_param
+from starlette.routing import Route
+
+from auth_service.api.dependencies import get_token_service
+from auth_service.core.cache import TTLCache
+from auth_service.core.config import settings
+from auth_service.db.enums import TokenType
+
+VALIDATE_PATH = "/api/v1/token/validate"
+
+JSON_CONTENT_TYPE = (b"content-type", b"application/json")
+
+
+def _error_body(detail: str) -> bytes:
+    return orjson.dumps({"detail": detail})
+
+
+# Errors raised by `HTTPBearer` before the token is even looked at.
+NOT_AUTHENTICATED = _error_body("Not authenticated")
+INVALID_CREDENTIALS = _error_body("Invalid authentication credentials")
+
+
+async def _respond(
+    send,
+    status_code: int,
+    body: bytes,
+    headers: dict[str, str] | None = None,
+):
+    raw_headers = [
+        JSON_CONTENT_TYPE,
+        (b"content-length", str(len(body)).encode()),
+    ]
+    if headers:
+        raw_headers.extend(
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in headers.items()
+        )
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": raw_headers,
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class FastValidateEndpoint:
+    """ASGI application validating the bearer token of a request."""
+
+    def __init__(self):
+        """Initialize the FastValidateEndpoint class."""
+        # Serialized success bodies, sized like the status cache of the
+        # token service. The key holds every field of the body, so a cached
+        # body is never stale.
+        self.success_bodies = TTLCache(
+            maxsize=settings.STATUS_CACHE_SIZE,
+            ttl=settings.STATUS_CACHE_TTL_SECONDS,
+        )
+
+    def success_body(self, result: dict) -> bytes:
+        """Return the serialized validation result, cached per status.
+
+        Args:
+            result (dict): The result of `TokenService.validate_token`.
+
+        Returns:
+            bytes: The JSON body.
+        """
+        user = result["user"]
+        key = (
+            user["username"],
+            user["email"],
+            user["verified"],
+            user["active"],
+            result.get("degraded", False),
+        )
+        body = self.success_bodies.get(key)
+        if body is None:
+            body = orjson.dumps(result)
+            self.success_bodies.set(key, body)
+        return body
+
+    async def __call__(self, scope, receive, send):
+        authorization = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization = value.decode("latin-1")
+                break
+        scheme, credentials = get_authorization_scheme_param(authorization)
+        if not (authorization and scheme and credentials):
+            await _respond(send, status.HTTP_403_FORBIDDEN, NOT_AUTHENTICATED)
+            return
+        if scheme.lower() != "bearer":
+            await _respond(
+                send, status.HTTP_403_FORBIDDEN, INVALID_CREDENTIALS
+            )
+            return
+
+        try:
+            result = await get_token_service().validate_token(
+                HTTPAuthorizationCredentials(
+                    scheme=scheme, credentials=credentials
+                ),
+                expected_type=TokenType.BEARER,
+            )
+        except HTTPException as e:
+            await _respond(
+                send, e.status_code, _error_body(e.detail), e.headers
+            )
+            return
+        await _respond(send, status.HTTP_200_OK, self.success_body(result))
+
+
+def fast_validate_route() -> Route:
+    """Build the route to insert ahead of the FastAPI validation route."""
+    route = Route(
+        VALIDATE_PATH,
+        endpoint=FastValidateEndpoint(),
+        methods=["GET"],
+        include_in_schema=False,
+    )
+    # Starlette adds HEAD to GET routes, the FastAPI route answers 405.
+    route.methods = {"GET"}
+    return route
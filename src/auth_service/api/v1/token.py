@@ -1,21 +1,35 @@
 """Routers for token management."""
 
-from fastapi import APIRouter, Depends, status, Request
-from fastapi.responses import JSONResponse
+import hmac
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from auth_service.api.dependencies import get_token_service
+from auth_service.core.config import settings
 from auth_service.db.enums import TokenType
+from auth_service.db.schemas import (
+    IntrospectionRequest,
+    IntrospectionResponse,
+    TokenPairResponse,
+    TokenValidationResponse,
+)
 from auth_service.services.token import TokenService
 
 token_router = APIRouter(prefix="/token", tags=["token"])
-token_service = TokenService()
 
 security = HTTPBearer()
 
+# Missing credentials are answered with 401, like invalid ones.
+introspection_security = HTTPBearer(auto_error=False)
+
 
-@token_router.get("/validate")
+@token_router.get("/validate", response_model=TokenValidationResponse)
 async def validate_token(
     access_token: HTTPAuthorizationCredentials = Depends(security),
+    token_service: TokenService = Depends(get_token_service),
 ):
     """This route validates a user's token.
 
@@ -23,21 +37,60 @@ async def validate_token(
     - **access_token** (`HTTPAuthorizationCredentials`): The access token.
 
     ### Returns:
-    - **JSONResponse**: The validation status.
+    - **TokenValidationResponse**: The validation status.
     """
     result = await token_service.validate_token(
         access_token, expected_type=TokenType.BEARER
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_200_OK,
         content=result,
     )
 
 
-@token_router.get("/refresh")
+@token_router.post("/introspect", response_model=IntrospectionResponse)
+async def introspect_tokens(
+    request: IntrospectionRequest,
+    credentials: HTTPAuthorizationCredentials | None = Depends(
+        introspection_security
+    ),
+    token_service: TokenService = Depends(get_token_service),
+):
+    """This route introspects a batch of tokens in a single call.
+
+    Requires the `INTROSPECTION_TOKEN` as bearer token.
+
+    ### Args:
+    - **request** (`IntrospectionRequest`): The tokens to introspect, at most
+      `INTROSPECTION_MAX_TOKENS` of them.
+
+    ### Returns:
+    - **IntrospectionResponse**: One result per token, in request order.
+    """
+    if not settings.INTROSPECTION_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if credentials is None or not hmac.compare_digest(
+        credentials.credentials.encode(), settings.INTROSPECTION_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid introspection token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    results = await token_service.introspect_tokens(
+        request.tokens, expected_type=request.token_type
+    )
+    return ORJSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={"results": results},
+    )
+
+
+@token_router.get("/refresh", response_model=TokenPairResponse)
 async def refresh_access_token(
     request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
+    token_service: TokenService = Depends(get_token_service),
 ):
     """This route refreshes a user's access token.
 
@@ -45,12 +98,13 @@ async def refresh_access_token(
     - **refresh_token** (`HTTPAuthorizationCredentials`): The refresh token.
 
     ### Returns:
-    - **dict**: The new access token.
+    - **TokenPairResponse**: The new access and refresh tokens.
     """
     refresh_token = credentials.credentials
 
     device_info = request.headers.get("User-Agent", "unknown")
     ip_address = request.client.host if request.client else "unknown"
-    return await token_service.refresh_access_token(
+    token_pair = await token_service.refresh_access_token(
         refresh_token, device_info=device_info, ip_address=ip_address
     )
+    return ORJSONResponse(content=asdict(token_pair))
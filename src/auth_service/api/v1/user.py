@@ -1,36 +1,123 @@
 """Routes for user endpoint."""
 
+from email.utils import format_datetime, parsedate_to_datetime
+
 from fastapi import (
     APIRouter,
     Depends,
     status,
     HTTPException,
+    Query,
+    Request,
 )
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pymongo.errors import PyMongoError
 
+from auth_service.api.dependencies import (
+    get_token_service,
+    get_user_service,
+)
+from auth_service.core.circuit_breaker import CircuitOpenError
 from auth_service.db.enums import TokenType
-from auth_service.services.user import UserService
+from auth_service.db.models import BasicUserInfo
+from auth_service.db.schemas import MessageResponse, SessionPage
+from auth_service.services.user import UserProfile, UserService
 from auth_service.services.token import TokenService
 
 user_router = APIRouter(prefix="/user", tags=["user"])
-user_service = UserService()
-token_service = TokenService()
 
 security = HTTPBearer()
 
 
-@user_router.get("/me")
+async def get_current_username(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    token_service: TokenService = Depends(get_token_service),
+) -> str:
+    """Resolve the username of the bearer token owner.
+
+    ### Raises:
+    - **HTTPException**: If the token is invalid or carries no username.
+    """
+    try:
+        payload = await token_service.decode_token(
+            credentials.credentials, expected_type=TokenType.BEARER
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    username = payload.get("username")
+    if not username:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Unable to extract username from token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return username
+
+
+async def get_current_session_id(
+    request: Request,
+    token_service: TokenService = Depends(get_token_service),
+) -> str | None:
+    """Resolve the session of the refresh token cookie, if any."""
+    refresh_token = request.cookies.get("refresh_token")
+    if not refresh_token:
+        return None
+    try:
+        payload = await token_service.decode_token(
+            refresh_token, expected_type=TokenType.REFRESH
+        )
+    except ValueError:
+        return None
+    return payload.get("token_family")
+
+
+def _not_modified(request: Request, profile: UserProfile) -> bool:
+    """Evaluate the conditional request headers against a profile."""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        etags = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }
+        return "*" in etags or profile.etag in etags
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since is None or profile.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return since.tzinfo is not None and profile.last_modified <= since
+
+
+@user_router.get(
+    "/me",
+    response_model=BasicUserInfo,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}},
+)
 async def me(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
+    token_service: TokenService = Depends(get_token_service),
+    user_service: UserService = Depends(get_user_service),
 ):
     """Get user information based on the access token.
 
+    Responses carry an `ETag` and `Last-Modified`; a request whose
+    `If-None-Match` (or `If-Modified-Since`) matches the current profile is
+    answered with `304 Not Modified`.
+
     ### Args:
+    - **request** (`Request`): The incoming HTTP request.
     - **credentials** (`HTTPAuthorizationCredentials`): The bearer token
         credentials.
 
     ### Returns:
-    - **User**: User information.
+    - **BasicUserInfo**: User information.
     """
     try:
         bearer_token = credentials.credentials
@@ -40,11 +127,98 @@ async def me(
         username = payload.get("username")
         if not username:
             raise ValueError("unable to extract username from token")
-        return user_service.get_user(username=username)
-    except HTTPException as e:
+        profile = await user_service.get_profile(username=username)
+    except (HTTPException, CircuitOpenError, PyMongoError) as e:
         raise e
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid token: {str(e)}",
         )
+    headers = {"ETag": profile.etag, "Cache-Control": "private, no-cache"}
+    if profile.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            profile.last_modified, usegmt=True
+        )
+    if _not_modified(request, profile):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+    return Response(
+        content=profile.body, media_type="application/json", headers=headers
+    )
+
+
+@user_router.get("/sessions", response_model=SessionPage)
+async def list_sessions(
+    limit: int = Query(20, ge=1, le=100),
+    after: str | None = Query(None),
+    username: str = Depends(get_current_username),
+    current_session_id: str | None = Depends(get_current_session_id),
+    token_service: TokenService = Depends(get_token_service),
+):
+    """List the active sessions of the current user, newest first.
+
+    ### Args:
+    - **limit** (`int`): The maximum number of sessions to return.
+    - **after** (`str`): The `next_cursor` of the previous page.
+
+    ### Returns:
+    - **SessionPage**: The sessions and the cursor of the next page.
+    """
+    try:
+        sessions, next_cursor = await token_service.list_sessions(
+            username, limit=limit, after=after
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    for session in sessions:
+        session["current"] = session["session_id"] == current_session_id
+    return ORJSONResponse(
+        content={"sessions": sessions, "next_cursor": next_cursor}
+    )
+
+
+@user_router.delete("/sessions/{session_id}", response_model=MessageResponse)
+async def revoke_session(
+    session_id: str,
+    username: str = Depends(get_current_username),
+    token_service: TokenService = Depends(get_token_service),
+):
+    """Revoke one of the current user's sessions.
+
+    ### Args:
+    - **session_id** (`str`): The session to revoke.
+
+    ### Returns:
+    - **MessageResponse**: Revocation status message.
+    """
+    if not await token_service.revoke_session(username, session_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found",
+        )
+    return ORJSONResponse(content={"message": "Session revoked"})
+
+
+@user_router.delete("/sessions", response_model=MessageResponse)
+async def revoke_other_sessions(
+    username: str = Depends(get_current_username),
+    current_session_id: str | None = Depends(get_current_session_id),
+    token_service: TokenService = Depends(get_token_service),
+):
+    """Log out every other device of the current user.
+
+    The session of the `refresh_token` cookie is kept; every session is
+    revoked when the cookie is absent.
+
+    ### Returns:
+    - **MessageResponse**: Revocation status message.
+    """
+    revoked = await token_service.revoke_other_sessions(
+        username, current_session_id
+    )
+    return ORJSONResponse(content={"message": f"Revoked {revoked} sessions"})
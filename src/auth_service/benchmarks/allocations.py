@@ -0,0 +1,217 @@
+"""Benchmark the memory allocated per login and per token validation.
+
+Measured with tracemalloc, so only allocations made by Python code count;
+memory allocated by the bcrypt and cryptography libraries themselves is
+not included.
+
+The first table compares the internal records of the login path before
+and after the move to slotted dataclasses (`auth_service.db.records`): the
+bytes kept per instance, and the peak allocated while building one. The
+previous types are recreated here.
+
+The second table runs the service layer of a login
+(`AuthService.authenticate_user` and `TokenService.create_token_pair`) and
+of a validation (`TokenService.validate_token`) and reports the median and
+p99 peak allocated above the baseline during one call, which covers the
+throwaway objects of the call. A scratch user, hashed with the minimum
+bcrypt cost, is created for the run and removed afterwards.
+
+Usage:
+    MONGO_BACKEND=memory python -m auth_service.benchmarks.allocations
+"""
+
+import argparse
+import asyncio
+import gc
+import statistics
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from fastapi.security import HTTPAuthorizationCredentials
+from passlib.hash import bcrypt
+
+from auth_service.core.config import settings
+from auth_service.db.connection import get_mongo_connection
+from auth_service.db.enums import TokenType
+from auth_service.db.models import User, to_basic_user_info
+from auth_service.db.records import CompactionReport, TokenMetadata, TokenPair
+from auth_service.db.schemas import LoginRequest
+from auth_service.services.auth import AuthService
+from auth_service.services.token import TokenService
+
+BENCHMARK_PASSWORD = "benchmark-allocations-password"
+BENCHMARK_USER = {
+    "username": "benchmark-allocations",
+    "username_normalized": "benchmark-allocations",
+    "email": "benchmark-allocations@example.com",
+    "email_normalized": "benchmark-allocations@example.com",
+    "password": bcrypt.using(rounds=4).hash(BENCHMARK_PASSWORD),
+    "verified": True,
+    "active": True,
+    "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    "updated_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+}
+EXPIRES_AT = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class LegacyTokenPair:
+    """The token pair as it was, without slots."""
+
+    access_token: str
+    refresh_token: str
+    token_type: str = "Bearer"
+
+
+@dataclass
+class LegacyCompactionReport:
+    """The compaction report as it was, without slots."""
+
+    reclaimed_documents: int = 0
+    family_updates: int = 0
+    batches: int = 0
+    index_size_before: int = 0
+    index_size_after: int = 0
+
+
+RECORD_CASES = [
+    (
+        "token pair",
+        lambda: LegacyTokenPair(access_token="a", refresh_token="r"),
+        lambda: TokenPair(access_token="a", refresh_token="r"),
+    ),
+    (
+        "token metadata",
+        lambda: {
+            "jti": "j",
+            "token_family": "f",
+            "expires_at": EXPIRES_AT,
+            "username": "u",
+        },
+        lambda: TokenMetadata(
+            jti="j", username="u", expires_at=EXPIRES_AT, token_family="f"
+        ),
+    ),
+    (
+        "compaction report",
+        LegacyCompactionReport,
+        CompactionReport,
+    ),
+    (
+        "login user info",
+        lambda: User(**BENCHMARK_USER).model_dump(
+            exclude={"password", "created_at", "updated_at"}
+        ),
+        lambda: to_basic_user_info(BENCHMARK_USER),
+    ),
+]
+
+
+def kept_bytes(factory, count: int) -> float:
+    """Return the bytes kept per instance when `count` are alive."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory() for _ in range(count)]
+    kept = tracemalloc.get_traced_memory()[0] - before
+    kept -= sys.getsizeof(instances)
+    return kept / count
+
+
+def peak_bytes(func) -> int:
+    """Return the peak allocated above the baseline during one call."""
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    func()
+    return tracemalloc.get_traced_memory()[1] - before
+
+
+async def async_peak_bytes(coroutine_function) -> int:
+    """Return the peak allocated above the baseline during one await."""
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    await coroutine_function()
+    return tracemalloc.get_traced_memory()[1] - before
+
+
+def report_records(count: int):
+    """Print the per-instance cost of the previous and current records."""
+    print(
+        f"{'record':<20}{'kept before':>13}{'kept after':>12}"
+        f"{'peak before':>13}{'peak after':>12}"
+    )
+    for name, legacy, current in RECORD_CASES:
+        print(
+            f"{name:<20}{kept_bytes(legacy, count):>12.0f}B"
+            f"{kept_bytes(current, count):>11.0f}B"
+            f"{peak_bytes(legacy):>12}B{peak_bytes(current):>11}B"
+        )
+
+
+async def report_service_calls(iterations: int):
+    """Print the peak allocated per login and per validation."""
+    auth_service = AuthService()
+    token_service = TokenService()
+    credentials = LoginRequest(
+        username=BENCHMARK_USER["username"], password=BENCHMARK_PASSWORD
+    )
+    access_token = None
+
+    async def login():
+        nonlocal access_token
+        user = auth_service.authenticate_user(credentials, "127.0.0.1")
+        token_pair = await token_service.create_token_pair(
+            user_data=user, device_info="benchmark", ip_address="127.0.0.1"
+        )
+        access_token = token_pair.access_token
+
+    async def validate():
+        await token_service.validate_token(
+            HTTPAuthorizationCredentials(
+                scheme="Bearer", credentials=access_token
+            ),
+            TokenType.BEARER,
+        )
+
+    # One untraced round builds the caches and imports lazy modules.
+    await login()
+    await validate()
+    print(f"{'call':<20}{'median peak':>13}{'p99 peak':>12}")
+    for name, call in (("login", login), ("validate", validate)):
+        peaks = [await async_peak_bytes(call) for _ in range(iterations)]
+        p99 = statistics.quantiles(peaks, n=100)[98]
+        print(f"{name:<20}{statistics.median(peaks):>12.0f}B{p99:>11.0f}B")
+
+
+def main():
+    """Run the allocation benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--records",
+        type=int,
+        default=10_000,
+        help="instances kept alive to measure each record",
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    users = get_mongo_connection().get_collection(settings.USER_COLLECTION)
+    users.insert_one(dict(BENCHMARK_USER))
+    tracemalloc.start()
+    try:
+        report_records(args.records)
+        print()
+        asyncio.run(report_service_calls(args.iterations))
+    finally:
+        tracemalloc.stop()
+        users.delete_one(
+            {"username_normalized": BENCHMARK_USER["username_normalized"]}
+        )
+        get_mongo_connection().db.refresh_tokens.delete_many(
+            {"username": BENCHMARK_USER["username_normalized"]}
+        )
+
+
+if __name__ == "__main__":
+    main()
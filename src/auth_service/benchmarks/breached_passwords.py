@@ -0,0 +1,67 @@
+"""Benchmark breached password lookups against a bcrypt hash.
+
+Looks up known and unknown digests in a digest file and reports the mean
+lookup time next to the cost of the bcrypt hash that registration performs
+anyway. Without `--file` a synthetic file of `--records` random digests is
+generated in a temporary directory.
+
+Usage:
+    python -m auth_service.benchmarks.breached_passwords --records 1000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import timeit
+
+from passlib.context import CryptContext
+
+from auth_service.core.breached_passwords import (
+    RECORD_SIZE,
+    BreachedPasswordIndex,
+)
+
+
+def _write_synthetic(path: str, records: int):
+    digests = sorted(os.urandom(RECORD_SIZE) for _ in range(records))
+    with open(path, "wb") as output:
+        output.writelines(digests)
+
+
+def main():
+    """Run the lookup benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", help="existing digest file")
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = args.file
+        if path is None:
+            path = os.path.join(workdir, "digests")
+            _write_synthetic(path, args.records)
+        index = BreachedPasswordIndex(path)
+        hits = [
+            index._record(random.randrange(index.count))
+            for _ in range(args.lookups)
+        ]
+        misses = [os.urandom(RECORD_SIZE) for _ in range(args.lookups)]
+        assert all(index.contains_digest(digest) for digest in hits)
+
+        print(f"{index.count} digests in {path}")
+        for name, digests in (("hit", hits), ("miss", misses)):
+            seconds = timeit.timeit(
+                lambda: [index.contains_digest(d) for d in digests], number=1
+            )
+            print(f"{name:<8}{seconds / len(digests) * 1e6:>10.2f} us")
+        index.close()
+
+    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    seconds = timeit.timeit(lambda: pwd_context.hash("benchmark"), number=5)
+    print(f"{'bcrypt':<8}{seconds / 5 * 1e6:>10.2f} us")
+
+
+if __name__ == "__main__":
+    main()
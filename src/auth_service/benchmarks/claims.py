@@ -0,0 +1,108 @@
+"""Benchmark token size and encode/decode cost per claim profile.
+
+For each claim profile and signing algorithm, reports the size of an access
+token and of the `Authorization` header carrying it, and the median cost of
+signing it (as the signing executor does, with the key parsed once) and of
+`TokenUtils.decode_token`. RS256 uses the configured keys; ES256 uses a
+P-256 key generated for the run, which is what `JWT_KEYS_DIR` would have to
+contain to switch algorithms.
+
+Usage:
+    python -m auth_service.benchmarks.claims --rounds 200
+"""
+
+import argparse
+import statistics
+import time
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from auth_service.core.config import settings
+from auth_service.core.signing import load_signing_key, sign_batch
+from auth_service.core.token import CLAIM_PROFILES, TokenUtils
+from auth_service.db.enums import TokenType
+
+# What `authenticate_user` hands to `create_token_pair` on login.
+USER_DATA = {
+    "username": "benchmark.user",
+    "email": "benchmark.user@example.com",
+    "verified": True,
+    "active": True,
+}
+
+
+def ec_key_pair() -> tuple[str, str]:
+    """Generate a PEM encoded P-256 key pair."""
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return private_pem.decode(), public_pem.decode()
+
+
+def median_us(function, rounds: int) -> float:
+    """Return the median duration of `function()` in microseconds."""
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1_000_000
+
+
+def measure(profile: str, rounds: int) -> tuple[int, int, float, float]:
+    """Measure access tokens of one profile with the current settings."""
+    claims, _ = TokenUtils.build_claims(
+        USER_DATA, TokenType.BEARER, profile=profile
+    )
+    (token,) = sign_batch([claims])
+    decoded = TokenUtils.decode_token(token, TokenType.BEARER)
+    if decoded["username"] != USER_DATA["username"]:
+        raise SystemExit(f"{profile}: username lost in {decoded!r}")
+    header = f"Authorization: Bearer {token}\r\n"
+    return (
+        len(token),
+        len(header),
+        median_us(lambda: sign_batch([claims]), rounds),
+        median_us(
+            lambda: TokenUtils.decode_token(token, TokenType.BEARER), rounds
+        ),
+    )
+
+
+def main():
+    """Run the claim profile benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    keys = {
+        "RS256": (settings.JWT_PRIVATE_KEY, settings.JWT_PUBLIC_KEY),
+        "ES256": ec_key_pair(),
+    }
+    print(
+        f"{'algorithm':<11}{'profile':<10}{'token B':>9}{'header B':>10}"
+        f"{'encode us':>11}{'decode us':>11}"
+    )
+    for algorithm, (private_key, public_key) in keys.items():
+        settings.JWT_ALGORITHM = algorithm
+        settings.JWT_PRIVATE_KEY = private_key
+        settings.JWT_PUBLIC_KEY = public_key
+        load_signing_key(private_key, algorithm)
+        for profile in CLAIM_PROFILES:
+            size, header, encode, decode = measure(profile, args.rounds)
+            print(
+                f"{algorithm:<11}{profile:<10}{size:>9}{header:>10}"
+                f"{encode:>11.0f}{decode:>11.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
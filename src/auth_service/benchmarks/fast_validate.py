@@ -0,0 +1,136 @@
+"""Benchmark the raw ASGI validation route against the FastAPI route.
+
+Both variants are driven in-process through the complete application,
+middlewares included, by calling it with prebuilt ASGI scopes, so only the
+cost of the service itself is measured. A scratch user is created in the
+configured user collection for the run and removed afterwards.
+
+Usage:
+    python -m auth_service.benchmarks.fast_validate --requests 5000
+"""
+
+import argparse
+import asyncio
+import time
+
+from auth_service.api.v1.fast_validate import (
+    VALIDATE_PATH,
+    FastValidateEndpoint,
+    fast_validate_route,
+)
+from auth_service.core.config import settings
+from auth_service.core.token import TokenUtils
+from auth_service.db.connection import get_mongo_connection
+from auth_service.main import api
+
+BENCHMARK_USER = {
+    "username": "benchmark-fast-validate",
+    "username_normalized": "benchmark-fast-validate",
+    "email": "benchmark-fast-validate@example.com",
+    "email_normalized": "benchmark-fast-validate@example.com",
+    "verified": True,
+    "active": True,
+}
+
+
+async def call(authorization: bytes | None) -> tuple[int, bytes]:
+    """Send one validation request through the application."""
+    headers = [(b"host", b"benchmark")]
+    if authorization is not None:
+        headers.append((b"authorization", authorization))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": VALIDATE_PATH,
+        "raw_path": VALIDATE_PATH.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await api(scope, receive, send)
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return messages[0]["status"], body
+
+
+async def measure(authorization: bytes, requests: int) -> float:
+    """Return the sequential throughput in requests per second."""
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(authorization)
+    return requests / (time.perf_counter() - start)
+
+
+async def run(requests: int):
+    """Compare the variants on identical requests."""
+    token = TokenUtils.create_access_token(
+        {key: BENCHMARK_USER[key] for key in ("username", "email")}
+    )
+    cases = {
+        "valid": b"Bearer " + token.encode(),
+        "garbage": b"Bearer not-a-token",
+        "basic": b"Basic dXNlcjpwYXNz",
+        "missing": None,
+    }
+    # Start from the FastAPI route even if FAST_VALIDATE_ENABLED is set.
+    api.router.routes[:] = [
+        route
+        for route in api.router.routes
+        if not isinstance(
+            getattr(route, "endpoint", None), FastValidateEndpoint
+        )
+    ]
+    fast_route = fast_validate_route()
+
+    # Warm up and check that both variants answer identically.
+    standard = {name: await call(auth) for name, auth in cases.items()}
+    api.router.routes.insert(0, fast_route)
+    fast = {name: await call(auth) for name, auth in cases.items()}
+    for name in cases:
+        if standard[name] != fast[name]:
+            raise SystemExit(f"{name}: {standard[name]!r} != {fast[name]!r}")
+    api.router.routes.remove(fast_route)
+
+    before = await measure(cases["valid"], requests)
+    api.router.routes.insert(0, fast_route)
+    after = await measure(cases["valid"], requests)
+    print(f"{'route':<14}{'req/s':>12}")
+    print(f"{'FastAPI':<14}{before:>12.0f}")
+    print(f"{'raw ASGI':<14}{after:>12.0f}")
+    print(f"{'gain':<14}{(after / before - 1) * 100:>11.1f}%")
+
+
+def main():
+    """Run the validation route benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    users = get_mongo_connection().get_collection(settings.USER_COLLECTION)
+    users.replace_one(
+        {"username_normalized": BENCHMARK_USER["username_normalized"]},
+        BENCHMARK_USER,
+        upsert=True,
+    )
+    try:
+        asyncio.run(run(args.requests))
+    finally:
+        users.delete_one(
+            {"username_normalized": BENCHMARK_USER["username_normalized"]}
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark projection-based user lookups against full-document fetches.
+
+Seeds a scratch collection on the configured MongoDB, then reports for each
+use case the BSON bytes returned per lookup, the median and p99 latency and
+whether the query plan was served from the index alone.
+
+Usage:
+    python -m auth_service.benchmarks.projections --users 10000
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime, timezone
+
+import bson
+from pymongo import MongoClient
+
+from auth_service.core.config import settings
+from auth_service.db.queries import (
+    USER_BASIC_INFO_PROJECTION,
+    USER_LOGIN_PROJECTION,
+    USER_PROFILE_PROJECTION,
+    USER_STATUS_INDEX,
+    USER_STATUS_PROJECTION,
+)
+
+SCRATCH_COLLECTION = "benchmark_users"
+
+CASES = [
+    ("full document", None),
+    ("validation (status)", USER_STATUS_PROJECTION),
+    ("login (hash)", USER_LOGIN_PROJECTION),
+    ("/user/me (basic info)", USER_BASIC_INFO_PROJECTION),
+    ("/user/me (profile)", USER_PROFILE_PROJECTION),
+]
+
+
+def seed(collection, users: int):
+    """Fill the scratch collection with users shaped like real ones."""
+    now = datetime.now(timezone.utc)
+    collection.drop()
+    collection.insert_many(
+        {
+            "username": f"user{i}",
+            "username_normalized": f"user{i}",
+            "email": f"user{i}@example.com",
+            "password": "$2b$12$" + "x" * 53,
+            "verified": True,
+            "active": True,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(users)
+    )
+    collection.create_index(
+        USER_STATUS_INDEX, name="username_normalized_status"
+    )
+
+
+def is_covered(collection, projection) -> bool:
+    """Return whether the lookup is answered without fetching documents."""
+    plan = collection.find(
+        {"username_normalized": "user0"}, projection
+    ).explain()
+    stats = plan.get("executionStats", {})
+    return stats.get("totalDocsExamined", 1) == 0
+
+
+def measure(collection, projection, users: int, lookups: int):
+    """Return bytes per document and latency percentiles in milliseconds."""
+    sizes, latencies = [], []
+    for i in range(lookups):
+        username = f"user{i % users}"
+        start = time.perf_counter()
+        document = collection.find_one(
+            {"username_normalized": username}, projection
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(bson.encode(document)))
+    latencies.sort()
+    return (
+        statistics.mean(sizes),
+        statistics.median(latencies),
+        latencies[int(len(latencies) * 0.99) - 1],
+    )
+
+
+def main():
+    """Run the projection benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--lookups", type=int, default=5_000)
+    args = parser.parse_args()
+
+    client = MongoClient(settings.MONGO_URI)
+    collection = client[settings.DB_NAME][SCRATCH_COLLECTION]
+    try:
+        seed(collection, args.users)
+        print(
+            f"{'use case':<24}{'bytes':>8}{'p50 ms':>10}{'p99 ms':>10}"
+            f"{'covered':>10}"
+        )
+        for name, projection in CASES:
+            size, p50, p99 = measure(
+                collection, projection, args.users, args.lookups
+            )
+            covered = is_covered(collection, projection)
+            print(
+                f"{name:<24}{size:>8.0f}{p50:>10.3f}{p99:>10.3f}"
+                f"{covered!s:>10}"
+            )
+    finally:
+        collection.drop()
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark response serialization for `/token/validate` and `/user/me`.
+
+Compares the previous path (building a `User`/`BasicUserInfo` model from the
+Mongo document and rendering it with `JSONResponse`) against the current one
+(projecting the document into a dict and rendering it once with
+`ORJSONResponse`). Only CPU time spent in the process is measured; no
+database is required.
+
+Usage:
+    python -m auth_service.benchmarks.serialization --iterations 50000
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from auth_service.db.models import BasicUserInfo, User, to_basic_user_info
+from auth_service.db.normalization import normalize_email, normalize_username
+
+SAMPLE_DOCUMENT = {
+    "username": "johndoe",
+    "username_normalized": normalize_username("johndoe"),
+    "email": "john.doe@example.com",
+    "email_normalized": normalize_email("john.doe@example.com"),
+    "password": "$2b$12$" + "x" * 53,
+    "verified": True,
+    "active": True,
+    "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    "updated_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+}
+
+
+def legacy_validate(document: dict) -> bytes:
+    """Render a validation response the way the route used to."""
+    user = User(**document)
+    content = {
+        "valid": True,
+        "user": user.model_dump(
+            exclude={
+                "password",
+                "username_normalized",
+                "email_normalized",
+                "created_at",
+                "updated_at",
+            }
+        ),
+    }
+    return JSONResponse(content=content).body
+
+
+def current_validate(document: dict) -> bytes:
+    """Render a validation response straight from the document."""
+    content = {"valid": True, "user": to_basic_user_info(document)}
+    return ORJSONResponse(content=content).body
+
+
+def legacy_me(document: dict) -> bytes:
+    """Render `/user/me` through a model and the response model encoder."""
+    user = BasicUserInfo(**document)
+    return JSONResponse(content=jsonable_encoder(user)).body
+
+
+def current_me(document: dict) -> bytes:
+    """Render `/user/me` straight from the document."""
+    return ORJSONResponse(content=to_basic_user_info(document)).body
+
+
+def measure(func, iterations: int) -> float:
+    """Return the CPU time per call in microseconds."""
+    start = time.process_time()
+    for _ in range(iterations):
+        func(SAMPLE_DOCUMENT)
+    return (time.process_time() - start) / iterations * 1_000_000
+
+
+def main():
+    """Run the serialization benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+
+    cases = [
+        ("/token/validate", legacy_validate, current_validate),
+        ("/user/me", legacy_me, current_me),
+    ]
+    print(f"{'route':<18}{'before (us)':>14}{'after (us)':>14}{'saved':>10}")
+    for route, legacy, current in cases:
+        if json.loads(legacy(SAMPLE_DOCUMENT)) != json.loads(
+            current(SAMPLE_DOCUMENT)
+        ):
+            raise SystemExit(f"{route}: response bodies differ")
+        before = measure(legacy, args.iterations)
+        after = measure(current, args.iterations)
+        saved = (before - after) / before * 100
+        print(f"{route:<18}{before:>14.2f}{after:>14.2f}{saved:>9.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark event-loop blocking of token signing per signing executor.
+
+Signs token pairs (access plus refresh, one dispatch each) from concurrent
+tasks while a ticker task sleeps 1ms at a time. The ticker's oversleep is
+the time the event loop was blocked and unable to serve other requests;
+its median, p99 and maximum are reported per executor along with the pair
+throughput. MongoDB is not used.
+
+Usage:
+    python -m auth_service.benchmarks.signing --pairs 500 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from auth_service.core.config import settings
+from auth_service.core.signing import SIGNING_MODES, SigningExecutor
+from auth_service.core.token import TokenUtils
+from auth_service.db.enums import TokenType
+
+TICK_SECONDS = 0.001
+USER_DATA = {"username": "benchmark-signing", "email": "bench@example.com"}
+
+
+async def ticker(lags: list[float], stop: asyncio.Event):
+    """Record how late every 1ms sleep wakes up."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - start - TICK_SECONDS)
+
+
+async def sign_pairs(executor: SigningExecutor, pairs: int):
+    """Sign `pairs` token pairs, one batch per pair."""
+    for _ in range(pairs):
+        access_claims, _ = TokenUtils.build_claims(USER_DATA, TokenType.BEARER)
+        refresh_claims, _ = TokenUtils.build_claims(
+            USER_DATA, TokenType.REFRESH, token_family="benchmark"
+        )
+        await executor.sign([access_claims, refresh_claims])
+
+
+async def run(mode: str, pairs: int, concurrency: int, workers: int):
+    """Measure one executor and return its row of the report."""
+    executor = SigningExecutor(mode, workers)
+    try:
+        # Warm up, which also starts the pool's workers.
+        await asyncio.gather(
+            *(sign_pairs(executor, 1) for _ in range(workers))
+        )
+        lags: list[float] = []
+        stop = asyncio.Event()
+        tick_task = asyncio.create_task(ticker(lags, stop))
+        per_task = max(1, pairs // concurrency)
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(sign_pairs(executor, per_task) for _ in range(concurrency))
+        )
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await tick_task
+    finally:
+        executor.shutdown()
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+    return (
+        per_task * concurrency / elapsed,
+        statistics.median(lags_ms),
+        p99,
+        lags_ms[-1],
+    )
+
+
+def main():
+    """Run the signing executor benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--workers", type=int, default=settings.SIGNING_WORKERS
+    )
+    parser.add_argument(
+        "--modes", nargs="+", choices=SIGNING_MODES, default=SIGNING_MODES
+    )
+    args = parser.parse_args()
+
+    print(f"algorithm: {settings.JWT_ALGORITHM}, workers: {args.workers}")
+    print(
+        f"{'executor':<10}{'pairs/s':>10}{'lag p50 ms':>12}"
+        f"{'lag p99 ms':>12}{'lag max ms':>12}"
+    )
+    for mode in args.modes:
+        rate, p50, p99, worst = asyncio.run(
+            run(mode, args.pairs, args.concurrency, args.workers)
+        )
+        print(f"{mode:<10}{rate:>10.0f}{p50:>12.2f}{p99:>12.2f}{worst:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark cold start: import time and time-to-first-request.
+
+Each run starts a fresh interpreter, imports `auth_service.main`, runs the
+application lifespan and serves one request in-process. The median of the
+runs is compared against the budgets and the script exits with status 1
+when either is exceeded, so it can gate CI and deployments.
+
+Usage:
+    python -m auth_service.benchmarks.startup --runs 5 \\
+        --import-budget-ms 800 --first-request-budget-ms 1500
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+CHILD = """
+import asyncio, json, time
+import httpx
+
+start = time.perf_counter()
+from auth_service.main import api
+imported = time.perf_counter()
+
+
+async def first_request():
+    async with api.router.lifespan_context(api):
+        transport = httpx.ASGITransport(app=api)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark"
+        ) as client:
+            response = await client.get({path!r})
+            response.raise_for_status()
+
+
+asyncio.run(first_request())
+served = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "first_request_ms": (served - start) * 1000,
+}}))
+"""
+
+
+def run_once(path: str) -> dict:
+    """Measure one cold start in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(path=path)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    """Run the startup benchmark and enforce the budgets."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/openapi.json")
+    parser.add_argument("--import-budget-ms", type=float, default=800)
+    parser.add_argument("--first-request-budget-ms", type=float, default=1500)
+    args = parser.parse_args()
+
+    runs = [run_once(args.path) for _ in range(args.runs)]
+    results = {
+        "import_ms": (
+            statistics.median(run["import_ms"] for run in runs),
+            args.import_budget_ms,
+        ),
+        "first_request_ms": (
+            statistics.median(run["first_request_ms"] for run in runs),
+            args.first_request_budget_ms,
+        ),
+    }
+    over_budget = False
+    for name, (median, budget) in results.items():
+        status = "ok" if median <= budget else "OVER BUDGET"
+        over_budget = over_budget or median > budget
+        print(
+            f"{name:<18}{median:>10.1f} ms  (budget {budget:.0f} ms) {status}"
+        )
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Backfill the normalized username and email of existing users.
+
+Users registered before lookups switched to the normalized fields cannot be
+found until `username_normalized` and `email_normalized` are set. Sessions
+are looked up by the normalized username too, so the `username` of active
+refresh tokens issued before the switch is rewritten as well; until then
+listing, evicting and revoking sessions miss them. Run this once after
+deploying, before relying on the new lookups.
+
+Creating the unique indexes afterwards fails if two users collide once
+normalized (e.g. "John" and "john"); such accounts must be resolved by hand.
+
+Usage:
+    python -m auth_service.cli.backfill_normalized_users --batch-size 1000
+"""
+
+import argparse
+
+from pymongo import UpdateOne
+
+from auth_service.core.config import settings
+from auth_service.db.connection import get_mongo_connection
+from auth_service.db.indexes import ensure_indexes
+from auth_service.db.normalization import normalize_email, normalize_username
+
+
+def backfill(batch_size: int) -> int:
+    """Set the normalized fields on every user missing them.
+
+    Args:
+        batch_size (int): The number of users updated per bulk write.
+
+    Returns:
+        int: The number of users updated.
+    """
+    users = get_mongo_connection().get_collection(settings.USER_COLLECTION)
+    cursor = users.find(
+        {"username_normalized": {"$exists": False}},
+        {"username": 1, "email": 1},
+        batch_size=batch_size,
+    )
+    updated = 0
+    operations = []
+    for document in cursor:
+        operations.append(
+            UpdateOne(
+                {"_id": document["_id"]},
+                {
+                    "$set": {
+                        "username_normalized": normalize_username(
+                            document["username"]
+                        ),
+                        "email_normalized": normalize_email(document["email"]),
+                    }
+                },
+            )
+        )
+        if len(operations) >= batch_size:
+            updated += users.bulk_write(operations).modified_count
+            operations = []
+    if operations:
+        updated += users.bulk_write(operations).modified_count
+    return updated
+
+
+def backfill_refresh_tokens(batch_size: int) -> int:
+    """Normalize the username of every active refresh token.
+
+    Revoked tokens are left alone: sessions are only looked up among
+    active ones, and revoked tokens are only matched by `jti`.
+
+    Args:
+        batch_size (int): The number of tokens updated per bulk write.
+
+    Returns:
+        int: The number of tokens updated.
+    """
+    refresh_tokens = get_mongo_connection().db.refresh_tokens
+    cursor = refresh_tokens.find(
+        {"is_revoked": False}, {"username": 1}, batch_size=batch_size
+    )
+    updated = 0
+    operations = []
+    for document in cursor:
+        username = document.get("username")
+        if not isinstance(username, str):
+            continue
+        normalized = normalize_username(username)
+        if normalized == username:
+            continue
+        operations.append(
+            UpdateOne(
+                {"_id": document["_id"]},
+                {"$set": {"username": normalized}},
+            )
+        )
+        if len(operations) >= batch_size:
+            updated += refresh_tokens.bulk_write(operations).modified_count
+            operations = []
+    if operations:
+        updated += refresh_tokens.bulk_write(operations).modified_count
+    return updated
+
+
+def main():
+    """Parse the command line, backfill and create the unique indexes."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    print(f"updated {backfill(args.batch_size)} users", flush=True)
+    print(
+        f"updated {backfill_refresh_tokens(args.batch_size)} refresh tokens",
+        flush=True,
+    )
+    ensure_indexes(get_mongo_connection())
+
+
+if __name__ == "__main__":
+    main()
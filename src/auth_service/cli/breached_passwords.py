@@ -0,0 +1,142 @@
+"""Build the breached password digest file from a Have I Been Pwned dump.
+
+The input is the SHA-1 text dump (`HASH:COUNT` per line, optionally gzipped).
+The output is the sorted, deduplicated run of raw 20-byte digests read by
+`auth_service.core.breached_passwords`. The dump published "ordered by hash"
+is converted in a single pass; any other order is sorted externally in
+chunks of `--chunk-records` digests, so memory use stays bounded.
+
+Usage:
+    python -m auth_service.cli.breached_passwords pwned-passwords-sha1.txt \\
+        breached.bin --min-count 10
+"""
+
+import argparse
+import gzip
+import heapq
+import os
+import shutil
+import tempfile
+from typing import IO, Iterator
+
+from auth_service.core.breached_passwords import RECORD_SIZE
+
+
+def _open_text(path: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="ascii")
+    return open(path, "r", encoding="ascii")
+
+
+def read_digests(path: str, min_count: int) -> Iterator[bytes]:
+    """Yield the digests of a text dump.
+
+    Args:
+        path (str): Path to the `HASH:COUNT` dump.
+        min_count (int): Skip hashes seen fewer times than this.
+
+    Yields:
+        bytes: The 20-byte SHA-1 digests in file order.
+    """
+    with _open_text(path) as dump:
+        for line in dump:
+            digest, _, count = line.strip().partition(":")
+            if len(digest) != RECORD_SIZE * 2:
+                continue
+            if count and int(count) < min_count:
+                continue
+            yield bytes.fromhex(digest)
+
+
+def _read_run(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as run:
+        while record := run.read(RECORD_SIZE):
+            yield record
+
+
+def _write_unique(records, output: IO[bytes]) -> int:
+    written = 0
+    previous = None
+    for record in records:
+        if record != previous:
+            output.write(record)
+            written += 1
+            previous = record
+    return written
+
+
+def build(source: str, destination: str, min_count: int, chunk: int) -> int:
+    """Convert a text dump into a sorted digest file.
+
+    Args:
+        source (str): Path to the `HASH:COUNT` dump.
+        destination (str): Path of the digest file to write.
+        min_count (int): Skip hashes seen fewer times than this.
+        chunk (int): The number of digests sorted in memory at once.
+
+    Returns:
+        int: The number of digests written.
+    """
+    with tempfile.TemporaryDirectory(
+        dir=os.path.dirname(os.path.abspath(destination))
+    ) as workdir:
+        runs = []
+        records = []
+        in_order = True
+        # Kept across flushes, so chunks out of order are merged.
+        last_digest = None
+
+        def flush():
+            run_path = os.path.join(workdir, f"run-{len(runs)}")
+            with open(run_path, "wb") as run:
+                _write_unique(sorted(records), run)
+            runs.append(run_path)
+            records.clear()
+
+        for digest in read_digests(source, min_count):
+            if last_digest is not None and digest < last_digest:
+                in_order = False
+            last_digest = digest
+            records.append(digest)
+            if len(records) >= chunk:
+                flush()
+        if records or not runs:
+            flush()
+
+        partial = os.path.join(workdir, "digests")
+        with open(partial, "wb") as output:
+            if len(runs) == 1:
+                with open(runs[0], "rb") as run:
+                    shutil.copyfileobj(run, output)
+                written = os.path.getsize(runs[0]) // RECORD_SIZE
+            elif in_order:
+                # Already sorted across chunks: concatenating the runs
+                # only has to drop duplicates at the chunk boundaries.
+                written = _write_unique(
+                    (record for run in runs for record in _read_run(run)),
+                    output,
+                )
+            else:
+                written = _write_unique(
+                    heapq.merge(*(_read_run(run) for run in runs)), output
+                )
+        os.replace(partial, destination)
+    return written
+
+
+def main():
+    """Parse the command line and build the digest file."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="HIBP SHA-1 `HASH:COUNT` dump")
+    parser.add_argument("destination", help="digest file to write")
+    parser.add_argument("--min-count", type=int, default=1)
+    parser.add_argument("--chunk-records", type=int, default=5_000_000)
+    args = parser.parse_args()
+    written = build(
+        args.source, args.destination, args.min_count, args.chunk_records
+    )
+    print(f"wrote {written} digests to {args.destination}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
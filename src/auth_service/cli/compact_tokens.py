@@ -0,0 +1,70 @@
+"""Background job compacting retired refresh tokens.
+
+Folds used and revoked refresh tokens into one record per token family and
+reports how many documents were reclaimed. Runs once by default, or every
+`--interval` seconds when started as a long-running job.
+
+Usage:
+    python -m auth_service.cli.compact_tokens --batch-size 500 --pause 0.5
+    python -m auth_service.cli.compact_tokens --interval 3600
+"""
+
+import argparse
+import asyncio
+
+from auth_service.db.connection import get_mongo_connection
+from auth_service.db.indexes import ensure_indexes
+from auth_service.services.token import TokenService
+
+
+async def run(args: argparse.Namespace):
+    """Run compaction once, or forever when an interval is given."""
+    ensure_indexes(get_mongo_connection())
+    token_service = TokenService()
+    while True:
+        report = await token_service.compact_retired_tokens(
+            batch_size=args.batch_size,
+            pause_seconds=args.pause,
+            grace_minutes=args.grace_minutes,
+            max_batches=args.max_batches,
+        )
+        print(
+            f"reclaimed {report.reclaimed_documents} documents in "
+            f"{report.batches} batches ({report.family_updates} family "
+            f"updates); index size {report.index_size_before} -> "
+            f"{report.index_size_after} bytes",
+            flush=True,
+        )
+        if args.interval is None:
+            return
+        await asyncio.sleep(args.interval)
+
+
+def main():
+    """Parse the command line and run the compaction job."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--pause",
+        type=float,
+        default=0.5,
+        help="seconds to sleep between batches",
+    )
+    parser.add_argument(
+        "--grace-minutes",
+        type=int,
+        default=5,
+        help="leave tokens created more recently than this alone",
+    )
+    parser.add_argument("--max-batches", type=int, default=None)
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=None,
+        help="repeat every INTERVAL seconds instead of running once",
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
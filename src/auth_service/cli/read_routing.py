@@ -0,0 +1,57 @@
+"""Report which replica set member serves each user lookup.
+
+Runs every user lookup as an explained query through `UserQueries` with its
+configured read preference and prints the member that answered it, so the
+routing can be checked against a local replica set, e.g. one started with
+`mongod --replSet rs0` and three members.
+
+Usage:
+    PROFILE_READ_PREFERENCE=secondaryPreferred \\
+        python -m auth_service.cli.read_routing --username johndoe
+"""
+
+import argparse
+
+from auth_service.core.config import settings
+from auth_service.db.connection import get_mongo_connection
+from auth_service.db.normalization import normalize_username
+from auth_service.db.queries import (
+    USER_LOGIN_PROJECTION,
+    USER_PROFILE_PROJECTION,
+    USER_STATUS_PROJECTION,
+    UserQueries,
+)
+
+CASES = [
+    ("login", "primary", USER_LOGIN_PROJECTION),
+    ("validation", "VALIDATION_READ_PREFERENCE", USER_STATUS_PROJECTION),
+    ("/user/me", "PROFILE_READ_PREFERENCE", USER_PROFILE_PROJECTION),
+]
+
+
+def main():
+    """Parse the command line and report the member serving each lookup."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--username", default="johndoe")
+    args = parser.parse_args()
+
+    mongo_connection = get_mongo_connection()
+    user_queries = UserQueries(mongo_connection)
+    primary = mongo_connection.db.client.primary
+    lookup = {"username_normalized": normalize_username(args.username)}
+    for name, setting, projection in CASES:
+        mode = getattr(settings, setting, setting)
+        explain = (
+            user_queries.routed_collection(mode)
+            .find(lookup, projection)
+            .limit(1)
+            .explain()
+        )
+        server = explain.get("serverInfo", {})
+        member = (server.get("host"), server.get("port"))
+        role = "primary" if member == primary else "secondary"
+        print(f"{name:<12}{mode:<20}{member[0]}:{member[1]} ({role})")
+
+
+if __name__ == "__main__":
+    main()
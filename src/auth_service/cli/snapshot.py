@@ -0,0 +1,308 @@
+"""Export and restore snapshots of the service's collections.
+
+`export` streams every document of the users, activation key, refresh token
+and refresh token family collections into gzip compressed NDJSON (MongoDB
+canonical extended JSON, so types survive the round trip). Each collection
+is split into `--parallel` `_id` ranges by ObjectId creation time, read by
+concurrent cursors into one file per range; a `manifest.json` lists the
+files and document counts.
+
+`import` loads a snapshot with unordered `insert_many` batches, files in
+parallel, skipping documents whose `_id` already exists, then creates the
+indexes; a conflict on any other unique index fails the import. With
+`--drop` the collections are dropped first, so documents load into
+index-free collections and the indexes are built once at the end.
+
+Both directions hold at most one batch per worker in memory, whatever the
+collection size. Ranges are even in time, not in size, so a collection
+that grew in bursts splits unevenly.
+
+Usage:
+    python -m auth_service.cli.snapshot export snapshots/2026-10-19
+    python -m auth_service.cli.snapshot import snapshots/2026-10-19 --drop
+"""
+
+import argparse
+import gzip
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bson import ObjectId, json_util
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError
+
+from auth_service.core.config import settings
+from auth_service.db.connection import get_mongo_connection
+from auth_service.db.indexes import ensure_indexes
+
+MANIFEST = "manifest.json"
+
+# Write errors skipped on import: the `_id` already exists. Conflicts on
+# any other unique index, e.g. `username_normalized`, fail the import.
+DUPLICATE_KEY = 11000
+ID_KEY_PATTERN = {"_id": 1}
+
+
+def snapshot_collections() -> list[str]:
+    """Return the names of the collections a snapshot covers."""
+    return [
+        settings.USER_COLLECTION,
+        settings.ACTIVATION_KEY_COLLECTION,
+        "refresh_tokens",
+        settings.REFRESH_TOKEN_FAMILY_COLLECTION,
+    ]
+
+
+def id_ranges(collection, parts: int) -> list[dict]:
+    """Split a collection into `_id` range filters.
+
+    ObjectId ranges are cut at evenly spaced creation times; collections
+    with other `_id` types are read as a single range.
+
+    Args:
+        collection (Collection): The collection to split.
+        parts (int): The number of ranges wanted.
+
+    Returns:
+        list[dict]: Filters on `_id` covering every document once.
+    """
+    first = collection.find_one({}, {"_id": 1}, sort=[("_id", ASCENDING)])
+    last = collection.find_one({}, {"_id": 1}, sort=[("_id", DESCENDING)])
+    if first is None:
+        return []
+    low, high = first["_id"], last["_id"]
+    if parts <= 1 or not isinstance(low, ObjectId):
+        return [{}]
+    start = low.generation_time.timestamp()
+    step = (high.generation_time.timestamp() + 1 - start) / parts
+    bounds = [
+        ObjectId.from_datetime(
+            datetime.fromtimestamp(start + step * part, timezone.utc)
+        )
+        for part in range(1, parts)
+    ]
+    ranges = [{"_id": {"$lt": bounds[0]}}]
+    ranges += [
+        {"_id": {"$gte": lower, "$lt": upper}}
+        for lower, upper in zip(bounds, bounds[1:])
+    ]
+    ranges.append({"_id": {"$gte": bounds[-1]}})
+    return ranges
+
+
+def export_range(collection, query: dict, path: Path, batch_size: int) -> int:
+    """Write the documents matching a range filter to a gzip NDJSON file.
+
+    Args:
+        collection (Collection): The collection to read.
+        query (dict): The `_id` range filter.
+        path (Path): The file to write.
+        batch_size (int): The cursor batch size.
+
+    Returns:
+        int: The number of documents written.
+    """
+    count = 0
+    with gzip.open(path, "wt", encoding="utf-8") as output:
+        for document in collection.find(query, batch_size=batch_size):
+            output.write(
+                json_util.dumps(
+                    document, json_options=json_util.CANONICAL_JSON_OPTIONS
+                )
+            )
+            output.write("\n")
+            count += 1
+    return count
+
+
+def export_snapshot(
+    directory: Path, collections: list[str], parallel: int, batch_size: int
+) -> dict:
+    """Export collections into a snapshot directory.
+
+    Args:
+        directory (Path): The snapshot directory, created if missing.
+        collections (list[str]): The collections to export.
+        parallel (int): The number of concurrent cursors per collection.
+        batch_size (int): The cursor batch size.
+
+    Returns:
+        dict: The manifest written next to the files.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    mongo_connection = get_mongo_connection()
+    manifest = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "collections": {},
+    }
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        for name in collections:
+            collection = mongo_connection.get_collection(name)
+            ranges = id_ranges(collection, parallel)
+            files = [
+                f"{name}.{part:03d}.ndjson.gz" for part in range(len(ranges))
+            ]
+            counts = executor.map(
+                lambda query, file: export_range(
+                    collection, query, directory / file, batch_size
+                ),
+                ranges,
+                files,
+            )
+            manifest["collections"][name] = {
+                "files": files,
+                "documents": sum(counts),
+            }
+    (directory / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def import_file(collection, path: Path, batch_size: int) -> tuple[int, int]:
+    """Insert the documents of a gzip NDJSON file.
+
+    Args:
+        collection (Collection): The collection to load into.
+        path (Path): The file to read.
+        batch_size (int): The number of documents per `insert_many`.
+
+    Returns:
+        tuple[int, int]: The documents inserted and skipped as their `_id`
+            already exists.
+
+    Raises:
+        BulkWriteError: If a document fails for another reason, including
+            a conflict on a unique index other than `_id`.
+    """
+    inserted = skipped = 0
+
+    def flush(batch: list[dict]):
+        nonlocal inserted, skipped
+        try:
+            inserted += len(
+                collection.insert_many(batch, ordered=False).inserted_ids
+            )
+        except BulkWriteError as e:
+            errors = e.details["writeErrors"]
+            if any(
+                error["code"] != DUPLICATE_KEY
+                or error.get("keyPattern") != ID_KEY_PATTERN
+                for error in errors
+            ):
+                raise
+            inserted += e.details["nInserted"]
+            skipped += len(errors)
+
+    batch = []
+    with gzip.open(path, "rt", encoding="utf-8") as lines:
+        for line in lines:
+            batch.append(json_util.loads(line))
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+    if batch:
+        flush(batch)
+    return inserted, skipped
+
+
+def import_snapshot(
+    directory: Path,
+    collections: list[str],
+    parallel: int,
+    batch_size: int,
+    drop: bool,
+) -> dict[str, tuple[int, int]]:
+    """Load a snapshot directory, then create the indexes.
+
+    Args:
+        directory (Path): The snapshot directory.
+        collections (list[str]): The collections to restore.
+        parallel (int): The number of files loaded concurrently.
+        batch_size (int): The number of documents per `insert_many`.
+        drop (bool): Whether to drop the collections before loading.
+
+    Returns:
+        dict[str, tuple[int, int]]: Documents inserted and skipped per
+            collection.
+    """
+    manifest = json.loads((directory / MANIFEST).read_text())
+    mongo_connection = get_mongo_connection()
+    jobs = []
+    for name in collections:
+        if name not in manifest["collections"]:
+            continue
+        if drop:
+            mongo_connection.db.drop_collection(name)
+        collection = mongo_connection.get_collection(name)
+        for file in manifest["collections"][name]["files"]:
+            jobs.append((name, collection, directory / file))
+
+    report = {name: (0, 0) for name, _, _ in jobs}
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        results = executor.map(
+            lambda job: import_file(job[1], job[2], batch_size), jobs
+        )
+        for (name, _, _), (inserted, skipped) in zip(jobs, results):
+            total_inserted, total_skipped = report[name]
+            report[name] = (total_inserted + inserted, total_skipped + skipped)
+    ensure_indexes(mongo_connection)
+    return report
+
+
+def main():
+    """Parse the command line and export or import a snapshot."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("directory", type=Path)
+    parser.add_argument(
+        "--collections",
+        nargs="+",
+        default=snapshot_collections(),
+        help="collections to include (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=4,
+        help="cursors per collection on export, files at once on import",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--drop",
+        action="store_true",
+        help="drop the collections before importing",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "export":
+        manifest = export_snapshot(
+            args.directory, args.collections, args.parallel, args.batch_size
+        )
+        for name, entry in manifest["collections"].items():
+            print(
+                f"exported {entry['documents']} documents of {name} "
+                f"in {len(entry['files'])} files",
+                flush=True,
+            )
+    else:
+        report = import_snapshot(
+            args.directory,
+            args.collections,
+            args.parallel,
+            args.batch_size,
+            args.drop,
+        )
+        for name, (inserted, skipped) in report.items():
+            print(
+                f"imported {inserted} documents of {name}, "
+                f"skipped {skipped} existing",
+                flush=True,
+            )
+    print(f"done in {time.perf_counter() - start:.1f}s", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Offline check of passwords against a breached password corpus.
+
+The corpus is a flat file of sorted, fixed-size SHA-1 digests (20 bytes per
+record, no separators) built from a Have I Been Pwned dump with
+`auth_service.cli.breached_passwords`. The file is memory-mapped and
+searched in place, so a lookup only touches a handful of pages and the
+corpus never has to fit in memory.
+"""
+
+import hashlib
+import mmap
+import os
+from functools import lru_cache
+
+from auth_service.core.config import settings
+
+RECORD_SIZE = 20
+
+# SHA-1 digests are uniformly distributed, so interpolation search lands
+# next to the target within a couple of probes. Switch to plain bisection
+# after this many probes to bound the worst case.
+MAX_INTERPOLATION_PROBES = 8
+
+
+class BreachedPasswordError(ValueError):
+    """Raised when a password appears in the breached password corpus."""
+
+
+class BreachedPasswordIndex:
+    """Memory-mapped, sorted SHA-1 digest file."""
+
+    def __init__(self, path: str):
+        """Initialize the BreachedPasswordIndex class.
+
+        An empty file, e.g. built from a dump without any hash above the
+        minimum count, holds no digests and matches no password.
+
+        Args:
+            path (str): Path to the sorted digest file.
+
+        Raises:
+            ValueError: If the file size is not a multiple of the record size.
+        """
+        self._mmap: mmap.mmap | None = None
+        self.count = 0
+        with open(path, "rb") as digest_file:
+            size = os.fstat(digest_file.fileno()).st_size
+            if size % RECORD_SIZE:
+                raise ValueError(f"{path} is not a SHA-1 digest file")
+            if size == 0:
+                # mmap cannot map an empty file.
+                return
+            self._mmap = mmap.mmap(
+                digest_file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        self.count = size // RECORD_SIZE
+        if hasattr(mmap, "MADV_RANDOM"):
+            self._mmap.madvise(mmap.MADV_RANDOM)
+
+    def close(self):
+        """Unmap the digest file."""
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def _record(self, index: int) -> bytes:
+        start = index * RECORD_SIZE
+        end = start + RECORD_SIZE
+        return self._mmap[start:end]
+
+    def _key(self, index: int) -> int:
+        start = index * RECORD_SIZE
+        end = start + 8
+        return int.from_bytes(self._mmap[start:end], "big")
+
+    def contains_digest(self, digest: bytes) -> bool:
+        """Check whether a SHA-1 digest is in the corpus.
+
+        Args:
+            digest (bytes): The 20-byte SHA-1 digest.
+
+        Returns:
+            bool: True if the digest is present.
+        """
+        target = int.from_bytes(digest[:8], "big")
+        low, high = 0, self.count - 1
+        probes = 0
+        while low <= high:
+            if probes < MAX_INTERPOLATION_PROBES:
+                low_key, high_key = self._key(low), self._key(high)
+                if target < low_key or target > high_key:
+                    return False
+                if high_key == low_key:
+                    middle = low
+                else:
+                    middle = low + (target - low_key) * (high - low) // (
+                        high_key - low_key
+                    )
+                probes += 1
+            else:
+                middle = (low + high) // 2
+            record = self._record(middle)
+            if record == digest:
+                return True
+            if record < digest:
+                low = middle + 1
+            else:
+                high = middle - 1
+        return False
+
+    def is_breached(self, password: str) -> bool:
+        """Check whether a password is in the corpus.
+
+        Args:
+            password (str): The plain text password.
+
+        Returns:
+            bool: True if the password has appeared in a breach.
+        """
+        digest = hashlib.sha1(
+            password.encode("utf-8"), usedforsecurity=False
+        ).digest()
+        return self.contains_digest(digest)
+
+
+@lru_cache(maxsize=1)
+def get_breached_password_index() -> BreachedPasswordIndex | None:
+    """Return the configured corpus, or None if the check is disabled."""
+    if not settings.BREACHED_PASSWORDS_FILE:
+        return None
+    return BreachedPasswordIndex(settings.BREACHED_PASSWORDS_FILE)
+
+
+def check_password_not_breached(password: str):
+    """Reject a password found in the configured corpus.
+
+    Args:
+        password (str): The plain text password.
+
+    Raises:
+        BreachedPasswordError: If the password has appeared in a breach.
+    """
+    index = get_breached_password_index()
+    if index is not None and index.is_breached(password):
+        raise BreachedPasswordError(
+            "This password has appeared in a data breach. "
+            "Please choose a different password."
+        )
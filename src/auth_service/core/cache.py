@@ -0,0 +1,73 @@
+"""Small in-process caches."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """Least recently used cache whose entries expire after a fixed time.
+
+    Not shared between workers: each process keeps its own copy, so the TTL
+    bounds how long a change made elsewhere can go unnoticed.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """Initialize the TTLCache class.
+
+        Args:
+            maxsize (int): The maximum number of entries kept.
+            ttl (float): Seconds an entry stays valid after being stored.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry and mark it as recently used.
+
+        Args:
+            key (Hashable): The entry key.
+            default (Any): Returned when the key is missing or expired.
+
+        Returns:
+            Any: The cached value or `default`.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store an entry, evicting the least recently used one if full.
+
+        Args:
+            key (Hashable): The entry key.
+            value (Any): The value to cache.
+        """
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        """Drop an entry if present.
+
+        Args:
+            key (Hashable): The entry key.
+        """
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry."""
+        self._entries.clear()
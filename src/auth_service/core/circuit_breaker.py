@@ -0,0 +1,211 @@
+"""Circuit breaker for calls to a flaky dependency."""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from auth_service.core import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        """Initialize the CircuitOpenError exception.
+
+        Args:
+            name (str): The name of the breaker that rejected the call.
+            retry_after (float): Seconds until the breaker lets a probe
+                through.
+        """
+        super().__init__(f"{name} is unavailable")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Count based circuit breaker tripping on error rate or latency.
+
+    The outcome of the last `window_size` calls is kept. Once at least
+    `minimum_calls` were seen, the breaker opens when the share of failed
+    calls or of calls slower than `slow_call_seconds` reaches its threshold.
+    While open, calls are rejected with `CircuitOpenError` without touching
+    the dependency. After `open_seconds` up to `half_open_calls` probes are
+    let through; the breaker closes when they all succeed and opens again on
+    the first failure or slow call.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_exceptions: tuple[type[BaseException], ...] = (Exception,),
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 1.0,
+        slow_call_rate: float = 0.5,
+        window_size: int = 50,
+        minimum_calls: int = 10,
+        open_seconds: float = 10.0,
+        half_open_calls: int = 3,
+    ):
+        """Initialize the CircuitBreaker class.
+
+        Args:
+            name (str): The name reported in errors and metrics.
+            failure_exceptions (tuple[type[BaseException], ...]): Exceptions
+                counted as failures; any other exception passes through as a
+                success.
+            failure_rate (float): Share of failed calls that opens the
+                breaker.
+            slow_call_seconds (float): Duration above which a call is slow.
+            slow_call_rate (float): Share of slow calls that opens the
+                breaker.
+            window_size (int): The number of recent calls considered.
+            minimum_calls (int): Calls needed before the rates are evaluated.
+            open_seconds (float): How long the breaker stays open.
+            half_open_calls (int): Probes needed to close the breaker again.
+        """
+        self.name = name
+        self.failure_exceptions = failure_exceptions
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+
+        self._lock = threading.Lock()
+        self._window: deque[tuple[bool, bool]] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self.calls = {"success": 0, "failure": 0, "slow": 0, "rejected": 0}
+        self.opened_total = 0
+
+    @property
+    def state(self) -> str:
+        """The current state, moving from open to half-open when due."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if (
+            self._state == OPEN
+            and time.monotonic() - self._opened_at >= self.open_seconds
+        ):
+            self._state = HALF_OPEN
+            self._probes = 0
+            self._probe_successes = 0
+        return self._state
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._window.clear()
+        self.opened_total += 1
+
+    def acquire(self):
+        """Reserve a call, rejecting it if the circuit is open.
+
+        Raises:
+            CircuitOpenError: If the breaker is open or out of probes.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return
+            if state == CLOSED:
+                return
+            self.calls["rejected"] += 1
+            retry_after = max(
+                self.open_seconds - (time.monotonic() - self._opened_at), 1
+            )
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record(self, duration: float, failed: bool):
+        """Record the outcome of a call reserved with `acquire`.
+
+        Args:
+            duration (float): The call duration in seconds.
+            failed (bool): Whether the call failed.
+        """
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            self.calls["failure" if failed else "success"] += 1
+            if slow:
+                self.calls["slow"] += 1
+            if self._state == HALF_OPEN:
+                if failed or slow:
+                    self._open()
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_calls:
+                        self._state = CLOSED
+                return
+            if self._state == OPEN:
+                return
+            self._window.append((failed, slow))
+            if len(self._window) < self.minimum_calls:
+                return
+            size = len(self._window)
+            failures = sum(1 for outcome, _ in self._window if outcome)
+            slow_calls = sum(1 for _, latency in self._window if latency)
+            if (
+                failures >= self.failure_rate * size
+                or slow_calls >= self.slow_call_rate * size
+            ):
+                self._open()
+
+    @contextmanager
+    def guard(self):
+        """Run a block as one call through the breaker.
+
+        Raises:
+            CircuitOpenError: If the breaker is open.
+        """
+        self.acquire()
+        start = time.monotonic()
+        try:
+            yield
+        except self.failure_exceptions:
+            self.record(time.monotonic() - start, failed=True)
+            raise
+        except BaseException:
+            self.record(time.monotonic() - start, failed=False)
+            raise
+        self.record(time.monotonic() - start, failed=False)
+
+    def collect(self) -> list[metrics.Metric]:
+        """Return the breaker state and call counters as metrics."""
+        labels = {"breaker": self.name}
+        return [
+            metrics.Metric(
+                "auth_circuit_breaker_state",
+                "gauge",
+                "Circuit breaker state (0 closed, 1 half-open, 2 open).",
+                [(labels, STATE_VALUES[self.state])],
+            ),
+            metrics.Metric(
+                "auth_circuit_breaker_calls_total",
+                "counter",
+                "Calls seen by the circuit breaker by outcome.",
+                [
+                    ({**labels, "outcome": outcome}, count)
+                    for outcome, count in self.calls.items()
+                ],
+            ),
+            metrics.Metric(
+                "auth_circuit_breaker_opened_total",
+                "counter",
+                "Number of times the circuit breaker opened.",
+                [(labels, self.opened_total)],
+            ),
+        ]
@@ -1,6 +1,7 @@
 """Configuration settings for the auth service"""
 
 import os
+from functools import cached_property
 from pathlib import Path
 
 
@@ -12,9 +13,11 @@ class Settings:
 
         # Get project root directory
         project_root = Path(__file__).resolve().parents[1]
-        keys_dir = project_root / "keys"
 
         # ------------- MongoDB Config -------------
+        # "mongo", or "memory" to keep every collection in process (see
+        # `auth_service.db.memory`) for tests and offline benchmarks.
+        self.MONGO_BACKEND: str = os.getenv("MONGO_BACKEND", "mongo")
         self.MONGO_URI: str = os.getenv(
             "MONGO_URI",
             "mongodb://127.0.0.1:27017/?directConnection=true&"
@@ -25,13 +28,35 @@ class Settings:
         self.ACTIVATION_KEY_COLLECTION: str = os.getenv(
             "ACTIVATION_KEY_COLLECTION", "activation_keys"
         )
+        self.REFRESH_TOKEN_FAMILY_COLLECTION: str = os.getenv(
+            "REFRESH_TOKEN_FAMILY_COLLECTION", "refresh_token_families"
+        )
+        self.LOGIN_ATTEMPT_COLLECTION: str = os.getenv(
+            "LOGIN_ATTEMPT_COLLECTION", "login_attempts"
+        )
+        # Read preference of the latency-tolerant reads: `/user/me` profiles
+        # and token validation / introspection. Logins, registration and
+        # refresh token rotation always read from the primary. One of
+        # primary, primaryPreferred, secondary, secondaryPreferred, nearest.
+        self.PROFILE_READ_PREFERENCE: str = os.getenv(
+            "PROFILE_READ_PREFERENCE", "secondaryPreferred"
+        )
+        self.VALIDATION_READ_PREFERENCE: str = os.getenv(
+            "VALIDATION_READ_PREFERENCE", "primary"
+        )
+        # Secondaries lagging further behind are not read from; at least 90
+        # seconds, -1 for no limit.
+        self.MONGO_MAX_STALENESS_SECONDS: int = int(
+            os.getenv("MONGO_MAX_STALENESS_SECONDS", "90")
+        )
         # ------------- MongoDB Config -------------
 
         # ------------- JWT Config -------------
-        with open(keys_dir / "private.pem") as key_file:
-            self.JWT_PRIVATE_KEY: str = key_file.read()
-        with open(keys_dir / "public.pem") as key_file:
-            self.JWT_PUBLIC_KEY: str = key_file.read()
+        # The PEM files are only read on first use, see `JWT_PRIVATE_KEY` and
+        # `JWT_PUBLIC_KEY`.
+        self.JWT_KEYS_DIR: Path = Path(
+            os.getenv("JWT_KEYS_DIR", str(project_root / "keys"))
+        )
         self.JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = int(
             os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30")
         )
@@ -45,8 +70,216 @@ class Settings:
         self.JWT_AUDIENCE: str = os.getenv(
             "JWT_AUDIENCE", "awesome-babushka-users"
         )
+        # Maximum number of tokens accepted by one introspection request.
+        self.INTROSPECTION_MAX_TOKENS: int = int(
+            os.getenv("INTROSPECTION_MAX_TOKENS", "100")
+        )
+        # Bearer token required from introspection callers (RFC 7662 §2.1);
+        # empty disables the endpoint.
+        self.INTROSPECTION_TOKEN: str = os.getenv("INTROSPECTION_TOKEN", "")
+        # Claims carried by new tokens: "full" copies the user (username,
+        # email, verified, active), "minimal" only keeps the registered
+        # claims and the token type, "compact" also shortens claim names.
+        # Tokens of every profile are accepted.
+        self.JWT_CLAIM_PROFILE: str = os.getenv("JWT_CLAIM_PROFILE", "full")
+        # Where tokens are signed: "inline" on the event loop, or a "thread"
+        # or "process" pool of SIGNING_WORKERS holding the parsed key.
+        self.SIGNING_EXECUTOR: str = os.getenv("SIGNING_EXECUTOR", "inline")
+        self.SIGNING_WORKERS: int = int(os.getenv("SIGNING_WORKERS", "2"))
         # ------------- JWT Config -------------
 
+        # ------------- Session Config -------------
+        # Maximum number of concurrent sessions (refresh token families) per
+        # user. The oldest session is evicted when a login exceeds it; 0
+        # disables the limit.
+        self.MAX_SESSIONS_PER_USER: int = int(
+            os.getenv("MAX_SESSIONS_PER_USER", "10")
+        )
+        # ------------- Session Config -------------
+
+        # ------------- Password Config -------------
+        # Sorted SHA-1 digest file built with
+        # `auth_service.cli.breached_passwords`. Registration rejects any
+        # password found in it; empty disables the check.
+        self.BREACHED_PASSWORDS_FILE: str = os.getenv(
+            "BREACHED_PASSWORDS_FILE", ""
+        )
+        # ------------- Password Config -------------
+
+        # ------------- Lockout Config -------------
+        # Consecutive failed logins before an account is locked. Every
+        # further failure doubles the lock, starting at the base duration and
+        # capped at the maximum. Failures are forgotten after the window.
+        self.LOGIN_LOCKOUT_THRESHOLD: int = int(
+            os.getenv("LOGIN_LOCKOUT_THRESHOLD", "5")
+        )
+        self.LOGIN_LOCKOUT_BASE_SECONDS: float = float(
+            os.getenv("LOGIN_LOCKOUT_BASE_SECONDS", "30")
+        )
+        self.LOGIN_LOCKOUT_MAX_SECONDS: float = float(
+            os.getenv("LOGIN_LOCKOUT_MAX_SECONDS", "3600")
+        )
+        self.LOGIN_ATTEMPT_WINDOW_SECONDS: int = int(
+            os.getenv("LOGIN_ATTEMPT_WINDOW_SECONDS", "86400")
+        )
+        # ------------- Lockout Config -------------
+
+        # ------------- Cache Config -------------
+        # Per-worker cache of serialized `/user/me` profiles and their ETags.
+        # The TTL bounds how stale a profile can be; 0 disables the cache.
+        self.PROFILE_CACHE_TTL_SECONDS: float = float(
+            os.getenv("PROFILE_CACHE_TTL_SECONDS", "5")
+        )
+        self.PROFILE_CACHE_SIZE: int = int(
+            os.getenv("PROFILE_CACHE_SIZE", "10000")
+        )
+        # Last-known user status served by token validation while MongoDB is
+        # unavailable.
+        self.STATUS_CACHE_TTL_SECONDS: float = float(
+            os.getenv("STATUS_CACHE_TTL_SECONDS", "3600")
+        )
+        self.STATUS_CACHE_SIZE: int = int(
+            os.getenv("STATUS_CACHE_SIZE", "50000")
+        )
+        # ------------- Cache Config -------------
+
+        # ------------- Audit Config -------------
+        # Authentication events are buffered in memory (at most BUFFER_SIZE)
+        # and written in batches of up to BATCH_SIZE at least every FLUSH
+        # interval. When the buffer is full, "drop" discards new events,
+        # "block" makes the caller wait up to BLOCK_TIMEOUT_SECONDS for room
+        # (callers on the event loop drop instead of waiting) and "sample"
+        # keeps only SAMPLE_RATE of the routine events once the buffer is
+        # half full. The collection is capped at CAPPED_BYTES; 0 creates an
+        # ordinary collection.
+        self.AUDIT_COLLECTION: str = os.getenv(
+            "AUDIT_COLLECTION", "audit_events"
+        )
+        self.AUDIT_CAPPED_BYTES: int = int(
+            os.getenv("AUDIT_CAPPED_BYTES", str(256 * 1024 * 1024))
+        )
+        self.AUDIT_BUFFER_SIZE: int = int(
+            os.getenv("AUDIT_BUFFER_SIZE", "10000")
+        )
+        self.AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+        self.AUDIT_FLUSH_INTERVAL_SECONDS: float = float(
+            os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1")
+        )
+        self.AUDIT_OVERFLOW_POLICY: str = os.getenv(
+            "AUDIT_OVERFLOW_POLICY", "drop"
+        )
+        self.AUDIT_BLOCK_TIMEOUT_SECONDS: float = float(
+            os.getenv("AUDIT_BLOCK_TIMEOUT_SECONDS", "0.05")
+        )
+        self.AUDIT_SAMPLE_RATE: float = float(
+            os.getenv("AUDIT_SAMPLE_RATE", "0.1")
+        )
+        # Bearer token required by the export endpoint; empty disables it.
+        self.AUDIT_EXPORT_TOKEN: str = os.getenv("AUDIT_EXPORT_TOKEN", "")
+        # ------------- Audit Config -------------
+
+        # ------------- Circuit Breaker Config -------------
+        # The MongoDB breaker opens when, over the last WINDOW calls (and at
+        # least MIN_CALLS), the share of failed calls or of calls slower than
+        # SLOW_CALL_SECONDS reaches its rate. It rejects calls for
+        # OPEN_SECONDS, then closes after HALF_OPEN_CALLS successful probes.
+        self.MONGO_BREAKER_FAILURE_RATE: float = float(
+            os.getenv("MONGO_BREAKER_FAILURE_RATE", "0.5")
+        )
+        self.MONGO_BREAKER_SLOW_CALL_SECONDS: float = float(
+            os.getenv("MONGO_BREAKER_SLOW_CALL_SECONDS", "0.5")
+        )
+        self.MONGO_BREAKER_SLOW_CALL_RATE: float = float(
+            os.getenv("MONGO_BREAKER_SLOW_CALL_RATE", "0.5")
+        )
+        self.MONGO_BREAKER_WINDOW: int = int(
+            os.getenv("MONGO_BREAKER_WINDOW", "50")
+        )
+        self.MONGO_BREAKER_MIN_CALLS: int = int(
+            os.getenv("MONGO_BREAKER_MIN_CALLS", "10")
+        )
+        self.MONGO_BREAKER_OPEN_SECONDS: float = float(
+            os.getenv("MONGO_BREAKER_OPEN_SECONDS", "10")
+        )
+        self.MONGO_BREAKER_HALF_OPEN_CALLS: int = int(
+            os.getenv("MONGO_BREAKER_HALF_OPEN_CALLS", "3")
+        )
+        # ------------- Circuit Breaker Config -------------
+
+        # ------------- Load Shedding Config -------------
+        # Adaptive (AIMD) concurrency limit per route class and worker. Each
+        # limit grows while requests finish within the latency target and
+        # shrinks when they do not; requests over the limit get 503. Set
+        # with <CLASS>_CONCURRENCY_MAX and <CLASS>_LATENCY_TARGET_MS.
+        self.CONCURRENCY_LIMITS_ENABLED: bool = (
+            os.getenv("CONCURRENCY_LIMITS_ENABLED", "true").lower() == "true"
+        )
+        self.CONCURRENCY_LIMITS: dict[str, tuple[int, float]] = {
+            route_class: (
+                int(
+                    os.getenv(f"{route_class.upper()}_CONCURRENCY_MAX", limit)
+                ),
+                float(
+                    os.getenv(
+                        f"{route_class.upper()}_LATENCY_TARGET_MS", target
+                    )
+                ),
+            )
+            for route_class, limit, target in (
+                ("login", "16", "1000"),
+                ("register", "8", "1500"),
+                ("validate", "256", "50"),
+                ("default", "128", "250"),
+            )
+        }
+        # ------------- Load Shedding Config -------------
+
+        # ------------- Server Config -------------
+        # Serve `/api/v1/token/validate` from a raw ASGI route instead of the
+        # FastAPI route; responses are identical.
+        self.FAST_VALIDATE_ENABLED: bool = (
+            os.getenv("FAST_VALIDATE_ENABLED", "false").lower() == "true"
+        )
+        self.HOST: str = os.getenv("HOST", "127.0.0.1")
+        self.PORT: int = int(os.getenv("PORT", "8000"))
+        self.WORKERS: int = int(os.getenv("WORKERS", str(os.cpu_count() or 1)))
+        self.GRACEFUL_TIMEOUT_SECONDS: int = int(
+            os.getenv("GRACEFUL_TIMEOUT_SECONDS", "30")
+        )
+        self.DRAIN_STAGGER_SECONDS: float = float(
+            os.getenv("DRAIN_STAGGER_SECONDS", "1")
+        )
+        self.WORKER_READY_TIMEOUT_SECONDS: int = int(
+            os.getenv("WORKER_READY_TIMEOUT_SECONDS", "60")
+        )
+        # Before accepting requests each worker opens its MongoDB pool, signs
+        # and verifies a token, hashes a password and primes its caches. The
+        # indexes are created either way.
+        self.WARMUP_ENABLED: bool = (
+            os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+        )
+        self.WARMUP_TIMEOUT_SECONDS: float = float(
+            os.getenv("WARMUP_TIMEOUT_SECONDS", "30")
+        )
+        # Steps that failed or timed out are retried in the background,
+        # first after INITIAL seconds and then twice as late each time, up
+        # to MAX seconds, until the worker is warm.
+        self.WARMUP_RETRY_INITIAL_SECONDS: float = float(
+            os.getenv("WARMUP_RETRY_INITIAL_SECONDS", "1")
+        )
+        self.WARMUP_RETRY_MAX_SECONDS: float = float(
+            os.getenv("WARMUP_RETRY_MAX_SECONDS", "60")
+        )
+        # 0 opens the `minPoolSize` of MONGO_URI, at least one connection.
+        self.WARMUP_MONGO_CONNECTIONS: int = int(
+            os.getenv("WARMUP_MONGO_CONNECTIONS", "0")
+        )
+        # Recently active users whose status is cached, 0 disables it.
+        self.WARMUP_PRIME_USERS: int = int(
+            os.getenv("WARMUP_PRIME_USERS", "1000")
+        )
+        # ------------- Server Config -------------
+
         # ------------- Email Config -------------
         self.ENABLE_EMAIL: bool = (
             os.getenv("ENABLE_EMAIL", "false").lower() == "true"
@@ -60,5 +293,17 @@ class Settings:
         self.HOST_NAME: str = "localhost:8000"
         # ------------- Email Config -------------
 
+    @cached_property
+    def JWT_PRIVATE_KEY(self) -> str:  # pylint: disable=invalid-name
+        """PEM encoded private key used to sign tokens."""
+        with open(self.JWT_KEYS_DIR / "private.pem") as key_file:
+            return key_file.read()
+
+    @cached_property
+    def JWT_PUBLIC_KEY(self) -> str:  # pylint: disable=invalid-name
+        """PEM encoded public key used to verify tokens."""
+        with open(self.JWT_KEYS_DIR / "public.pem") as key_file:
+            return key_file.read()
+
 
 settings = Settings()
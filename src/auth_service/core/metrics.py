@@ -0,0 +1,68 @@
+"""Process metrics exposed in the Prometheus text format."""
+
+from dataclasses import dataclass
+from typing import Callable
+
+_collectors: list[Callable[[], list["Metric"]]] = []
+
+
+@dataclass
+class Metric:
+    """Dataclass for a metric family and its samples."""
+
+    name: str
+    kind: str
+    help: str
+    samples: list[tuple[dict, float]]
+
+
+def register(collector: Callable[[], list[Metric]]):
+    """Add a callable returning metrics to every future scrape.
+
+    Args:
+        collector (Callable[[], list[Metric]]): The metric source.
+    """
+    _collectors.append(collector)
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value)
+            .replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n"),
+        )
+        for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def render() -> str:
+    """Render every registered metric in the Prometheus text format.
+
+    Samples of families reported by several collectors, e.g. one per
+    breaker, are grouped under a single HELP and TYPE header.
+
+    Returns:
+        str: The exposition, one family after the other.
+    """
+    families: dict[str, Metric] = {}
+    for collector in _collectors:
+        for metric in collector():
+            family = families.setdefault(
+                metric.name,
+                Metric(metric.name, metric.kind, metric.help, []),
+            )
+            family.samples.extend(metric.samples)
+
+    lines = []
+    for metric in families.values():
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for labels, value in metric.samples:
+            lines.append(f"{metric.name}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
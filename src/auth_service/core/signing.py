@@ -0,0 +1,122 @@
+"""Token signing executors.
+
+Signing a token is an RSA (or ECDSA) private key operation that blocks the
+calling thread. `SigningExecutor` signs batches of claims, e.g. the access
+and refresh token of a login, either inline or in a pool of threads or
+processes, each holding the private key parsed once.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import lru_cache
+
+from jose import jwk, jwt
+
+from auth_service.core.config import settings
+
+SIGNING_MODES = ("inline", "thread", "process")
+
+# Parsed private key of the current process, see `load_signing_key`.
+_signing_key = None
+_algorithm = None
+
+
+def load_signing_key(private_key: str, algorithm: str):
+    """Parse the private key once for every later signature in this process.
+
+    Args:
+        private_key (str): The PEM encoded private key.
+        algorithm (str): The JWS algorithm, e.g. RS256.
+    """
+    global _signing_key, _algorithm  # pylint: disable=global-statement
+    _signing_key = jwk.construct(private_key, algorithm)
+    _algorithm = algorithm
+
+
+def sign_batch(claims_batch: list[dict]) -> list[str]:
+    """Sign several sets of claims with the preloaded key.
+
+    Args:
+        claims_batch (list[dict]): The claims to sign.
+
+    Returns:
+        list[str]: The encoded tokens, in order.
+    """
+    return [
+        jwt.encode(claims, _signing_key, algorithm=_algorithm)
+        for claims in claims_batch
+    ]
+
+
+class SigningExecutor:
+    """Signs token batches inline or in a worker pool."""
+
+    def __init__(self, mode: str = "inline", workers: int = 2):
+        """Initialize the SigningExecutor class.
+
+        Args:
+            mode (str): "inline", "thread" or "process".
+            workers (int): The pool size of the thread and process modes.
+
+        Raises:
+            ValueError: If the mode is unknown.
+        """
+        if mode not in SIGNING_MODES:
+            raise ValueError(f"Unknown signing executor: {mode}")
+        self.mode = mode
+        key_args = (settings.JWT_PRIVATE_KEY, settings.JWT_ALGORITHM)
+        load_signing_key(*key_args)
+        self._executor: Executor | None = None
+        if mode == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="token-signer"
+            )
+        elif mode == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=load_signing_key,
+                initargs=key_args,
+            )
+
+    async def sign(self, claims_batch: list[dict]) -> list[str]:
+        """Sign a batch of claims in a single dispatch.
+
+        Args:
+            claims_batch (list[dict]): The claims to sign.
+
+        Returns:
+            list[str]: The encoded tokens, in order.
+        """
+        if self._executor is None:
+            return sign_batch(claims_batch)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, sign_batch, claims_batch
+        )
+
+    def shutdown(self):
+        """Stop the worker pool, if any."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+@lru_cache(maxsize=1)
+def get_signing_executor() -> SigningExecutor:
+    """Return the process-wide signing executor, creating it on first use.
+
+    Returns:
+        SigningExecutor: The executor configured by `SIGNING_EXECUTOR`.
+    """
+    return SigningExecutor(settings.SIGNING_EXECUTOR, settings.SIGNING_WORKERS)
+
+
+def close_signing_executor():
+    """Stop the signing executor if it was ever created."""
+    if get_signing_executor.cache_info().currsize:
+        get_signing_executor().shutdown()
+        get_signing_executor.cache_clear()
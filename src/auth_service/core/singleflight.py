@@ -0,0 +1,95 @@
+"""Coalescing of concurrent identical calls (single-flight)."""
+
+import asyncio
+import functools
+import weakref
+from typing import Any, Callable, Hashable
+
+from auth_service.core import metrics
+
+# Live flights by name. Each service instance owns its flights, so one
+# collector per name reports their sum, and discarded ones drop out.
+_flights: dict[str, weakref.WeakSet] = {}
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+
+    The first caller runs the blocking function in the default executor;
+    callers arriving with the same key while it runs await the same future
+    instead of repeating the work. Results and exceptions are shared as is,
+    so callers must not mutate what they get back. Nothing is cached once
+    the call completes.
+    """
+
+    def __init__(self, name: str):
+        """Initialize the SingleFlight class.
+
+        Args:
+            name (str): The name reported in metrics.
+        """
+        self.name = name
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.collapsed = 0
+        if name not in _flights:
+            _flights[name] = weakref.WeakSet()
+            metrics.register(functools.partial(_collect, name))
+        _flights[name].add(self)
+
+    async def do(
+        self, key: Hashable, function: Callable[..., Any], *args
+    ) -> Any:
+        """Run `function(*args)` unless a call with `key` is in flight.
+
+        Args:
+            key (Hashable): Identifies calls that produce the same result.
+            function (Callable[..., Any]): The blocking function to run.
+            *args: Positional arguments of the function.
+
+        Returns:
+            Any: The result of the shared call.
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.collapsed += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(function, *args)
+        )
+        self._in_flight[key] = future
+        self.calls += 1
+        future.add_done_callback(functools.partial(self._forget, key))
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+
+def _collect(name: str) -> list[metrics.Metric]:
+    """Return the call counters of the live flights named `name`."""
+    # pylint: disable=protected-access
+    flights = list(_flights[name])
+    labels = {"flight": name}
+    return [
+        metrics.Metric(
+            "auth_singleflight_calls_total",
+            "counter",
+            "Calls executed by the single-flight group.",
+            [(labels, sum(flight.calls for flight in flights))],
+        ),
+        metrics.Metric(
+            "auth_singleflight_collapsed_total",
+            "counter",
+            "Calls served by joining an identical call in flight.",
+            [(labels, sum(flight.collapsed for flight in flights))],
+        ),
+        metrics.Metric(
+            "auth_singleflight_in_flight",
+            "gauge",
+            "Calls currently in flight.",
+            [(labels, sum(len(flight._in_flight) for flight in flights))],
+        ),
+    ]
@@ -7,44 +7,48 @@ from jose import jwt
 
 from auth_service.core.config import settings
 from auth_service.db.enums import TokenType
+from auth_service.db.records import TokenMetadata
+
+CLAIM_PROFILES = ("full", "minimal", "compact")
+
+# Private claim names used by the "compact" profile.
+SHORT_CLAIM_NAMES = {"token_type": "typ", "token_family": "fam"}
 
 
 class TokenUtils:
     """Utility class for token operations."""
 
     @staticmethod
-    def create_token(
+    def build_claims(
         data: dict,
         token_type: TokenType,
         token_family: str | None = None,
-    ) -> tuple[TokenType, str, dict]:
-        """
-        Create token of specified type.
+        profile: str | None = None,
+    ) -> tuple[dict, TokenMetadata]:
+        """Build the claims of a token without signing it.
 
-        **Access Tokens:** These tokens are short-lived and are used to
-        authenticate user requests. They typically have a short expiration
-        time (e.g., 15 minutes to 1 hour) and are included in the
-        Authorization header of HTTP requests.
-
-        **Refresh Tokens:** These tokens are long-lived and are used to obtain
-        new access tokens without requiring the user to re-authenticate. They
-        usually have a longer expiration time (e.g., days to weeks) and are
-        securely stored on the client side.
+        Only the "full" profile copies `data` into the token; the others
+        rely on `sub` for the username, see `decode_token`.
 
         Args:
             data (dict): The data to encode in the token.
             token_type (TokenType): The type of token to create.
             token_family (str | None): The token family identifier for refresh
                 tokens.
+            profile (str | None): The claim profile, one of `CLAIM_PROFILES`.
+                Defaults to `settings.JWT_CLAIM_PROFILE`.
 
         Returns:
-            tuple[TokenType, str, dict]: The token type, the encoded token, and
+            tuple[dict, TokenMetadata]: The claims to sign and the token
                 metadata.
         """
+        profile = profile or settings.JWT_CLAIM_PROFILE
+        if profile not in CLAIM_PROFILES:
+            raise ValueError(f"Unknown claim profile: {profile}")
         username = data.get("username")
         if username is None:
             raise ValueError("username is required to create a token")
-        to_encode = data.copy()
+        to_encode = data.copy() if profile == "full" else {}
         now = datetime.now(timezone.utc)
         jti = str(uuid.uuid4())
 
@@ -68,19 +72,69 @@ class TokenUtils:
                 "token_type": token_type.value,
             }
         )
-        encoded_jwt = jwt.encode(
-            claims=to_encode,
+        if token_family is not None:
+            to_encode["token_family"] = token_family
+        if profile == "compact":
+            for name, short_name in SHORT_CLAIM_NAMES.items():
+                if name in to_encode:
+                    to_encode[short_name] = to_encode.pop(name)
+        metadata = TokenMetadata(
+            jti=jti,
+            username=str(username),
+            expires_at=expire,
+            token_family=token_family,
+        )
+        return to_encode, metadata
+
+    @staticmethod
+    def encode_claims(claims: dict) -> str:
+        """Sign claims with the private key.
+
+        Args:
+            claims (dict): The claims built by `build_claims`.
+
+        Returns:
+            str: The encoded token.
+        """
+        return jwt.encode(
+            claims=claims,
             key=settings.JWT_PRIVATE_KEY,
             algorithm=settings.JWT_ALGORITHM,
         )
-        metadata = {
-            "jti": jti,
-            "token_family": token_family,
-            "expires_at": expire,
-            "username": str(username),
-        }
 
-        return token_type, encoded_jwt, metadata
+    @staticmethod
+    def create_token(
+        data: dict,
+        token_type: TokenType,
+        token_family: str | None = None,
+    ) -> tuple[TokenType, str, TokenMetadata]:
+        """
+        Create token of specified type.
+
+        **Access Tokens:** These tokens are short-lived and are used to
+        authenticate user requests. They typically have a short expiration
+        time (e.g., 15 minutes to 1 hour) and are included in the
+        Authorization header of HTTP requests.
+
+        **Refresh Tokens:** These tokens are long-lived and are used to obtain
+        new access tokens without requiring the user to re-authenticate. They
+        usually have a longer expiration time (e.g., days to weeks) and are
+        securely stored on the client side.
+
+        Args:
+            data (dict): The data to encode in the token.
+            token_type (TokenType): The type of token to create.
+            token_family (str | None): The token family identifier for refresh
+                tokens.
+
+        Returns:
+            tuple[TokenType, str, TokenMetadata]: The token type, the encoded
+                token, and metadata.
+        """
+        claims, metadata = TokenUtils.build_claims(
+            data, token_type, token_family=token_family
+        )
+        return token_type, TokenUtils.encode_claims(claims), metadata
 
     @staticmethod
     def create_access_token(data: dict) -> str:
@@ -96,17 +150,21 @@ class TokenUtils:
         return access_token
 
     @staticmethod
-    def create_refresh_token(data: dict) -> tuple[str, dict]:
+    def create_refresh_token(
+        data: dict, token_family: str | None = None
+    ) -> tuple[str, TokenMetadata]:
         """Create a refresh token.
 
         Args:
             data (dict): The data to encode in the token.
+            token_family (str | None): The token family identifier.
 
         Returns:
-            tuple[str, dict]: The encoded refresh token and metadata.
+            tuple[str, TokenMetadata]: The encoded refresh token and
+                metadata.
         """
         _, refresh_token, metadata = TokenUtils.create_token(
-            data, TokenType.REFRESH
+            data, TokenType.REFRESH, token_family=token_family
         )
         return refresh_token, metadata
 
@@ -114,6 +172,9 @@ class TokenUtils:
     def decode_token(token: str, expected_type: TokenType) -> dict:
         """Validate and decode a token.
 
+        Tokens of every claim profile decode to the same names: short claim
+        names are expanded and `username` defaults to `sub`.
+
         Args:
             token (str): The token to decode.
             expected_type (TokenType): The expected type of the token.
@@ -133,6 +194,11 @@ class TokenUtils:
             audience=settings.JWT_AUDIENCE,
             issuer=settings.JWT_ISSUER,
         )
+        for name, short_name in SHORT_CLAIM_NAMES.items():
+            if short_name in payload:
+                payload[name] = payload.pop(short_name)
+        if "username" not in payload and "sub" in payload:
+            payload["username"] = payload["sub"]
 
         if payload.get("token_type") != expected_type.value:
             raise ValueError(
@@ -0,0 +1,22 @@
+"""Circuit breaker guarding the request paths that use MongoDB."""
+
+from pymongo.errors import ConnectionFailure, ExecutionTimeout
+
+from auth_service.core import metrics
+from auth_service.core.circuit_breaker import CircuitBreaker
+from auth_service.core.config import settings
+
+# Only connectivity problems and timeouts count as failures; duplicate keys
+# and other operation errors are answers from a healthy server.
+mongo_breaker = CircuitBreaker(
+    "mongo",
+    failure_exceptions=(ConnectionFailure, ExecutionTimeout),
+    failure_rate=settings.MONGO_BREAKER_FAILURE_RATE,
+    slow_call_seconds=settings.MONGO_BREAKER_SLOW_CALL_SECONDS,
+    slow_call_rate=settings.MONGO_BREAKER_SLOW_CALL_RATE,
+    window_size=settings.MONGO_BREAKER_WINDOW,
+    minimum_calls=settings.MONGO_BREAKER_MIN_CALLS,
+    open_seconds=settings.MONGO_BREAKER_OPEN_SECONDS,
+    half_open_calls=settings.MONGO_BREAKER_HALF_OPEN_CALLS,
+)
+metrics.register(mongo_breaker.collect)
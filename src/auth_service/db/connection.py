@@ -0,0 +1,32 @@
+"""Shared, lazily created MongoDB connection."""
+
+from functools import lru_cache
+
+from auth_service.core.config import settings
+from auth_service.db.memory import MemoryConnection
+from auth_service.db.repository import Connection
+
+
+@lru_cache(maxsize=1)
+def get_mongo_connection() -> Connection:
+    """Return the process-wide MongoDB connection, creating it on first use.
+
+    Returns:
+        Connection: The shared MongoDB connection, in memory if
+            `MONGO_BACKEND` is "memory".
+    """
+    if settings.MONGO_BACKEND == "memory":
+        return MemoryConnection(settings.DB_NAME)
+    # Only needed for a real server, so tests run without it installed.
+    from commons.database import (  # pylint: disable=import-outside-toplevel
+        MongoConnect,
+    )
+
+    return MongoConnect(settings.MONGO_URI, settings.DB_NAME)
+
+
+def close_mongo_connection():
+    """Close the shared MongoDB connection if it was ever opened."""
+    if get_mongo_connection.cache_info().currsize:
+        get_mongo_connection().close()
+        get_mongo_connection.cache_clear()
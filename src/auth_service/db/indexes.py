@@ -0,0 +1,109 @@
+"""Index definitions for the auth service collections."""
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import CollectionInvalid
+
+from auth_service.core.config import settings
+from auth_service.db.queries import USER_STATUS_INDEX
+
+
+def ensure_indexes(mongo_connection):
+    """Create necessary indexes in the database.
+
+    Users:
+    - Unique indexes on `username_normalized` and `email_normalized`, the
+        canonical forms every lookup matches against.
+    - Compound index on `username_normalized`, `username`, `email`,
+        `verified` and `active` so status lookups by username are served
+        from the index alone.
+
+    Activation keys:
+    - Unique index on `token` for verification lookups.
+    - TTL index on `expires_at` so expired keys are removed automatically.
+
+    Refresh tokens:
+    - Unique index on `jti` to ensure each token is unique.
+    - Index on `username` for efficient querying of tokens by user.
+    - Index on `token_family` to facilitate family revocation of tokens.
+    - TTL index on `expires_at` to automatically delete expired tokens.
+    - Compound index on `username`, `is_revoked` and `_id` for faster
+        queries related to token revocation and keyset pagination of a
+        user's active sessions.
+    - Partial index on `is_revoked` and `_id` covering only retired tokens,
+        walked by the compaction job.
+
+    Refresh token families:
+    - Unique index on `token_family` and TTL index on `expires_at` for the
+        compacted family records.
+
+    Login attempts:
+    - TTL index on `expires_at` so failure counters and expired locks are
+        forgotten automatically.
+
+    Audit events:
+    - Created as a capped collection of `AUDIT_CAPPED_BYTES`, so the oldest
+        events are discarded once it is full. Exports page on the default
+        `_id` index.
+
+    Args:
+        mongo_connection (MongoConnect): The MongoDB connection to use.
+    """
+    users = mongo_connection.get_collection(settings.USER_COLLECTION)
+    for field in ("username_normalized", "email_normalized"):
+        users.create_index(
+            [(field, ASCENDING)],
+            unique=True,
+            partialFilterExpression={field: {"$exists": True}},
+        )
+    users.create_index(USER_STATUS_INDEX, name="username_normalized_status")
+
+    activation_keys = mongo_connection.get_collection(
+        settings.ACTIVATION_KEY_COLLECTION
+    )
+    activation_keys.create_index([("token", ASCENDING)], unique=True)
+    activation_keys.create_index(
+        [("expires_at", ASCENDING)], expireAfterSeconds=0
+    )
+
+    refresh_tokens = mongo_connection.db.refresh_tokens
+    refresh_tokens.create_index([("jti", ASCENDING)], unique=True)
+    refresh_tokens.create_index([("username", ASCENDING)])
+    refresh_tokens.create_index([("token_family", ASCENDING)])
+    refresh_tokens.create_index(
+        [("expires_at", ASCENDING)], expireAfterSeconds=0
+    )
+    refresh_tokens.create_index(
+        [
+            ("username", ASCENDING),
+            ("is_revoked", ASCENDING),
+            ("_id", DESCENDING),
+        ]
+    )
+    refresh_tokens.create_index(
+        [("is_revoked", ASCENDING), ("_id", ASCENDING)],
+        name="retired_tokens",
+        partialFilterExpression={"is_revoked": True},
+    )
+
+    families = mongo_connection.get_collection(
+        settings.REFRESH_TOKEN_FAMILY_COLLECTION
+    )
+    families.create_index([("token_family", ASCENDING)], unique=True)
+    families.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+
+    login_attempts = mongo_connection.get_collection(
+        settings.LOGIN_ATTEMPT_COLLECTION
+    )
+    login_attempts.create_index(
+        [("expires_at", ASCENDING)], expireAfterSeconds=0
+    )
+
+    if settings.AUDIT_CAPPED_BYTES > 0:
+        try:
+            mongo_connection.db.create_collection(
+                settings.AUDIT_COLLECTION,
+                capped=True,
+                size=settings.AUDIT_CAPPED_BYTES,
+            )
+        except CollectionInvalid:
+            pass  # Already created, e.g. by another worker.
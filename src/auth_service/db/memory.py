@@ -0,0 +1,938 @@
+"""In-memory stand-in for MongoDB.
+
+Implements the subset of the pymongo API described by
+`auth_service.db.repository` in process, for running the service, its
+benchmarks and tests without a database (`MONGO_BACKEND=memory`). Within
+that subset it follows MongoDB semantics: documents are stored as BSON
+would return them (naive UTC datetimes with millisecond precision), unique
+and partial indexes are enforced, TTL indexes expire documents and capped
+collections discard their oldest documents. Queries support equality,
+`$eq`, `$ne`, `$gt`, `$gte`, `$lt`, `$lte`, `$in`, `$nin`, `$exists`,
+`$and`, `$or` and `$nor`; updates support `$set`, `$unset`, `$inc`, `$min`,
+`$max` and `$setOnInsert`. Anything else raises `OperationFailure`.
+
+Data is lost with the process and not shared between workers.
+"""
+
+import copy
+import heapq
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Iterator, Mapping
+
+import bson
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.errors import (
+    BulkWriteError,
+    CollectionInvalid,
+    DuplicateKeyError,
+    OperationFailure,
+)
+from pymongo.operations import (
+    DeleteMany,
+    DeleteOne,
+    InsertOne,
+    ReplaceOne,
+    UpdateMany,
+    UpdateOne,
+)
+from pymongo.results import (
+    BulkWriteResult,
+    DeleteResult,
+    InsertManyResult,
+    InsertOneResult,
+    UpdateResult,
+)
+
+_MISSING = object()
+
+# Sort order of BSON types; values of different types never compare equal.
+_TYPE_ORDER = (
+    (type(None), 1),
+    (bool, 8),
+    ((int, float), 2),
+    (str, 3),
+    (dict, 4),
+    (list, 5),
+    (bytes, 6),
+    (ObjectId, 7),
+    (datetime, 9),
+)
+
+
+def to_bson(value: Any) -> Any:
+    """Return a value as MongoDB would store and return it.
+
+    Args:
+        value (Any): A document or field value.
+
+    Returns:
+        Any: A deep copy with datetimes as naive UTC truncated to
+            milliseconds and tuples as lists.
+    """
+    if isinstance(value, dict):
+        return {key: to_bson(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_bson(item) for item in value]
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.replace(microsecond=value.microsecond // 1000 * 1000)
+    return value
+
+
+def _type_rank(value: Any) -> int:
+    for types, rank in _TYPE_ORDER:
+        if isinstance(value, types):
+            return rank
+    return 10
+
+
+def _sort_key(value: Any) -> tuple:
+    if value is _MISSING or value is None:
+        return (0,)
+    rank = _type_rank(value)
+    if rank in (4, 5):
+        return (rank, repr(value))
+    return (rank, value)
+
+
+def _get(document: Mapping, path: str) -> Any:
+    value = document
+    for part in path.split("."):
+        if not isinstance(value, Mapping) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _set(document: dict, path: str, value: Any):
+    *parents, last = path.split(".")
+    for part in parents:
+        document = document.setdefault(part, {})
+    document[last] = value
+
+
+def _unset(document: dict, path: str):
+    *parents, last = path.split(".")
+    for part in parents:
+        document = document.get(part)
+        if not isinstance(document, dict):
+            return
+    document.pop(last, None)
+
+
+def _equals(value: Any, expected: Any) -> bool:
+    if expected is None:
+        return value is _MISSING or value is None
+    if isinstance(value, list) and not isinstance(expected, list):
+        return any(_equals(item, expected) for item in value)
+    if value is _MISSING or _type_rank(value) != _type_rank(expected):
+        return False
+    return value == expected
+
+
+def _compare(value: Any, operand: Any, compare) -> bool:
+    if value is _MISSING or _type_rank(value) != _type_rank(operand):
+        return False
+    return compare(value, operand)
+
+
+_COMPARISONS = {
+    "$gt": lambda value, operand: value > operand,
+    "$gte": lambda value, operand: value >= operand,
+    "$lt": lambda value, operand: value < operand,
+    "$lte": lambda value, operand: value <= operand,
+}
+
+
+def _match_operator(value: Any, operator: str, operand: Any) -> bool:
+    if operator == "$eq":
+        return _equals(value, operand)
+    if operator == "$ne":
+        return not _equals(value, operand)
+    if operator in _COMPARISONS:
+        return _compare(value, operand, _COMPARISONS[operator])
+    if operator == "$in":
+        return any(_equals(value, item) for item in operand)
+    if operator == "$nin":
+        return not any(_equals(value, item) for item in operand)
+    if operator == "$exists":
+        return (value is not _MISSING) == bool(operand)
+    raise OperationFailure(f"Unsupported query operator: {operator}")
+
+
+def matches(document: Mapping, query: Mapping | None) -> bool:
+    """Return whether a document matches a query filter.
+
+    Args:
+        document (Mapping): The stored document.
+        query (Mapping | None): The filter, already passed through
+            `to_bson`.
+
+    Returns:
+        bool: True if every condition holds.
+    """
+    for key, condition in (query or {}).items():
+        if key == "$and":
+            if not all(matches(document, part) for part in condition):
+                return False
+        elif key == "$or":
+            if not any(matches(document, part) for part in condition):
+                return False
+        elif key == "$nor":
+            if any(matches(document, part) for part in condition):
+                return False
+        elif key.startswith("$"):
+            raise OperationFailure(f"Unsupported query operator: {key}")
+        else:
+            value = _get(document, key)
+            if isinstance(condition, dict) and any(
+                name.startswith("$") for name in condition
+            ):
+                if not all(
+                    _match_operator(value, operator, operand)
+                    for operator, operand in condition.items()
+                ):
+                    return False
+            elif not _equals(value, condition):
+                return False
+    return True
+
+
+def project(document: dict, projection: Any) -> dict:
+    """Return a copy of a document restricted by a projection.
+
+    Args:
+        document (dict): The stored document.
+        projection (Any): A field to 0/1 mapping, a list of fields or None.
+
+    Returns:
+        dict: The projected copy.
+    """
+    if not projection:
+        return copy.deepcopy(document)
+    if not isinstance(projection, Mapping):
+        projection = {field: 1 for field in projection}
+    fields = {key: value for key, value in projection.items() if key != "_id"}
+    if any(fields.values()) or (not fields and projection.get("_id")):
+        result = {}
+        if projection.get("_id", 1) and "_id" in document:
+            result["_id"] = document["_id"]
+        for path in fields:
+            value = _get(document, path)
+            if value is not _MISSING:
+                _set(result, path, copy.deepcopy(value))
+        return result
+    result = copy.deepcopy(document)
+    for path, include in projection.items():
+        if not include:
+            _unset(result, path)
+    return result
+
+
+def apply_update(document: dict, update: Mapping, inserting: bool):
+    """Apply update operators to a document in place.
+
+    Args:
+        document (dict): The document to modify.
+        update (Mapping): The update, already passed through `to_bson`.
+        inserting (bool): Whether the document is being upserted, which
+            enables `$setOnInsert`.
+
+    Raises:
+        OperationFailure: On an unsupported operator or a non-numeric `$inc`.
+    """
+    for operator, fields in update.items():
+        for path, operand in fields.items():
+            current = _get(document, path)
+            if operator == "$set" or (
+                operator == "$setOnInsert" and inserting
+            ):
+                _set(document, path, copy.deepcopy(operand))
+            elif operator == "$setOnInsert":
+                continue
+            elif operator == "$unset":
+                _unset(document, path)
+            elif operator == "$inc":
+                if current is _MISSING:
+                    current = 0
+                if not isinstance(current, (int, float)):
+                    raise OperationFailure(f"Cannot $inc non-number {path}")
+                _set(document, path, current + operand)
+            elif operator in ("$max", "$min"):
+                new, old = _sort_key(operand), _sort_key(current)
+                if current is _MISSING or (
+                    new > old if operator == "$max" else new < old
+                ):
+                    _set(document, path, copy.deepcopy(operand))
+            else:
+                raise OperationFailure(
+                    f"Unsupported update operator: {operator}"
+                )
+
+
+def _is_update(update: Mapping) -> bool:
+    return bool(update) and all(key.startswith("$") for key in update)
+
+
+def _hashable(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, _hashable(item)) for key, item in value.items())
+    return value
+
+
+def _index_keys(keys: str | list) -> list[tuple[str, Any]]:
+    if isinstance(keys, str):
+        return [(keys, ASCENDING)]
+    return [tuple(key) for key in keys]
+
+
+class _Index:
+    """An index definition; unique indexes keep a key to `_id` map."""
+
+    def __init__(self, name: str, keys: list[tuple[str, Any]], options: dict):
+        self.name = name
+        self.fields = [field for field, _ in keys]
+        self.unique = bool(options.get("unique"))
+        self.partial = to_bson(options.get("partialFilterExpression"))
+        self.expire_after = options.get("expireAfterSeconds")
+        self.entries: dict[Any, Any] = {}
+
+    def key(self, document: Mapping) -> Any:
+        """Return the index key of a document, None if it is not indexed."""
+        if self.partial is not None and not matches(document, self.partial):
+            return None
+        return _hashable(
+            [
+                None if value is _MISSING else value
+                for value in (_get(document, field) for field in self.fields)
+            ]
+        )
+
+
+class MemoryCursor:
+    """Lazily sorted and limited results of `MemoryCollection.find`."""
+
+    def __init__(self, documents: list[dict], projection: Any):
+        self._documents = documents
+        self._projection = projection
+        self._limit = 0
+
+    def sort(self, key: str | list, direction: int | None = None):
+        """Order the results like `pymongo.cursor.Cursor.sort`."""
+        if isinstance(key, str):
+            key = [(key, direction or ASCENDING)]
+        for field, order in reversed(key):
+            self._documents.sort(
+                key=lambda document: _sort_key(_get(document, field)),
+                reverse=order == -1,
+            )
+        return self
+
+    def limit(self, limit: int):
+        """Return at most `limit` results, 0 for no limit."""
+        self._limit = limit
+        return self
+
+    def __iter__(self) -> Iterator[dict]:
+        documents = self._documents
+        if self._limit:
+            documents = documents[: self._limit]
+        return (project(document, self._projection) for document in documents)
+
+
+class MemoryCollection:
+    """A collection held in a dict keyed by `_id`, in insertion order."""
+
+    def __init__(self, name: str, lock: threading.RLock, options: dict):
+        self.name = name
+        self._lock = lock
+        self._documents: dict[Any, dict] = {}
+        self._indexes: dict[str, _Index] = {
+            "_id_": _Index("_id_", [("_id", ASCENDING)], {"unique": True})
+        }
+        self._expiries: list[tuple[datetime, int, Any]] = []
+        self._expiry_sequence = 0
+        self.capped = bool(options.get("capped"))
+        self.max_size = options.get("size") or 0
+        self.max_documents = options.get("max") or 0
+        self._sizes: dict[Any, int] = {}
+        self._total_size = 0
+
+    # ------------------------------------------------------------- internals
+
+    def _expire(self):
+        """Delete documents whose TTL index says they have expired."""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        while self._expiries and self._expiries[0][0] <= now:
+            _, _, document_id = heapq.heappop(self._expiries)
+            document = self._documents.get(document_id)
+            if document is not None and self._expires_at(document) <= now:
+                self._remove(document)
+
+    def _expires_at(self, document: dict) -> datetime:
+        """Return when a document expires, `datetime.max` if never."""
+        expires_at = datetime.max
+        for index in self._indexes.values():
+            if index.expire_after is None:
+                continue
+            value = _get(document, index.fields[0])
+            if isinstance(value, datetime):
+                expires_at = min(
+                    expires_at,
+                    value + timedelta(seconds=index.expire_after),
+                )
+        return expires_at
+
+    def _schedule_expiry(self, document: dict):
+        expires_at = self._expires_at(document)
+        if expires_at != datetime.max:
+            self._expiry_sequence += 1
+            heapq.heappush(
+                self._expiries,
+                (expires_at, self._expiry_sequence, document["_id"]),
+            )
+
+    def _check_unique(self, document: dict, replacing: dict | None = None):
+        for index in self._indexes.values():
+            if not index.unique:
+                continue
+            key = index.key(document)
+            if key is None:
+                continue
+            owner = index.entries.get(key, _MISSING)
+            if owner is not _MISSING and (
+                replacing is None or owner != replacing["_id"]
+            ):
+                duplicate = dict(zip(index.fields, key))
+                raise DuplicateKeyError(
+                    f"E11000 duplicate key error collection: {self.name} "
+                    f"index: {index.name} dup key: {duplicate}",
+                    11000,
+                    {"keyPattern": dict.fromkeys(index.fields, 1)},
+                )
+
+    def _index_add(self, document: dict):
+        for index in self._indexes.values():
+            if index.unique:
+                key = index.key(document)
+                if key is not None:
+                    index.entries[key] = document["_id"]
+
+    def _index_remove(self, document: dict):
+        for index in self._indexes.values():
+            if index.unique:
+                key = index.key(document)
+                if index.entries.get(key, _MISSING) == document["_id"]:
+                    del index.entries[key]
+
+    def _store(self, document: dict):
+        self._check_unique(document)
+        self._documents[document["_id"]] = document
+        self._index_add(document)
+        self._schedule_expiry(document)
+        if self.capped:
+            self._resize(document)
+            self._cap()
+
+    def _resize(self, document: dict):
+        size = len(bson.encode(document))
+        self._total_size += size - self._sizes.get(document["_id"], 0)
+        self._sizes[document["_id"]] = size
+
+    def _cap(self):
+        """Discard the oldest documents beyond the capped size or count."""
+        while self._documents and (
+            (self.max_size and self._total_size > self.max_size)
+            or (
+                self.max_documents
+                and len(self._documents) > self.max_documents
+            )
+        ):
+            self._remove(next(iter(self._documents.values())))
+
+    def _remove(self, document: dict):
+        self._index_remove(document)
+        del self._documents[document["_id"]]
+        self._total_size -= self._sizes.pop(document["_id"], 0)
+
+    def _replace(self, document: dict, updated: dict) -> bool:
+        """Store the new version of a document, return whether it changed."""
+        if updated == document:
+            return False
+        if updated.get("_id") != document["_id"]:
+            raise OperationFailure(
+                "Performing an update on _id is not allowed"
+            )
+        self._check_unique(updated, replacing=document)
+        self._index_remove(document)
+        self._documents[document["_id"]] = updated
+        self._index_add(updated)
+        self._schedule_expiry(updated)
+        if self.capped:
+            self._resize(updated)
+        return True
+
+    def _candidates(self, query: Mapping) -> Iterable[dict]:
+        """Narrow a scan with an equality on a unique single field index."""
+        for index in self._indexes.values():
+            if not index.unique or len(index.fields) != 1:
+                continue
+            value = query.get(index.fields[0], _MISSING)
+            if value is _MISSING or isinstance(value, (dict, list)):
+                continue
+            if value is None:
+                continue
+            if index.partial is not None and not (
+                set(index.partial) == set(index.fields)
+                and matches({index.fields[0]: value}, index.partial)
+            ):
+                continue
+            document_id = index.entries.get((_hashable(value),), _MISSING)
+            if document_id is _MISSING:
+                return []
+            return [self._documents[document_id]]
+        return list(self._documents.values())
+
+    def _matching(self, query: Mapping | None) -> Iterator[dict]:
+        query = to_bson(query or {})
+        self._expire()
+        return (
+            document
+            for document in self._candidates(query)
+            if matches(document, query)
+        )
+
+    def _upsert_document(self, query: Mapping, update: Mapping) -> dict:
+        """Build the document inserted by an upsert."""
+        query = to_bson(query)
+        if not _is_update(update):
+            document = to_bson(update)
+            if "_id" in query and not isinstance(query["_id"], dict):
+                document.setdefault("_id", query["_id"])
+            document.setdefault("_id", ObjectId())
+            return document
+        document = {}
+        for key, value in query.items():
+            if not key.startswith("$") and not (
+                isinstance(value, dict)
+                and any(name.startswith("$") for name in value)
+            ):
+                _set(document, key, value)
+        apply_update(document, to_bson(update), inserting=True)
+        document.setdefault("_id", ObjectId())
+        return document
+
+    def _update(
+        self, query: Mapping, update: Mapping, upsert: bool, multi: bool
+    ) -> tuple[int, int, Any, dict | None, dict | None]:
+        """Return matched and modified counts, upserted `_id` and the
+        first document before and after the update."""
+        replacement = not _is_update(update)
+        update = to_bson(update)
+        matched = modified = 0
+        before = after = None
+        for document in list(self._matching(query)):
+            if replacement:
+                updated = {"_id": document["_id"], **update}
+            else:
+                updated = copy.deepcopy(document)
+                apply_update(updated, update, inserting=False)
+            matched += 1
+            modified += self._replace(document, updated)
+            if before is None:
+                before, after = document, updated
+            if not multi:
+                break
+        if matched or not upsert:
+            return matched, modified, None, before, after
+        document = self._upsert_document(query, update)
+        self._store(document)
+        return 0, 0, document["_id"], None, document
+
+    # ------------------------------------------------------------ public API
+
+    def find(
+        self,
+        filter: Mapping | None = None,
+        projection: Any = None,
+        sort: list | None = None,
+        **kwargs,
+    ):
+        """Find the documents matching a filter.
+
+        Cursor options such as `batch_size` are accepted and ignored.
+        """
+        # pylint: disable=unused-argument
+        with self._lock:
+            cursor = MemoryCursor(list(self._matching(filter)), projection)
+        return cursor.sort(sort) if sort else cursor
+
+    def find_one(
+        self,
+        filter: Mapping | None = None,
+        projection: Any = None,
+        sort: list | None = None,
+        **kwargs,
+    ) -> dict | None:
+        """Find the first document matching a filter."""
+        for document in self.find(filter, projection, sort, **kwargs).limit(1):
+            return document
+        return None
+
+    def find_one_and_update(
+        self,
+        filter: Mapping,
+        update: Mapping,
+        projection: Any = None,
+        upsert: bool = False,
+        return_document: bool = False,
+        **kwargs,
+    ) -> dict | None:
+        """Update a document, return it as before or after the update."""
+        # pylint: disable=unused-argument
+        with self._lock:
+            _, _, _, before, after = self._update(
+                filter, update, upsert, multi=False
+            )
+            document = after if return_document else before
+            return None if document is None else project(document, projection)
+
+    def find_one_and_delete(
+        self, filter: Mapping, projection: Any = None, **kwargs
+    ) -> dict | None:
+        """Delete the first document matching a filter and return it."""
+        # pylint: disable=unused-argument
+        with self._lock:
+            for document in self._matching(filter):
+                self._remove(document)
+                return project(document, projection)
+        return None
+
+    def insert_one(self, document: dict) -> InsertOneResult:
+        """Insert a document, adding an `_id` if it has none."""
+        with self._lock:
+            self._expire()
+            document.setdefault("_id", ObjectId())
+            self._store(to_bson(document))
+            return InsertOneResult(document["_id"], True)
+
+    def insert_many(
+        self, documents: Iterable[dict], ordered: bool = True
+    ) -> InsertManyResult:
+        """Insert several documents, see `bulk_write` for errors."""
+        documents = list(documents)
+        self.bulk_write(
+            [InsertOne(document) for document in documents], ordered=ordered
+        )
+        return InsertManyResult(
+            [document["_id"] for document in documents], True
+        )
+
+    def replace_one(
+        self, filter: Mapping, replacement: dict, upsert: bool = False
+    ) -> UpdateResult:
+        """Replace the first document matching a filter."""
+        if _is_update(replacement):
+            raise ValueError("replacement can not include $ operators")
+        return self.update_one(filter, replacement, upsert=upsert)
+
+    def update_one(
+        self, filter: Mapping, update: Mapping, upsert: bool = False
+    ) -> UpdateResult:
+        """Update the first document matching a filter."""
+        with self._lock:
+            return self._update_result(
+                *self._update(filter, update, upsert, multi=False)[:3]
+            )
+
+    def update_many(
+        self, filter: Mapping, update: Mapping, upsert: bool = False
+    ) -> UpdateResult:
+        """Update every document matching a filter."""
+        if not _is_update(update):
+            raise ValueError("update only works with $ operators")
+        with self._lock:
+            return self._update_result(
+                *self._update(filter, update, upsert, multi=True)[:3]
+            )
+
+    @staticmethod
+    def _update_result(matched: int, modified: int, upserted_id: Any):
+        raw_result = {"n": matched or int(upserted_id is not None)}
+        raw_result["nModified"] = modified
+        if upserted_id is not None:
+            raw_result["upserted"] = upserted_id
+        return UpdateResult(raw_result, True)
+
+    def delete_one(self, filter: Mapping) -> DeleteResult:
+        """Delete the first document matching a filter."""
+        with self._lock:
+            for document in self._matching(filter):
+                self._remove(document)
+                return DeleteResult({"n": 1}, True)
+        return DeleteResult({"n": 0}, True)
+
+    def delete_many(self, filter: Mapping) -> DeleteResult:
+        """Delete every document matching a filter."""
+        with self._lock:
+            documents = list(self._matching(filter))
+            for document in documents:
+                self._remove(document)
+            return DeleteResult({"n": len(documents)}, True)
+
+    def count_documents(self, filter: Mapping) -> int:
+        """Count the documents matching a filter."""
+        with self._lock:
+            return sum(1 for _ in self._matching(filter))
+
+    def estimated_document_count(self) -> int:
+        """Count every document."""
+        with self._lock:
+            self._expire()
+            return len(self._documents)
+
+    def bulk_write(
+        self, requests: list, ordered: bool = True
+    ) -> BulkWriteResult:
+        """Apply insert, update, replace and delete operations.
+
+        Raises:
+            BulkWriteError: If any operation failed; with `ordered` the
+                remaining operations are not applied.
+        """
+        result = {
+            "writeErrors": [],
+            "writeConcernErrors": [],
+            "nInserted": 0,
+            "nUpserted": 0,
+            "nMatched": 0,
+            "nModified": 0,
+            "nRemoved": 0,
+            "upserted": [],
+        }
+        with self._lock:
+            for position, request in enumerate(requests):
+                try:
+                    self._apply(request, position, result)
+                except (DuplicateKeyError, OperationFailure) as e:
+                    result["writeErrors"].append(
+                        {
+                            "index": position,
+                            "code": e.code,
+                            "errmsg": str(e),
+                            # The violated unique index, as MongoDB reports.
+                            **{
+                                name: value
+                                for name, value in (e.details or {}).items()
+                                if name == "keyPattern"
+                            },
+                            "op": getattr(request, "_doc", None),
+                        }
+                    )
+                    if ordered:
+                        break
+        if result["writeErrors"]:
+            raise BulkWriteError(result)
+        return BulkWriteResult(result, True)
+
+    def _apply(self, request, position: int, result: dict):
+        if isinstance(request, InsertOne):
+            document = request._doc  # pylint: disable=protected-access
+            document.setdefault("_id", ObjectId())
+            self._expire()
+            self._store(to_bson(document))
+            result["nInserted"] += 1
+            return
+        # pylint: disable=protected-access
+        if isinstance(request, (DeleteOne, DeleteMany)):
+            delete = (
+                self.delete_one
+                if isinstance(request, DeleteOne)
+                else self.delete_many
+            )
+            result["nRemoved"] += delete(request._filter).deleted_count
+            return
+        if isinstance(request, (UpdateOne, UpdateMany, ReplaceOne)):
+            matched, modified, upserted_id, _, _ = self._update(
+                request._filter,
+                request._doc,
+                request._upsert,
+                multi=isinstance(request, UpdateMany),
+            )
+            result["nMatched"] += matched
+            result["nModified"] += modified
+            if upserted_id is not None:
+                result["nUpserted"] += 1
+                result["upserted"].append(
+                    {"index": position, "_id": upserted_id}
+                )
+            return
+        raise OperationFailure(f"Unsupported bulk operation: {request!r}")
+
+    def create_index(self, keys: str | list, **kwargs) -> str:
+        """Create an index, return its name.
+
+        Unique, partial and TTL (single field) indexes are honoured; other
+        indexes are only recorded, every query is a scan.
+
+        Raises:
+            DuplicateKeyError: If a unique index is violated by existing
+                documents.
+        """
+        keys = _index_keys(keys)
+        name = kwargs.get("name") or "_".join(
+            f"{field}_{order}" for field, order in keys
+        )
+        with self._lock:
+            if name in self._indexes:
+                return name
+            index = _Index(name, keys, kwargs)
+            for document in self._documents.values():
+                key = index.key(document)
+                if index.unique and key is not None:
+                    if key in index.entries:
+                        raise DuplicateKeyError(
+                            f"E11000 duplicate key error index: {name}", 11000
+                        )
+                    index.entries[key] = document["_id"]
+            self._indexes[name] = index
+            if index.expire_after is not None:
+                for document in self._documents.values():
+                    self._schedule_expiry(document)
+        return name
+
+    def index_information(self) -> dict:
+        """Describe the indexes like `Collection.index_information`."""
+        with self._lock:
+            return {
+                name: {
+                    "key": [(field, ASCENDING) for field in index.fields],
+                    **({"unique": True} if index.unique else {}),
+                }
+                for name, index in self._indexes.items()
+            }
+
+    def drop(self):
+        """Remove every document and index."""
+        with self._lock:
+            self._documents.clear()
+            self._sizes.clear()
+            self._total_size = 0
+            self._expiries.clear()
+            self._indexes = {"_id_": self._indexes["_id_"]}
+            self._indexes["_id_"].entries.clear()
+
+    def stats(self) -> dict:
+        """Approximate `collStats`: BSON sizes of documents and index keys."""
+        with self._lock:
+            self._expire()
+            size = sum(
+                len(bson.encode(document))
+                for document in self._documents.values()
+            )
+            index_sizes = {
+                name: sum(
+                    len(bson.encode({"k": list(index.key(document) or [])}))
+                    for document in self._documents.values()
+                )
+                for name, index in self._indexes.items()
+            }
+            return {
+                "ns": self.name,
+                "count": len(self._documents),
+                "size": size,
+                "capped": self.capped,
+                "nindexes": len(self._indexes),
+                "indexSizes": index_sizes,
+                "totalIndexSize": sum(index_sizes.values()),
+            }
+
+
+class MemoryDatabase:
+    """A set of in-memory collections sharing one lock."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.RLock()
+        self._collections: dict[str, MemoryCollection] = {}
+
+    def get_collection(self, name: str, **kwargs) -> MemoryCollection:
+        """Return a collection, creating it on first use.
+
+        Options such as `read_preference` are accepted and ignored.
+        """
+        # pylint: disable=unused-argument
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = MemoryCollection(name, self._lock, {})
+                self._collections[name] = collection
+            return collection
+
+    def create_collection(self, name: str, **kwargs) -> MemoryCollection:
+        """Create a collection, `capped`, `size` and `max` are honoured.
+
+        Raises:
+            CollectionInvalid: If the collection already exists.
+        """
+        with self._lock:
+            if name in self._collections:
+                raise CollectionInvalid(f"collection {name} already exists")
+            collection = MemoryCollection(name, self._lock, kwargs)
+            self._collections[name] = collection
+            return collection
+
+    def list_collection_names(self) -> list[str]:
+        """Return the names of the collections."""
+        with self._lock:
+            return list(self._collections)
+
+    def drop_collection(self, name: str):
+        """Remove a collection."""
+        with self._lock:
+            self._collections.pop(name, None)
+
+    def command(self, command: str, value: Any = 1, **kwargs) -> dict:
+        """Run `collStats` or `ping`.
+
+        Raises:
+            OperationFailure: For any other command.
+        """
+        # pylint: disable=unused-argument
+        if command == "ping":
+            return {"ok": 1.0}
+        if command == "collStats":
+            return {**self.get_collection(value).stats(), "ok": 1.0}
+        raise OperationFailure(f"Unsupported command: {command}")
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        return self.get_collection(name)
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.get_collection(name)
+
+
+class MemoryConnection:
+    """Drop-in replacement for `commons.database.MongoConnect`."""
+
+    def __init__(self, db_name: str = "test"):
+        """Initialize the MemoryConnection class.
+
+        Args:
+            db_name (str): The database name.
+        """
+        self.db = MemoryDatabase(db_name)
+
+    def get_collection(self, name: str) -> MemoryCollection:
+        """Return a collection of the database."""
+        return self.db.get_collection(name)
+
+    def close(self):
+        """Nothing to release; the data stays until garbage collected."""
@@ -18,10 +18,35 @@ class BasicUserInfo(BaseModel):
     active: bool = Field(True, examples=[True, False])
 
 
+def to_basic_user_info(document: dict) -> dict:
+    """Build the public user information straight from a Mongo document.
+
+    This mirrors the fields and defaults of `BasicUserInfo` without
+    constructing a model, so the result can be handed to the response class
+    and serialized in a single pass.
+
+    Args:
+        document (dict): The user document as returned by MongoDB.
+
+    Returns:
+        dict: The public user information.
+    """
+    return {
+        "username": document["username"],
+        "email": document["email"],
+        "verified": document.get("verified", False),
+        "active": document.get("active", True),
+    }
+
+
 class User(BasicUserInfo):
     """User model"""
 
     password: str = Field(..., examples=["password123", "password456"])
+    username_normalized: str = Field(..., examples=["johndoe", "janedoe"])
+    email_normalized: str = Field(
+        ..., examples=["john.doe@example.com", "jane.doe@example.com"]
+    )
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
         examples=[datetime.now(timezone.utc)],
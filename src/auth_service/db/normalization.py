@@ -0,0 +1,36 @@
+"""Canonical forms of user identifiers.
+
+Usernames and emails are stored as entered for display, alongside a
+normalized copy that every lookup matches against. Matching on the
+normalized copy keeps case-insensitive lookups exact index seeks.
+"""
+
+import unicodedata
+
+
+def normalize_username(username: str) -> str:
+    """Return the canonical form of a username.
+
+    The username is NFKC normalized, so compatibility characters such as
+    full-width letters compare equal to their plain forms, stripped of
+    surrounding whitespace and case folded.
+
+    Args:
+        username (str): The username as entered.
+
+    Returns:
+        str: The canonical username.
+    """
+    return unicodedata.normalize("NFKC", username).strip().casefold()
+
+
+def normalize_email(email: str) -> str:
+    """Return the canonical form of an email address.
+
+    Args:
+        email (str): The email address as entered.
+
+    Returns:
+        str: The canonical email address.
+    """
+    return unicodedata.normalize("NFKC", email).strip().casefold()
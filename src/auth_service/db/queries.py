@@ -0,0 +1,245 @@
+"""Projection-based queries for the user collection."""
+
+from datetime import datetime
+
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+)
+
+from auth_service.core.config import settings
+from auth_service.db.breaker import mongo_breaker
+from auth_service.db.normalization import normalize_email, normalize_username
+
+# Fields needed to report a user's status. Every field is part of the
+# `username_normalized_status` index, so lookups by username are covered
+# queries.
+USER_STATUS_PROJECTION = {
+    "_id": 0,
+    "username": 1,
+    "email": 1,
+    "verified": 1,
+    "active": 1,
+}
+
+# Status fields plus the key needed to match batched lookups back to their
+# usernames; still served from the `username_normalized_status` index.
+USER_STATUS_BATCH_PROJECTION = {
+    **USER_STATUS_PROJECTION,
+    "username_normalized": 1,
+}
+
+# Fields returned by `/user/me`.
+USER_BASIC_INFO_PROJECTION = USER_STATUS_PROJECTION
+
+# Public fields plus the modification time used to version `/user/me`.
+USER_PROFILE_PROJECTION = {**USER_BASIC_INFO_PROJECTION, "updated_at": 1}
+
+# Fields needed to verify a login: the password hash plus the claims that
+# are signed into the issued tokens.
+USER_LOGIN_PROJECTION = {**USER_STATUS_PROJECTION, "password": 1}
+
+# Compound index backing `USER_STATUS_PROJECTION`.
+USER_STATUS_INDEX = [
+    ("username_normalized", 1),
+    ("username", 1),
+    ("email", 1),
+    ("verified", 1),
+    ("active", 1),
+]
+
+
+READ_PREFERENCES = {
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+def resolve_read_preference(mode: str):
+    """Build the read preference of a configured mode name.
+
+    Args:
+        mode (str): The read preference mode, e.g. `secondaryPreferred`.
+
+    Returns:
+        The pymongo read preference, honouring
+            `MONGO_MAX_STALENESS_SECONDS` for non-primary modes.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    if mode == "primary":
+        return Primary()
+    if mode not in READ_PREFERENCES:
+        raise ValueError(f"Unknown read preference: {mode}")
+    return READ_PREFERENCES[mode](
+        max_staleness=settings.MONGO_MAX_STALENESS_SECONDS
+    )
+
+
+class UserQueries:
+    """Per-use-case lookups against the user collection.
+
+    Each lookup fetches only the fields its caller needs instead of the full
+    user document, and matches on the normalized username or email so that
+    case variants resolve through an index seek.
+
+    Lookups that tolerate slightly stale data are routed with their
+    configured read preference (`PROFILE_READ_PREFERENCE`,
+    `VALIDATION_READ_PREFERENCE`); logins and writes use the primary. Every
+    query goes through `mongo_breaker`.
+    """
+
+    def __init__(self, mongo_connection):
+        """Initialize the UserQueries class.
+
+        Args:
+            mongo_connection (MongoConnect): The MongoDB connection to use.
+        """
+        self.mongo_connection = mongo_connection
+        self._routed_collections = {}
+
+    @staticmethod
+    def _username_filter(username: str) -> dict:
+        return {"username_normalized": normalize_username(username)}
+
+    @property
+    def collection(self):
+        """The user collection."""
+        return self.mongo_connection.get_collection(settings.USER_COLLECTION)
+
+    def routed_collection(self, mode: str):
+        """The user collection read with the given read preference mode.
+
+        Args:
+            mode (str): The read preference mode, e.g. `secondaryPreferred`.
+
+        Returns:
+            Collection: The user collection bound to that read preference.
+        """
+        if mode == "primary":
+            return self.collection
+        collection = self._routed_collections.get(mode)
+        if collection is None:
+            collection = self.mongo_connection.db.get_collection(
+                settings.USER_COLLECTION,
+                read_preference=resolve_read_preference(mode),
+            )
+            self._routed_collections[mode] = collection
+        return collection
+
+    def _find_user(
+        self, mode: str, username: str, projection: dict
+    ) -> dict | None:
+        with mongo_breaker.guard():
+            return self.routed_collection(mode).find_one(
+                self._username_filter(username), projection
+            )
+
+    def find_status(self, username: str) -> dict | None:
+        """Fetch the status fields of a user for token validation.
+
+        Args:
+            username (str): The username to look up.
+
+        Returns:
+            dict | None: The status fields, or None if the user is unknown.
+        """
+        return self._find_user(
+            settings.VALIDATION_READ_PREFERENCE,
+            username,
+            USER_STATUS_PROJECTION,
+        )
+
+    def find_statuses(self, usernames) -> dict[str, dict]:
+        """Fetch the status fields of several users in one query.
+
+        Args:
+            usernames (Iterable[str]): The usernames to look up.
+
+        Returns:
+            dict[str, dict]: The status fields keyed by normalized username;
+                unknown users are missing.
+        """
+        keys = list({normalize_username(username) for username in usernames})
+        if not keys:
+            return {}
+        with mongo_breaker.guard():
+            cursor = self.routed_collection(
+                settings.VALIDATION_READ_PREFERENCE
+            ).find(
+                {"username_normalized": {"$in": keys}},
+                USER_STATUS_BATCH_PROJECTION,
+            )
+            return {
+                document.pop("username_normalized"): document
+                for document in cursor
+            }
+
+    def find_login(self, username: str) -> dict | None:
+        """Fetch the password hash and token claims of a user.
+
+        Args:
+            username (str): The username to look up.
+
+        Returns:
+            dict | None: The login fields, or None if the user is unknown.
+        """
+        return self._find_user("primary", username, USER_LOGIN_PROJECTION)
+
+    def find_basic_info(self, username: str) -> dict | None:
+        """Fetch the public information of a user.
+
+        Args:
+            username (str): The username to look up.
+
+        Returns:
+            dict | None: The public fields, or None if the user is unknown.
+        """
+        return self._find_user(
+            settings.PROFILE_READ_PREFERENCE,
+            username,
+            USER_BASIC_INFO_PROJECTION,
+        )
+
+    def find_profile(self, username: str) -> dict | None:
+        """Fetch the public information of a user and its modification time.
+
+        Args:
+            username (str): The username to look up.
+
+        Returns:
+            dict | None: The profile fields, or None if the user is unknown.
+        """
+        return self._find_user(
+            settings.PROFILE_READ_PREFERENCE,
+            username,
+            USER_PROFILE_PROJECTION,
+        )
+
+    def mark_verified(self, email: str, updated_at: datetime) -> str | None:
+        """Flag the unverified user owning an email address as verified.
+
+        Args:
+            email (str): The email address of the user.
+            updated_at (datetime): The modification time to record.
+
+        Returns:
+            str | None: The normalized username of the updated user, or None
+                if no unverified user owns the address.
+        """
+        with mongo_breaker.guard():
+            user = self.collection.find_one_and_update(
+                {
+                    "email_normalized": normalize_email(email),
+                    "verified": False,
+                },
+                {"$set": {"verified": True, "updated_at": updated_at}},
+                projection={"_id": 0, "username_normalized": 1},
+            )
+        return user["username_normalized"] if user else None
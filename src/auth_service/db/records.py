@@ -0,0 +1,41 @@
+"""Internal records passed between the service layers.
+
+Pydantic models are kept for the API boundary (`db.schemas`) and for the
+documents written on registration (`db.models`). Values created on every
+request and never validated use these slotted dataclasses instead: an
+instance has no `__dict__`, costs a fraction of a model or a dict, and is
+serialized by orjson as is.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(slots=True)
+class TokenMetadata:
+    """Dataclass for the token fields stored with a refresh token."""
+
+    jti: str
+    username: str
+    expires_at: datetime
+    token_family: str | None = None
+
+
+@dataclass(slots=True)
+class TokenPair:
+    """Dataclass for token pair."""
+
+    access_token: str
+    refresh_token: str
+    token_type: str = "Bearer"
+
+
+@dataclass(slots=True)
+class CompactionReport:
+    """Dataclass for the outcome of a refresh token compaction run."""
+
+    reclaimed_documents: int = 0
+    family_updates: int = 0
+    batches: int = 0
+    index_size_before: int = 0
+    index_size_after: int = 0
@@ -0,0 +1,126 @@
+"""Interface of the MongoDB objects the services depend on.
+
+The services only use the subset of the pymongo API described here, so
+any connection providing it can stand in for `MongoConnect`, e.g. the
+in-memory `auth_service.db.memory.MemoryConnection`.
+"""
+
+from typing import Any, Iterable, Iterator, Mapping, Protocol
+
+from pymongo.results import (
+    BulkWriteResult,
+    DeleteResult,
+    InsertManyResult,
+    InsertOneResult,
+    UpdateResult,
+)
+
+
+class Cursor(Protocol):
+    """Result of `Collection.find`, iterated once."""
+
+    def sort(self, key: str | list, direction: int | None = None) -> "Cursor":
+        """Order the results."""
+
+    def limit(self, limit: int) -> "Cursor":
+        """Return at most `limit` results."""
+
+    def __iter__(self) -> Iterator[dict]:
+        """Iterate over the matching documents."""
+
+
+class Collection(Protocol):
+    """A collection of documents."""
+
+    def find(
+        self, filter: Mapping | None = None, projection: Any = None
+    ) -> Cursor:
+        """Find the documents matching a filter."""
+
+    def find_one(
+        self, filter: Mapping | None = None, projection: Any = None
+    ) -> dict | None:
+        """Find the first document matching a filter."""
+
+    def find_one_and_update(
+        self,
+        filter: Mapping,
+        update: Mapping,
+        projection: Any = None,
+        upsert: bool = False,
+        return_document: bool = False,
+    ) -> dict | None:
+        """Update a document and return it as before or after the update."""
+
+    def find_one_and_delete(
+        self, filter: Mapping, projection: Any = None
+    ) -> dict | None:
+        """Delete a document and return it."""
+
+    def insert_one(self, document: dict) -> InsertOneResult:
+        """Insert a document."""
+
+    def insert_many(
+        self, documents: Iterable[dict], ordered: bool = True
+    ) -> InsertManyResult:
+        """Insert several documents."""
+
+    def replace_one(
+        self, filter: Mapping, replacement: dict, upsert: bool = False
+    ) -> UpdateResult:
+        """Replace the first document matching a filter."""
+
+    def update_one(
+        self, filter: Mapping, update: Mapping, upsert: bool = False
+    ) -> UpdateResult:
+        """Update the first document matching a filter."""
+
+    def update_many(
+        self, filter: Mapping, update: Mapping, upsert: bool = False
+    ) -> UpdateResult:
+        """Update every document matching a filter."""
+
+    def delete_one(self, filter: Mapping) -> DeleteResult:
+        """Delete the first document matching a filter."""
+
+    def delete_many(self, filter: Mapping) -> DeleteResult:
+        """Delete every document matching a filter."""
+
+    def count_documents(self, filter: Mapping) -> int:
+        """Count the documents matching a filter."""
+
+    def bulk_write(
+        self, requests: list, ordered: bool = True
+    ) -> BulkWriteResult:
+        """Apply several write operations."""
+
+    def create_index(self, keys: str | list, **kwargs) -> str:
+        """Create an index, return its name."""
+
+
+class Database(Protocol):
+    """A database; collections are also reachable as attributes."""
+
+    def get_collection(self, name: str, **kwargs) -> Collection:
+        """Return a collection, `read_preference` may be given."""
+
+    def create_collection(self, name: str, **kwargs) -> Collection:
+        """Create a collection, e.g. a capped one."""
+
+    def command(self, command: str, value: Any = 1) -> dict:
+        """Run a database command such as `collStats`."""
+
+    def __getattr__(self, name: str) -> Collection:
+        """Return the collection with this name."""
+
+
+class Connection(Protocol):
+    """A connection to one database, see `commons.database.MongoConnect`."""
+
+    db: Database
+
+    def get_collection(self, name: str) -> Collection:
+        """Return a collection of the database."""
+
+    def close(self):
+        """Release the connection."""
@@ -1,10 +1,15 @@
 """Models for the auth service"""
 
+from datetime import datetime
 from typing import Optional
 
 from pydantic import BaseModel
 from pydantic.fields import Field
 
+from auth_service.core.config import settings
+from auth_service.db.enums import TokenType
+from auth_service.db.models import BasicUserInfo
+
 
 class UserCreate(BaseModel):
     """User creation model"""
@@ -42,3 +47,88 @@ class LoginResponse(BaseModel):
     token_type: str = Field(..., examples=["bearer"])
     message: Optional[str] = Field(..., examples=["Login successful"])
     error: Optional[str] = Field(..., examples=["Invalid credentials"])
+
+
+class MessageResponse(BaseModel):
+    """Message response model"""
+
+    message: str = Field(..., examples=["Successfully logged out"])
+
+
+class AccessTokenResponse(BaseModel):
+    """Access token response model"""
+
+    access_token: str = Field(..., examples=["access_token"])
+
+
+class TokenPairResponse(BaseModel):
+    """Token pair response model"""
+
+    access_token: str = Field(..., examples=["access_token"])
+    refresh_token: str = Field(..., examples=["refresh_token"])
+    token_type: str = Field("Bearer", examples=["Bearer"])
+
+
+class TokenValidationResponse(BaseModel):
+    """Token validation response model"""
+
+    valid: bool = Field(..., examples=[True])
+    user: BasicUserInfo
+    degraded: bool = Field(False, examples=[False])
+
+
+class IntrospectionRequest(BaseModel):
+    """Batch token introspection request model"""
+
+    tokens: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.INTROSPECTION_MAX_TOKENS,
+        examples=[["access_token_1", "access_token_2"]],
+    )
+    token_type: TokenType = Field(
+        TokenType.BEARER, examples=[TokenType.BEARER]
+    )
+
+
+class IntrospectionResult(BaseModel):
+    """Introspection result of a single token"""
+
+    active: bool = Field(..., examples=[True, False])
+    token_type: Optional[str] = Field(None, examples=["bearer"])
+    username: Optional[str] = Field(None, examples=["johndoe"])
+    sub: Optional[str] = Field(None, examples=["johndoe"])
+    iss: Optional[str] = Field(
+        None, examples=["awesome-babushka-auth-service"]
+    )
+    aud: Optional[str] = Field(None, examples=["awesome-babushka-users"])
+    exp: Optional[int] = Field(None, examples=[1735689600])
+    iat: Optional[int] = Field(None, examples=[1735687800])
+    jti: Optional[str] = Field(None, examples=["0b1f6c3e-8c2a-4f0e"])
+    user: Optional[BasicUserInfo] = None
+
+
+class IntrospectionResponse(BaseModel):
+    """Batch token introspection response model"""
+
+    results: list[IntrospectionResult]
+
+
+class SessionInfo(BaseModel):
+    """Active session model"""
+
+    session_id: str = Field(..., examples=["9f1c2e7b4a5d4c3b8e6f0a1b2c3d4e5f"])
+    device_info: Optional[str] = Field(None, examples=["Mozilla/5.0"])
+    ip_address: Optional[str] = Field(None, examples=["192.168.1.1"])
+    created_at: datetime
+    expires_at: datetime
+    current: bool = Field(False, examples=[True, False])
+
+
+class SessionPage(BaseModel):
+    """Page of active sessions"""
+
+    sessions: list[SessionInfo]
+    next_cursor: Optional[str] = Field(
+        None, examples=["66a1f0c2e4b0a1b2c3d4e5f6", None]
+    )
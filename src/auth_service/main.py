@@ -1,16 +1,84 @@
 """Main module for the auth service."""
 
-import uvicorn
-from fastapi import FastAPI
+import asyncio
+import logging
+import math
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import (
+    ORJSONResponse,
+    PlainTextResponse,
+    RedirectResponse,
+)
+from pymongo.errors import ConnectionFailure
 
+from auth_service import server
+from auth_service.api.v1.audit import audit_router
 from auth_service.api.v1.auth import auth_router
+from auth_service.api.v1.fast_validate import fast_validate_route
 from auth_service.api.v1.token import token_router
 from auth_service.api.v1.user import user_router
+from auth_service.core import metrics
+from auth_service.core.circuit_breaker import CircuitOpenError
+from auth_service.core.config import settings
+from auth_service.core.signing import close_signing_executor
+from auth_service.db.connection import close_mongo_connection
+from auth_service.services.audit import close_audit_log, get_audit_log
+from auth_service.utils.concurrency import ConcurrencyLimitMiddleware
+from auth_service.warmup import (
+    WARMUP_STEPS,
+    retry_warm_up,
+    warm_up,
+    warmup_report,
+)
+
+logger = logging.getLogger(__file__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare the database on startup and release it on shutdown."""
+    # pylint: disable=unused-argument
+    get_audit_log().start()
+    retry_task = None
+    # The worker only accepts connections once the lifespan has started.
+    # Index creation is a step of its own, so a worker started while
+    # MongoDB is down still serves and creates them once it is back.
+    try:
+        await asyncio.wait_for(
+            warm_up(WARMUP_STEPS if settings.WARMUP_ENABLED else ("indexes",)),
+            settings.WARMUP_TIMEOUT_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        logger.error(
+            "Warmup did not finish within %ss",
+            settings.WARMUP_TIMEOUT_SECONDS,
+        )
+    if not warmup_report.warm:
+        # Serve anyway, and turn ready once the failed steps succeed.
+        retry_task = asyncio.create_task(retry_warm_up())
+    yield
+    if retry_task is not None:
+        retry_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await retry_task
+    close_signing_executor()
+    close_audit_log()
+    close_mongo_connection()
 
-api = FastAPI(title="Auth Service", version="0.1.0")
 
+api = FastAPI(
+    title="Auth Service",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
+if settings.CONCURRENCY_LIMITS_ENABLED:
+    # Innermost, so shed responses still carry the CORS headers.
+    api.add_middleware(ConcurrencyLimitMiddleware)
 api.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
@@ -18,10 +86,41 @@ api.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+api.add_middleware(server.WorkerLoadMiddleware)
 
 api.include_router(auth_router, prefix="/api/v1")
 api.include_router(token_router, prefix="/api/v1")
 api.include_router(user_router, prefix="/api/v1")
+api.include_router(audit_router, prefix="/api/v1")
+if settings.FAST_VALIDATE_ENABLED:
+    # Matched before the FastAPI route of the same path.
+    api.router.routes.insert(0, fast_validate_route())
+
+
+@api.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    """Fail fast with 503 while a dependency's circuit is open."""
+    # pylint: disable=unused-argument
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Service temporarily unavailable"},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
+@api.exception_handler(ConnectionFailure)
+async def database_unavailable_handler(
+    request: Request, exc: ConnectionFailure
+):
+    """Report an unreachable database as 503 rather than a server error."""
+    # pylint: disable=unused-argument
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Service temporarily unavailable"},
+        headers={
+            "Retry-After": str(math.ceil(settings.MONGO_BREAKER_OPEN_SECONDS))
+        },
+    )
 
 
 @api.get("/", include_in_schema=False)
@@ -30,9 +129,56 @@ async def root():
     return RedirectResponse(url="/docs")
 
 
+@api.get("/workers", include_in_schema=False)
+async def workers():
+    """Report the health and load of every worker process."""
+    return {"workers": server.worker_stats.snapshot()}
+
+
+@api.get("/healthz", include_in_schema=False)
+async def healthz():
+    """Report that the worker is alive and serving requests."""
+    return {"status": "ok"}
+
+
+@api.get("/readyz", include_in_schema=False)
+async def readyz():
+    """Report whether the worker is warm and accepting new traffic.
+
+    Answers 503 until the warmup, or a retry of its failed steps, has
+    succeeded and while the worker drains, so a load balancer only routes
+    to warmed workers. With the warmup disabled, only the index creation
+    has to succeed.
+    """
+    draining = bool(
+        server.worker_stats.get(server.worker_stats.slot, "draining")
+    )
+    ready = warmup_report.warm and not draining
+    return ORJSONResponse(
+        status_code=(
+            status.HTTP_200_OK
+            if ready
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+        content={
+            "ready": ready,
+            "draining": draining,
+            "warmup": warmup_report.as_dict(),
+        },
+    )
+
+
+@api.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Expose the process metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
 def main():
-    """Run the FastAPI application."""
-    uvicorn.run(api)
+    """Run the FastAPI application with the production launcher."""
+    server.serve()
 
 
 if __name__ == "__main__":
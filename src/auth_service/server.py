@@ -0,0 +1,357 @@
+"""Production launcher running the auth service on every core.
+
+The master process preloads configuration, signing keys and the heavy
+libraries, binds the listening socket and forks `WORKERS` uvicorn workers
+that share it. It only reports the service as started once every worker has
+finished its startup, restarts workers that die, performs a rolling restart
+on SIGHUP and a rolling graceful drain on SIGTERM/SIGINT so in-flight
+requests such as logins can finish.
+
+Each worker publishes its health and load (readiness, warmup, draining flag,
+in-flight and handled requests) to a shared-memory table that any worker can
+serve, see `WorkerStats`.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+from auth_service.core.config import settings
+
+logger = logging.getLogger(__file__)
+
+APP = "auth_service.main:api"
+
+
+class WorkerStats:
+    """Per-worker health and load counters.
+
+    Every worker owns one slot of a flat array of doubles. When running under
+    the launcher the array lives in shared memory so each worker can report
+    on all of them; otherwise it is a private single-slot table.
+    """
+
+    FIELDS = (
+        "pid",
+        "ready",
+        "warm",
+        "draining",
+        "in_flight",
+        "handled",
+        "started_at",
+    )
+
+    def __init__(self, slots: int = 1, shared: bool = False):
+        """Initialize the WorkerStats class.
+
+        Args:
+            slots (int): The number of worker slots.
+            shared (bool): Whether to allocate the table in shared memory so
+                it survives a fork.
+        """
+        size = slots * len(self.FIELDS)
+        if shared:
+            self._values = multiprocessing.get_context("fork").Array(
+                "d", size, lock=False
+            )
+        else:
+            self._values = [0.0] * size
+        self.slots = slots
+        self.slot = 0
+        self._offsets = {
+            field: index for index, field in enumerate(self.FIELDS)
+        }
+
+    def _index(self, slot: int, field: str) -> int:
+        return slot * len(self.FIELDS) + self._offsets[field]
+
+    def get(self, slot: int, field: str) -> float:
+        """Read a field of a slot."""
+        return self._values[self._index(slot, field)]
+
+    def set(self, slot: int, field: str, value: float):
+        """Write a field of a slot."""
+        self._values[self._index(slot, field)] = value
+
+    def attach(self, slot: int):
+        """Claim a slot for the current process."""
+        for field in self.FIELDS:
+            self.set(slot, field, 0)
+        self.slot = slot
+        self.set(slot, "pid", os.getpid())
+        self.set(slot, "started_at", time.time())
+
+    def release(self, slot: int):
+        """Free a slot whose worker has exited."""
+        for field in self.FIELDS:
+            self.set(slot, field, 0)
+
+    def free_slot(self) -> int:
+        """Return the first unclaimed slot."""
+        for slot in range(self.slots):
+            if not self.get(slot, "pid"):
+                return slot
+        raise RuntimeError("No free worker slot")
+
+    def request_started(self):
+        """Count a request entering the current worker."""
+        self._values[self._index(self.slot, "in_flight")] += 1
+
+    def request_finished(self):
+        """Count a request leaving the current worker."""
+        self._values[self._index(self.slot, "in_flight")] -= 1
+        self._values[self._index(self.slot, "handled")] += 1
+
+    def snapshot(self) -> list[dict]:
+        """Return the health and load of every known worker."""
+        workers = []
+        for slot in range(self.slots):
+            pid = int(self.get(slot, "pid"))
+            if pid <= 0:
+                continue
+            workers.append(
+                {
+                    "slot": slot,
+                    "pid": pid,
+                    "alive": _is_alive(pid),
+                    "ready": bool(self.get(slot, "ready")),
+                    "warm": bool(self.get(slot, "warm")),
+                    "draining": bool(self.get(slot, "draining")),
+                    "in_flight": int(self.get(slot, "in_flight")),
+                    "handled": int(self.get(slot, "handled")),
+                    "uptime_seconds": round(
+                        time.time() - self.get(slot, "started_at"), 3
+                    ),
+                }
+            )
+        return workers
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# Replaced by a shared table in the master before the workers are forked.
+worker_stats = WorkerStats()
+worker_stats.attach(0)
+worker_stats.set(0, "ready", 1)
+
+
+class WorkerLoadMiddleware:
+    """ASGI middleware counting the in-flight and handled requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        worker_stats.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            worker_stats.request_finished()
+
+
+def preload():
+    """Load everything the workers can share before forking.
+
+    The signing keys and configuration are read once, the bcrypt backend is
+    resolved, the breached password file is mapped and the application is
+    imported so the workers inherit it copy-on-write. Importing the
+    application does not connect to the database; each worker opens its own
+    connection after the fork.
+    """
+    # pylint: disable=import-outside-toplevel,unused-import
+    from passlib.hash import bcrypt
+
+    import auth_service.main  # noqa: F401
+    from auth_service.core.breached_passwords import (
+        get_breached_password_index,
+    )
+
+    _ = settings.JWT_PRIVATE_KEY, settings.JWT_PUBLIC_KEY
+    bcrypt.get_backend()
+    get_breached_password_index()
+
+
+def _bind_socket() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((settings.HOST, settings.PORT))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+async def _serve_worker(server: uvicorn.Server, sock: socket.socket):
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+    while not server.started and not task.done():
+        await asyncio.sleep(0.05)
+    if server.started:
+        worker_stats.set(worker_stats.slot, "ready", 1)
+    await task
+
+
+def _run_worker(slot: int, sock: socket.socket):
+    """Entry point of a forked worker process."""
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    worker_stats.attach(slot)
+    config = uvicorn.Config(
+        APP,
+        lifespan="on",
+        timeout_graceful_shutdown=settings.GRACEFUL_TIMEOUT_SECONDS,
+    )
+    asyncio.run(_serve_worker(uvicorn.Server(config), sock))
+
+
+class Launcher:
+    """Pre-fork master supervising the uvicorn workers."""
+
+    def __init__(self, workers: int):
+        """Initialize the Launcher class.
+
+        Args:
+            workers (int): The number of worker processes to run.
+        """
+        self.workers = workers
+        self.context = multiprocessing.get_context("fork")
+        self.processes: dict[int, multiprocessing.Process] = {}
+        self.sock: socket.socket | None = None
+        self.should_exit = False
+        self.should_reload = False
+
+    def _spawn(self) -> int:
+        slot = worker_stats.free_slot()
+        # Claim the slot before forking so concurrent spawns do not race.
+        worker_stats.set(slot, "pid", -1)
+        process = self.context.Process(
+            target=_run_worker, args=(slot, self.sock), daemon=False
+        )
+        process.start()
+        self.processes[slot] = process
+        return slot
+
+    def _wait_ready(self, slots: list[int]) -> bool:
+        deadline = time.monotonic() + settings.WORKER_READY_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            if all(worker_stats.get(slot, "ready") for slot in slots):
+                return True
+            if any(not self.processes[slot].is_alive() for slot in slots):
+                return False
+            time.sleep(0.05)
+        return False
+
+    def _drain(self, slot: int):
+        process = self.processes[slot]
+        worker_stats.set(slot, "draining", 1)
+        worker_stats.set(slot, "ready", 0)
+        if process.pid and process.is_alive():
+            os.kill(process.pid, signal.SIGTERM)
+
+    def _reap(self, slot: int, timeout: float | None = None):
+        process = self.processes.pop(slot)
+        process.join(timeout)
+        if process.is_alive():
+            logger.warning("Worker %s did not drain in time", process.pid)
+            process.kill()
+            process.join()
+        worker_stats.release(slot)
+
+    def _rolling_restart(self):
+        logger.info("Rolling restart of %d workers", len(self.processes))
+        for old_slot in list(self.processes):
+            new_slot = self._spawn()
+            if not self._wait_ready([new_slot]):
+                logger.error("Replacement worker failed to become ready")
+                self._drain(new_slot)
+                self._reap(new_slot, settings.GRACEFUL_TIMEOUT_SECONDS)
+                return
+            self._drain(old_slot)
+            self._reap(old_slot, settings.GRACEFUL_TIMEOUT_SECONDS + 5)
+
+    def _shutdown(self):
+        logger.info("Draining %d workers", len(self.processes))
+        for slot in list(self.processes):
+            self._drain(slot)
+            time.sleep(settings.DRAIN_STAGGER_SECONDS)
+        for slot in list(self.processes):
+            self._reap(slot, settings.GRACEFUL_TIMEOUT_SECONDS + 5)
+
+    def _handle_exit(self, signum, frame):
+        # pylint: disable=unused-argument
+        self.should_exit = True
+
+    def _handle_reload(self, signum, frame):
+        # pylint: disable=unused-argument
+        self.should_reload = True
+
+    def run(self):
+        """Start the workers and supervise them until asked to stop."""
+        global worker_stats  # pylint: disable=global-statement
+
+        preload()
+        worker_stats = WorkerStats(slots=self.workers * 2, shared=True)
+        self.sock = _bind_socket()
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        signal.signal(signal.SIGINT, self._handle_exit)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+
+        slots = [self._spawn() for _ in range(self.workers)]
+        if self._wait_ready(slots):
+            logger.info(
+                "Serving on http://%s:%d with %d workers",
+                settings.HOST,
+                settings.PORT,
+                self.workers,
+            )
+        else:
+            logger.error("Workers failed to become ready")
+            self.should_exit = True
+
+        while not self.should_exit:
+            if self.should_reload:
+                self.should_reload = False
+                self._rolling_restart()
+            for slot, process in list(self.processes.items()):
+                if not process.is_alive():
+                    logger.warning(
+                        "Worker %s exited with %s, restarting",
+                        process.pid,
+                        process.exitcode,
+                    )
+                    self._reap(slot)
+                    self._spawn()
+            time.sleep(0.5)
+
+        self._shutdown()
+        self.sock.close()
+
+
+def serve(workers: int | None = None):
+    """Run the auth service with the production launcher.
+
+    Args:
+        workers (int | None): The number of worker processes. Defaults to
+            `settings.WORKERS`.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    Launcher(workers or settings.WORKERS).run()
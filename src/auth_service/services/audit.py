@@ -0,0 +1,282 @@
+"""Batched, append-only audit log of authentication events."""
+
+import asyncio
+import logging
+import random
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.cursor import Cursor
+from pymongo.errors import PyMongoError
+
+from auth_service.core import metrics
+from auth_service.core.config import settings
+from auth_service.db.connection import get_mongo_connection
+
+logger = logging.getLogger(__file__)
+
+OVERFLOW_POLICIES = ("drop", "block", "sample")
+
+# Age below which stored events are not exported yet, see `AuditLog.export`.
+EXPORT_SETTLE_SECONDS = 2
+
+# Security relevant events, never sampled out by the "sample" policy.
+UNSAMPLED_EVENTS = {"login_failed", "login_locked", "token_reuse_detected"}
+
+
+def _on_event_loop() -> bool:
+    """Whether the caller runs on a thread with a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class AuditLog:
+    """In-memory buffer of audit events flushed to MongoDB in batches.
+
+    Producers only append to the buffer under a lock; a background thread
+    drains it with unordered `insert_many` calls, so recording an event
+    never waits on the database. What happens when the buffer is full is
+    decided by the overflow policy, see `settings.AUDIT_OVERFLOW_POLICY`.
+    Events still buffered when the process is killed are lost.
+    """
+
+    def __init__(
+        self,
+        mongo_connection,
+        buffer_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow_policy: str = "drop",
+        block_timeout: float = 0.05,
+        sample_rate: float = 0.1,
+    ):
+        """Initialize the AuditLog class.
+
+        Args:
+            mongo_connection (MongoConnect): The MongoDB connection to use.
+            buffer_size (int): The maximum number of buffered events.
+            batch_size (int): The maximum number of events per insert.
+            flush_interval (float): Seconds between flushes of a partial
+                batch.
+            overflow_policy (str): "drop", "block" or "sample".
+            block_timeout (float): Seconds the "block" policy waits for room.
+            sample_rate (float): Share of routine events the "sample" policy
+                keeps once the buffer is half full.
+
+        Raises:
+            ValueError: If the overflow policy is unknown.
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self.mongo_connection = mongo_connection
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.sample_rate = sample_rate
+        self._buffer: deque[dict] = deque()
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self.recorded = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.written = 0
+        self.lost = 0
+
+    @property
+    def collection(self):
+        """The audit event collection."""
+        return self.mongo_connection.get_collection(settings.AUDIT_COLLECTION)
+
+    def _has_room(self, event: str) -> bool:
+        """Apply the overflow policy; must be called holding the lock."""
+        if self.overflow_policy == "sample" and (
+            event not in UNSAMPLED_EVENTS
+            and len(self._buffer) * 2 >= self.buffer_size
+            and random.random() >= self.sample_rate
+        ):
+            self.sampled_out += 1
+            return False
+        # Waiting on the event loop would stall every other request, so
+        # there "block" falls back to dropping.
+        if self.overflow_policy == "block" and not _on_event_loop():
+            self._condition.wait_for(
+                lambda: len(self._buffer) < self.buffer_size,
+                timeout=self.block_timeout,
+            )
+        if len(self._buffer) >= self.buffer_size:
+            self.dropped += 1
+            return False
+        return True
+
+    def record(self, event: str, username: str | None = None, **details):
+        """Queue an audit event.
+
+        With the "block" policy this waits up to `block_timeout` for room
+        in a full buffer, unless called from the event loop: there a full
+        buffer drops the event as with the "drop" policy.
+
+        Args:
+            event (str): The event name, e.g. "login_succeeded".
+            username (str | None): The user the event is about.
+            **details: Further fields stored with the event.
+
+        Returns:
+            bool: True if the event was queued.
+        """
+        document = {
+            "ts": datetime.now(timezone.utc),
+            "event": event,
+            "username": username,
+            **details,
+        }
+        with self._condition:
+            if not self._has_room(event):
+                return False
+            self._buffer.append(document)
+            self.recorded += 1
+            if len(self._buffer) >= self.batch_size:
+                self._condition.notify_all()
+        return True
+
+    def start(self):
+        """Start the background flusher thread."""
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name="audit-flusher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Flush every buffered event and stop the flusher thread."""
+        if self._thread is None:
+            return
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stopping
+                    or len(self._buffer) >= self.batch_size,
+                    timeout=self.flush_interval,
+                )
+                size = min(self.batch_size, len(self._buffer))
+                batch = [self._buffer.popleft() for _ in range(size)]
+                done = self._stopping and not self._buffer
+                # Wake producers blocked on a full buffer.
+                self._condition.notify_all()
+            if batch:
+                self._write(batch)
+            if done:
+                return
+
+    def _write(self, batch: list[dict]):
+        try:
+            self.collection.insert_many(batch, ordered=False)
+            self.written += len(batch)
+        except PyMongoError as e:
+            self.lost += len(batch)
+            logger.warning("Lost %d audit events: %s", len(batch), e)
+
+    def export(self, after: str | None = None, limit: int = 1000) -> Cursor:
+        """Iterate over stored events in insertion order.
+
+        Events are ordered by `_id`, so an export can be resumed from the
+        `_id` of the last event it returned. The `_id`s are generated by
+        each worker at insert time; events of the last
+        `EXPORT_SETTLE_SECONDS` are left out so that a concurrent insert of
+        another worker cannot land before the resumption point.
+
+        Args:
+            after (str | None): Only return events after this `_id`.
+            limit (int): The maximum number of events.
+
+        Returns:
+            Cursor: The events, with their `_id`.
+
+        Raises:
+            ValueError: If the cursor is not a valid `_id`.
+        """
+        settled = datetime.now(timezone.utc) - timedelta(
+            seconds=EXPORT_SETTLE_SECONDS
+        )
+        query = {"_id": {"$lt": ObjectId.from_datetime(settled)}}
+        if after is not None:
+            if not ObjectId.is_valid(after):
+                raise ValueError("Invalid audit cursor")
+            query["_id"]["$gt"] = ObjectId(after)
+        return self.collection.find(query).sort("_id", ASCENDING).limit(limit)
+
+    def collect(self) -> list[metrics.Metric]:
+        """Return the event counters and buffer size as metrics."""
+        return [
+            metrics.Metric(
+                "auth_audit_events_total",
+                "counter",
+                "Audit events by outcome.",
+                [
+                    ({"outcome": "recorded"}, self.recorded),
+                    ({"outcome": "dropped"}, self.dropped),
+                    ({"outcome": "sampled_out"}, self.sampled_out),
+                    ({"outcome": "written"}, self.written),
+                    ({"outcome": "lost"}, self.lost),
+                ],
+            ),
+            metrics.Metric(
+                "auth_audit_buffered",
+                "gauge",
+                "Audit events waiting to be written.",
+                [({}, len(self._buffer))],
+            ),
+        ]
+
+
+@lru_cache(maxsize=1)
+def get_audit_log() -> AuditLog:
+    """Return the process-wide audit log, creating it on first use.
+
+    Returns:
+        AuditLog: The audit log configured by the `AUDIT_*` settings.
+    """
+    return AuditLog(
+        get_mongo_connection(),
+        buffer_size=settings.AUDIT_BUFFER_SIZE,
+        batch_size=settings.AUDIT_BATCH_SIZE,
+        flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+        overflow_policy=settings.AUDIT_OVERFLOW_POLICY,
+        block_timeout=settings.AUDIT_BLOCK_TIMEOUT_SECONDS,
+        sample_rate=settings.AUDIT_SAMPLE_RATE,
+    )
+
+
+def _collect() -> list[metrics.Metric]:
+    """Return the metrics of the current audit log, if one was created."""
+    if not get_audit_log.cache_info().currsize:
+        return []
+    return get_audit_log().collect()
+
+
+metrics.register(_collect)
+
+
+def close_audit_log():
+    """Flush and stop the audit log if it was ever created."""
+    if get_audit_log.cache_info().currsize:
+        get_audit_log().stop()
+        get_audit_log.cache_clear()
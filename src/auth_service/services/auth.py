@@ -1,19 +1,30 @@
 """Service for handling authentication."""
 
+import asyncio
 import logging
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from commons.database import MongoConnect
 from fastapi import status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from passlib.context import CryptContext
 from pymongo.errors import DuplicateKeyError
 
+from auth_service.core.breached_passwords import check_password_not_breached
 from auth_service.core.config import settings
-from auth_service.db.models import User, ActivationKey
+from auth_service.db.connection import get_mongo_connection
+from auth_service.db.models import User, ActivationKey, to_basic_user_info
+from auth_service.db.normalization import normalize_email, normalize_username
+from auth_service.db.queries import UserQueries
+from auth_service.db.repository import Connection
 from auth_service.db.schemas import UserCreate, LoginRequest
+from auth_service.services.audit import get_audit_log
 from auth_service.services.email_agent import send_verification_email
+from auth_service.services.user import UserService
+from auth_service.services.lockout import (
+    AccountLocked,
+    LoginAttemptTracker,
+)
 
 logger = logging.getLogger(__file__)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -22,19 +33,21 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 class AuthService:
     """Authentication service class."""
 
-    def __init__(self):
-        """Initialize the AuthService class."""
+    def __init__(self, mongo_connection: Connection | None = None):
+        """Initialize the AuthService class.
+
+        Args:
+            mongo_connection (Connection | None): The connection to use,
+                e.g. a `MemoryConnection`. Defaults to the shared one.
+        """
         logging.basicConfig(
             level=logging.INFO,
             format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         )
-        self.mongo_connection = MongoConnect(
-            settings.MONGO_URI, settings.DB_NAME
-        )
-
-    def __del__(self):
-        """Close the MongoDB connection."""
-        self.mongo_connection.close()
+        self.mongo_connection = mongo_connection or get_mongo_connection()
+        self.user_queries = UserQueries(self.mongo_connection)
+        self.login_attempts = LoginAttemptTracker(self.mongo_connection)
+        self.audit_log = get_audit_log()
 
     async def register_user(self, user: UserCreate) -> bool:
         """Register a new user.
@@ -44,14 +57,23 @@ class AuthService:
 
         Returns:
             bool: Registration success status.
+
+        Raises:
+            BreachedPasswordError: If the password has appeared in a breach.
+            ValueError: If the user already exists or cannot be stored.
         """
+        check_password_not_breached(user.password)
         try:
-            hashed_password = pwd_context.hash(user.password)
+            hashed_password = await asyncio.to_thread(
+                pwd_context.hash, user.password
+            )
             verification_token = uuid4().hex
             db_user = User(
                 username=user.username,
                 email=user.email,
                 password=hashed_password,
+                username_normalized=normalize_username(user.username),
+                email_normalized=normalize_email(user.email),
                 verified=False,
                 active=True,
             )
@@ -78,82 +100,104 @@ class AuthService:
     def authenticate_user(
         self,
         credentials: LoginRequest,
+        ip_address: str | None = None,
     ) -> dict:
         """Authenticate a user.
 
         This method verifies the provided user credentials against the stored
-        user data.
+        user data. Locked accounts are rejected before the password hash is
+        verified, failures count towards the lock and a success resets it.
+        Every outcome is recorded in the audit log.
 
         Args:
             credentials (LoginRequest): User credentials for authentication.
+            ip_address (str | None): IP address of the client.
 
         Returns:
             dict: User details if authentication is successful.
 
         Raises:
+            AccountLocked: If the account is locked after too many failures.
             ValueError: If the username is missing, user does not exist,
                 or credentials are invalid.
         """
         username = credentials.username
         if not username:
             raise ValueError("Username is required")
-        user_details = self.mongo_connection.get_collection(
-            settings.USER_COLLECTION
-        ).find_one({"username": credentials.username})
+        try:
+            failures = self.login_attempts.check(username)
+        except AccountLocked:
+            self.audit_log.record(
+                "login_locked", username, ip_address=ip_address
+            )
+            raise
+        user_details = self.user_queries.find_login(username)
         if not user_details:
+            self.login_attempts.record_failure(username)
+            self.audit_log.record(
+                "login_failed",
+                username,
+                ip_address=ip_address,
+                reason="unknown_user",
+            )
             raise ValueError("User does not exist")
-        user_details = User(**user_details)
-        if not pwd_context.verify(credentials.password, user_details.password):
+        if not pwd_context.verify(
+            credentials.password, user_details["password"]
+        ):
+            self.login_attempts.record_failure(username)
+            self.audit_log.record(
+                "login_failed",
+                username,
+                ip_address=ip_address,
+                reason="invalid_password",
+            )
             raise ValueError("Invalid credentials")
-        token_data = user_details.model_dump(
-            exclude={
-                "password",
-                "created_at",
-                "updated_at",
-            }
+        if failures:
+            self.login_attempts.reset(username)
+        self.audit_log.record(
+            "login_succeeded", user_details["username"], ip_address=ip_address
         )
-        return token_data
+        return to_basic_user_info(user_details)
 
-    async def verify_user_email(self, token: str) -> JSONResponse:
+    async def verify_user_email(
+        self, token: str, user_service: UserService | None = None
+    ) -> ORJSONResponse:
         """Verify a user's email.
 
+        The activation key is consumed with a single `find_one_and_delete`
+        that also rejects expired keys, and the user is flagged as verified
+        with one conditional update.
+
         Args:
             token (str): Verification token.
+            user_service (UserService | None): The service whose cached
+                profile of the user is dropped, so `/user/me` reports the
+                new status at once.
 
         Returns:
-            JSONResponse: Verification status message.
+            ORJSONResponse: Verification status message.
         """
+        now = datetime.now(timezone.utc)
         db_token = self.mongo_connection.get_collection(
             settings.ACTIVATION_KEY_COLLECTION
-        ).find_one({"token": token})
+        ).find_one_and_delete(
+            {"token": token, "expires_at": {"$gt": now}},
+            projection={"_id": 0, "email": 1},
+        )
         if not db_token:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
-                content={"error": "Token not found"},
+                content={"error": "Token not found or expired"},
             )
-        db_user = self.mongo_connection.get_collection(
-            settings.USER_COLLECTION
-        ).find_one({"email": db_token["email"]})
-        if not db_user:
-            return JSONResponse(
+        username = self.user_queries.mark_verified(db_token["email"], now)
+        if username is None:
+            return ORJSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
-                content={"error": "User not found"},
+                content={"error": "User not found or already verified"},
             )
-        self.mongo_connection.get_collection(
-            settings.ACTIVATION_KEY_COLLECTION
-        ).delete_one({"token": token})
-        self.mongo_connection.get_collection(
-            settings.USER_COLLECTION
-        ).update_one(
-            {"email": db_token["email"]},
-            {
-                "$set": {
-                    "verified": True,
-                    "updated_at": datetime.now(timezone.utc),
-                }
-            },
-        )
-        return JSONResponse(
+        if user_service is not None:
+            user_service.invalidate_profile(username)
+        return ORJSONResponse(
             status_code=status.HTTP_200_OK,
             content={"message": "Email verified successfully"},
         )
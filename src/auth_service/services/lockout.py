@@ -0,0 +1,171 @@
+"""Per-account lockout after repeated failed logins."""
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ReturnDocument
+
+from auth_service.core.config import settings
+from auth_service.db.breaker import mongo_breaker
+from auth_service.db.normalization import normalize_username
+
+logger = logging.getLogger(__file__)
+
+# Upper bound of the per-process cache of locked accounts.
+LOCKED_CACHE_SIZE = 10_000
+
+
+class AccountLocked(Exception):
+    """Raised when a login is attempted on a locked account."""
+
+    def __init__(self, retry_after: float):
+        """Initialize the AccountLocked exception.
+
+        Args:
+            retry_after (float): Seconds until the lock expires.
+        """
+        super().__init__("Too many failed login attempts")
+        self.retry_after = retry_after
+
+
+def lockout_seconds(failures: int) -> float:
+    """Return how long an account is locked after consecutive failures.
+
+    Args:
+        failures (int): The number of consecutive failed logins.
+
+    Returns:
+        float: The lock duration, 0 below the threshold.
+    """
+    if failures < settings.LOGIN_LOCKOUT_THRESHOLD:
+        return 0
+    exponent = min(failures - settings.LOGIN_LOCKOUT_THRESHOLD, 32)
+    return min(
+        settings.LOGIN_LOCKOUT_BASE_SECONDS * 2**exponent,
+        settings.LOGIN_LOCKOUT_MAX_SECONDS,
+    )
+
+
+class LoginAttemptTracker:
+    """Failed login counter with exponential backoff.
+
+    Counters live in the `login_attempts` collection, one document per
+    normalized username, so every worker and instance sees the same lock.
+    Each worker also remembers the locks it has seen, which lets it reject
+    repeated attempts on a locked account without a database round trip,
+    let alone a bcrypt verify.
+    """
+
+    def __init__(self, mongo_connection):
+        """Initialize the LoginAttemptTracker class.
+
+        Args:
+            mongo_connection (MongoConnect): The MongoDB connection to use.
+        """
+        self.mongo_connection = mongo_connection
+        self._locked_until: dict[str, float] = {}
+
+    @property
+    def collection(self):
+        """The login attempt collection."""
+        return self.mongo_connection.get_collection(
+            settings.LOGIN_ATTEMPT_COLLECTION
+        )
+
+    def _remember_lock(self, key: str, locked_until: float):
+        if len(self._locked_until) >= LOCKED_CACHE_SIZE:
+            now = time.time()
+            self._locked_until = {
+                cached: until
+                for cached, until in self._locked_until.items()
+                if until > now
+            }
+        self._locked_until[key] = locked_until
+
+    def check(self, username: str) -> int:
+        """Reject the login if the account is locked.
+
+        Args:
+            username (str): The username attempting to log in.
+
+        Returns:
+            int: The number of consecutive failed logins so far.
+
+        Raises:
+            AccountLocked: If the account is currently locked.
+        """
+        key = normalize_username(username)
+        now = time.time()
+        cached = self._locked_until.get(key)
+        if cached is not None:
+            if cached > now:
+                raise AccountLocked(cached - now)
+            del self._locked_until[key]
+
+        with mongo_breaker.guard():
+            attempts = self.collection.find_one(
+                {"_id": key}, {"_id": 0, "failures": 1, "locked_until": 1}
+            )
+        if not attempts:
+            return 0
+        locked_until = attempts.get("locked_until")
+        if locked_until is not None:
+            if locked_until.tzinfo is None:
+                locked_until = locked_until.replace(tzinfo=timezone.utc)
+            if locked_until.timestamp() > now:
+                self._remember_lock(key, locked_until.timestamp())
+                raise AccountLocked(locked_until.timestamp() - now)
+        return attempts["failures"]
+
+    def record_failure(self, username: str):
+        """Count a failed login and lock the account past the threshold.
+
+        Args:
+            username (str): The username that failed to log in.
+        """
+        key = normalize_username(username)
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(
+            seconds=settings.LOGIN_ATTEMPT_WINDOW_SECONDS
+        )
+        attempts = self.collection.find_one_and_update(
+            {"_id": key},
+            {
+                "$inc": {"failures": 1},
+                "$set": {"last_failure": now, "expires_at": expires_at},
+            },
+            projection={"_id": 0, "failures": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        duration = lockout_seconds(attempts["failures"])
+        if not duration:
+            return
+        locked_until = now + timedelta(seconds=duration)
+        self.collection.update_one(
+            {"_id": key},
+            {
+                "$max": {
+                    "locked_until": locked_until,
+                    "expires_at": locked_until,
+                }
+            },
+        )
+        self._remember_lock(key, locked_until.timestamp())
+        logger.warning(
+            "Locked %s for %.0fs after %d failed logins",
+            key,
+            duration,
+            attempts["failures"],
+        )
+
+    def reset(self, username: str):
+        """Forget the failed logins of an account after a successful login.
+
+        Args:
+            username (str): The username that logged in.
+        """
+        key = normalize_username(username)
+        self._locked_until.pop(key, None)
+        self.collection.delete_one({"_id": key})
@@ -1,29 +1,41 @@
 """Service for handling authentication."""
 
-from dataclasses import dataclass
-from commons.database import MongoConnect
+import asyncio
+import logging
+from uuid import uuid4
+
+from bson import ObjectId
 from fastapi import HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials
-from passlib.context import CryptContext
-from pymongo import ASCENDING
-from datetime import datetime, timezone
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from datetime import datetime, timedelta, timezone
 from jose.exceptions import JWTError
 
+from auth_service.core.cache import TTLCache
+from auth_service.core.circuit_breaker import CircuitOpenError
 from auth_service.core.config import settings
+from auth_service.core.signing import get_signing_executor
+from auth_service.core.singleflight import SingleFlight
 from auth_service.core.token import TokenUtils
+from auth_service.db.breaker import mongo_breaker
+from auth_service.db.connection import get_mongo_connection
 from auth_service.db.enums import TokenType
-from auth_service.db.models import User
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
+from auth_service.db.models import to_basic_user_info
+from auth_service.db.normalization import normalize_username
+from auth_service.db.queries import UserQueries
+from auth_service.db.records import CompactionReport, TokenPair
+from auth_service.db.repository import Connection
+from auth_service.services.audit import get_audit_log
 
-@dataclass
-class TokenPair:
-    """Dataclass for token pair."""
+logger = logging.getLogger(__file__)
 
-    access_token: str
-    refresh_token: str
-    token_type: str = "Bearer"
+SESSION_PROJECTION = {
+    "token_family": 1,
+    "device_info": 1,
+    "ip_address": 1,
+    "created_at": 1,
+    "expires_at": 1,
+}
 
 
 class TokenRefreshError(Exception):
@@ -41,38 +53,24 @@ class TokenReuseDetected(TokenRefreshError):
 class TokenService:
     """Token service class."""
 
-    def __init__(self):
-        """Initialize the TokenService class."""
-
-        self.mongo_connection = MongoConnect(
-            settings.MONGO_URI, settings.DB_NAME
-        )
-        self._create_indexes()
+    def __init__(self, mongo_connection: Connection | None = None):
+        """Initialize the TokenService class.
 
-    def __del__(self):
-        """Close the MongoDB connection."""
-        self.mongo_connection.close()
-
-    def _create_indexes(self):
-        """Create necessary indexes in the database.
-
-        - Unique index on `jti` to ensure each token is unique.
-        - Index on `username` for efficient querying of tokens by user.
-        - Index on `token_family` to facilitate family revocation of tokens.
-        - TTL index on `expires_at` to automatically delete expired tokens.
-        - Compound index on `username` and `is_revoked` for faster queries
-            related to token revocation.
+        Args:
+            mongo_connection (Connection | None): The connection to use,
+                e.g. a `MemoryConnection`. Defaults to the shared one.
         """
-        refresh_tokens = self.mongo_connection.db.refresh_tokens
-        refresh_tokens.create_index([("jti", ASCENDING)], unique=True)
-        refresh_tokens.create_index([("username", ASCENDING)])
-        refresh_tokens.create_index([("token_family", ASCENDING)])
-        refresh_tokens.create_index(
-            [("expires_at", ASCENDING)], expireAfterSeconds=0
-        )
-        refresh_tokens.create_index(
-            [("username", ASCENDING), ("is_revoked", ASCENDING)]
+
+        self.mongo_connection = mongo_connection or get_mongo_connection()
+        self.user_queries = UserQueries(self.mongo_connection)
+        self.last_known_status = TTLCache(
+            maxsize=settings.STATUS_CACHE_SIZE,
+            ttl=settings.STATUS_CACHE_TTL_SECONDS,
         )
+        self.audit_log = get_audit_log()
+        # Concurrent validations for the same user, e.g. the parallel API
+        # calls of a page load, share one status lookup on this connection.
+        self.status_flight = SingleFlight("user_status")
 
     async def decode_token(
         self,
@@ -107,6 +105,11 @@ class TokenService:
     ) -> dict:
         """Validate a token.
 
+        While MongoDB is unavailable (`mongo_breaker` open or failing) the
+        token is accepted on its signature alone and reported as `degraded`,
+        with the last-known status of the user, or the claims of the token
+        if the user was never seen by this worker.
+
         Args:
             auth_credentials (HTTPAuthorizationCredentials): Auth credentials.
 
@@ -116,39 +119,137 @@ class TokenService:
         Raises:
             HTTPException: If the token is invalid or user does not exist.
         """
-        decoded_token = TokenUtils.decode_token(
-            token=auth_credentials.credentials, expected_type=expected_type
-        )
-        if "error" in decoded_token:
+        token = auth_credentials.credentials
+        try:
+            # The signature check is cheap enough to run on the event loop.
+            decoded_token = TokenUtils.decode_token(token, expected_type)
+        except (JWTError, ValueError) as e:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=decoded_token["error"],
+                detail=f"Invalid token: {str(e)}",
             )
-        user_details = self.mongo_connection.get_collection(
-            settings.USER_COLLECTION
-        ).find_one({"username": decoded_token["username"]})
+        username = decoded_token["username"]
+        key = normalize_username(username)
+        try:
+            user_details = await self.status_flight.do(
+                key, self.user_queries.find_status, username
+            )
+        except (CircuitOpenError, *mongo_breaker.failure_exceptions):
+            # Tokens issued by a refresh or with a "minimal" or "compact"
+            # claim profile only carry the username.
+            user_details = self.last_known_status.get(key) or {
+                "email": "",
+                **decoded_token,
+            }
+            return {
+                "valid": True,
+                "user": to_basic_user_info(user_details),
+                "degraded": True,
+            }
         if not user_details:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User does not exist",
             )
-        user_details = User(**user_details)
+        self.last_known_status.set(key, user_details)
         return {
             "valid": True,
-            "user": user_details.model_dump(
-                exclude={
-                    "password",
-                    "created_at",
-                    "updated_at",
-                }
-            ),
+            "user": to_basic_user_info(user_details),
         }
 
+    def prime_status_cache(self, limit: int) -> int:
+        """Cache the status of the users with the latest refresh tokens.
+
+        Fills the last-known status used while MongoDB is unavailable, so a
+        freshly started worker can serve degraded validations of active
+        users.
+
+        Args:
+            limit (int): The number of recent refresh tokens to look at.
+
+        Returns:
+            int: The number of users cached.
+        """
+        recent = (
+            self.mongo_connection.db.refresh_tokens.find(
+                {"is_revoked": False}, {"_id": 0, "username": 1}
+            )
+            .sort("_id", DESCENDING)
+            .limit(limit)
+        )
+        statuses = self.user_queries.find_statuses(
+            document["username"] for document in recent
+        )
+        for key, user_details in statuses.items():
+            self.last_known_status.set(key, user_details)
+        return len(statuses)
+
+    async def introspect_tokens(
+        self,
+        tokens: list[str],
+        expected_type: TokenType,
+    ) -> list[dict]:
+        """Introspect several tokens at once (RFC 7662).
+
+        Every token is verified locally, then the owners of the valid ones
+        are resolved with a single query. A token is active when its
+        signature and claims are valid and its owner exists and is active.
+
+        Args:
+            tokens (list[str]): The tokens to introspect.
+            expected_type (TokenType): The expected type of the tokens.
+
+        Returns:
+            list[dict]: One result per token, in request order.
+        """
+        claims: dict[str, dict | None] = {}
+        for token in tokens:
+            if token in claims:
+                continue
+            try:
+                claims[token] = TokenUtils.decode_token(
+                    token=token, expected_type=expected_type
+                )
+            except (JWTError, ValueError):
+                claims[token] = None
+
+        statuses = self.user_queries.find_statuses(
+            payload["username"]
+            for payload in claims.values()
+            if payload and "username" in payload
+        )
+
+        results = []
+        for token in tokens:
+            payload = claims[token]
+            user = None
+            if payload and "username" in payload:
+                user = statuses.get(normalize_username(payload["username"]))
+            if not user or not user.get("active", True):
+                results.append({"active": False})
+                continue
+            results.append(
+                {
+                    "active": True,
+                    "token_type": payload["token_type"],
+                    "username": payload["username"],
+                    "sub": payload.get("sub"),
+                    "iss": payload.get("iss"),
+                    "aud": payload.get("aud"),
+                    "exp": payload.get("exp"),
+                    "iat": payload.get("iat"),
+                    "jti": payload.get("jti"),
+                    "user": to_basic_user_info(user),
+                }
+            )
+        return results
+
     async def create_token_pair(
         self,
         user_data: dict,
         device_info: str | None = None,
         ip_address: str | None = None,
+        token_family: str | None = None,
     ) -> TokenPair:
         """Create a pair of access and refresh tokens.
 
@@ -156,17 +257,28 @@ class TokenService:
             user_data (dict): The user data to encode in the tokens.
             device_info (str | None): Device information.
             ip_address (str | None): IP address.
+            token_family (str | None): The token family to rotate within. A
+                new family, i.e. a new session, is started when omitted.
 
         Returns:
             TokenPair: The access and refresh tokens.
         """
-        access_token = TokenUtils.create_access_token(user_data)
-        refresh_token, metadata = TokenUtils.create_refresh_token(user_data)
+        if token_family is None:
+            token_family = uuid4().hex
+            with mongo_breaker.guard():
+                self._evict_excess_sessions(str(user_data.get("username")))
+        access_claims, _ = TokenUtils.build_claims(user_data, TokenType.BEARER)
+        refresh_claims, metadata = TokenUtils.build_claims(
+            user_data, TokenType.REFRESH, token_family=token_family
+        )
+        access_token, refresh_token = await get_signing_executor().sign(
+            [access_claims, refresh_claims]
+        )
         token_doc = {
-            "jti": metadata["jti"],
-            "username": metadata["username"],
-            "token_family": metadata["token_family"],
-            "expires_at": metadata["expires_at"],
+            "jti": metadata.jti,
+            "username": normalize_username(metadata.username),
+            "token_family": metadata.token_family,
+            "expires_at": metadata.expires_at,
             "created_at": datetime.now(timezone.utc),
             "is_revoked": False,
             "used_at": None,
@@ -175,13 +287,50 @@ class TokenService:
         }
 
         # Insert refresh token document
-        self.mongo_connection.db.refresh_tokens.insert_one(token_doc)
+        with mongo_breaker.guard():
+            self.mongo_connection.db.refresh_tokens.insert_one(token_doc)
 
         return TokenPair(
             access_token=access_token,
             refresh_token=refresh_token,
         )
 
+    def _evict_excess_sessions(self, username: str):
+        """Make room for a new session within `MAX_SESSIONS_PER_USER`.
+
+        The active sessions are counted over the `username`, `is_revoked`
+        index. Only when the limit is reached are the oldest families looked
+        up, in `_id` order over the same index, and revoked.
+
+        Args:
+            username (str): The user who is starting a new session.
+        """
+        max_sessions = settings.MAX_SESSIONS_PER_USER
+        if max_sessions <= 0:
+            return
+        refresh_tokens = self.mongo_connection.db.refresh_tokens
+        active_filter = {
+            "username": normalize_username(username),
+            "is_revoked": False,
+        }
+        excess = (
+            refresh_tokens.count_documents(active_filter) - max_sessions + 1
+        )
+        if excess <= 0:
+            return
+        evicted_families = [
+            document["token_family"]
+            for document in refresh_tokens.find(
+                active_filter, {"_id": 0, "token_family": 1}
+            )
+            .sort("_id", ASCENDING)
+            .limit(excess)
+        ]
+        refresh_tokens.update_many(
+            {"token_family": {"$in": evicted_families}, "is_revoked": False},
+            {"$set": {"is_revoked": True}},
+        )
+
     async def refresh_access_token(
         self,
         refresh_token: str,
@@ -210,14 +359,36 @@ class TokenService:
         token_family = payload.get("token_family")
         username = payload.get("sub")
 
-        db_token = self.mongo_connection.db.refresh_tokens.find_one(
-            {"jti": jti}
-        )
+        with mongo_breaker.guard():
+            db_token = self.mongo_connection.db.refresh_tokens.find_one(
+                {"jti": jti}
+            )
         if not db_token:
+            if token_family and self._is_compacted_family(token_family):
+                await self.revoke_token_family(token_family)
+                self.audit_log.record(
+                    "token_reuse_detected",
+                    username,
+                    token_family=token_family,
+                    ip_address=ip_address,
+                    device_info=device_info,
+                )
+                raise TokenReuseDetected(
+                    "Refresh token reuse detected. All tokens in this family "
+                    "have been revoked. Please login again."
+                )
             raise TokenRefreshError("Refresh token not found")
+        token_family = db_token.get("token_family") or token_family
 
         if db_token.get("used_at") is not None or db_token.get("is_revoked"):
             await self.revoke_token_family(token_family)
+            self.audit_log.record(
+                "token_reuse_detected",
+                username,
+                token_family=token_family,
+                ip_address=ip_address,
+                device_info=device_info,
+            )
             raise TokenReuseDetected(
                 "Refresh token reuse detected. All tokens in this family have "
                 "been revoked. Please login again."
@@ -228,48 +399,86 @@ class TokenService:
             expires_at = expires_at.replace(tzinfo=timezone.utc)
 
         if datetime.now(timezone.utc) > expires_at:
-            self.mongo_connection.db.refresh_tokens.update_one(
-                {"jti": jti}, {"$set": {"is_revoked": True}}
-            )
+            with mongo_breaker.guard():
+                self.mongo_connection.db.refresh_tokens.update_one(
+                    {"jti": jti}, {"$set": {"is_revoked": True}}
+                )
             raise TokenRefreshError("Refresh token has expired")
 
-        self.mongo_connection.db.refresh_tokens.update_one(
-            {"jti": jti},
-            {
-                "$set": {
-                    "used_at": datetime.now(timezone.utc),
-                    "device_id": device_info,
-                    "ip_address": ip_address,
-                }
-            },
-        )
+        with mongo_breaker.guard():
+            self.mongo_connection.db.refresh_tokens.update_one(
+                {"jti": jti},
+                {
+                    "$set": {
+                        "used_at": datetime.now(timezone.utc),
+                        "device_id": device_info,
+                        "ip_address": ip_address,
+                    }
+                },
+            )
 
         user_data = {"username": username}
         token_pair = await self.create_token_pair(
             user_data=user_data,
             device_info=device_info,
             ip_address=ip_address,
+            token_family=token_family,
         )
 
         # Revoke the old refresh token
-        self.mongo_connection.db.refresh_tokens.update_one(
-            {"jti": jti}, {"$set": {"is_revoked": True}}
+        with mongo_breaker.guard():
+            self.mongo_connection.db.refresh_tokens.update_one(
+                {"jti": jti}, {"$set": {"is_revoked": True}}
+            )
+        self.audit_log.record(
+            "token_refreshed",
+            username,
+            token_family=token_family,
+            ip_address=ip_address,
+            device_info=device_info,
         )
 
         return token_pair
 
-    async def revoke_token(self, jti: str) -> bool:
-        """Revoke a refresh token by its JTI.
+    def _is_compacted_family(self, token_family: str) -> bool:
+        """Check whether retired tokens of a family have been compacted.
+
+        A correctly signed refresh token that is missing from
+        `refresh_tokens` while its family has a compacted record is a
+        retired member of that family being replayed.
+
+        Args:
+            token_family (str): The token family identifier.
+
+        Returns:
+            bool: True if the family has a compacted record.
+        """
+        families = self.mongo_connection.get_collection(
+            settings.REFRESH_TOKEN_FAMILY_COLLECTION
+        )
+        with mongo_breaker.guard():
+            return (
+                families.find_one({"token_family": token_family}, {"_id": 1})
+                is not None
+            )
+
+    async def revoke_token(
+        self, jti: str, username: str | None = None
+    ) -> bool:
+        """Revoke a refresh token by its JTI, logging its session out.
 
         Args:
             jti (str): The JTI of the token to revoke.
+            username (str | None): The owner of the token, for the audit log.
 
         Returns:
             bool: True if the token was successfully revoked, False otherwise.
         """
-        result = self.mongo_connection.db.refresh_token.update_one(
+        result = self.mongo_connection.db.refresh_tokens.update_one(
             {"jti": jti}, {"$set": {"is_revoked": True}}
         )
+        if result.modified_count > 0:
+            self.audit_log.record("logout", username, jti=jti)
         return result.modified_count > 0
 
     async def revoke_token_family(self, token_family: str) -> int:
@@ -281,10 +490,11 @@ class TokenService:
         Returns:
             int: The number of tokens revoked.
         """
-        result = self.mongo_connection.db.refresh_tokens.update_many(
-            {"token_family": token_family, "is_revoked": False},
-            {"$set": {"is_revoked": True}},
-        )
+        with mongo_breaker.guard():
+            result = self.mongo_connection.db.refresh_tokens.update_many(
+                {"token_family": token_family, "is_revoked": False},
+                {"$set": {"is_revoked": True}},
+            )
         return result.modified_count
 
     async def revoke_all_user_tokens(self, username: str) -> int:
@@ -297,7 +507,229 @@ class TokenService:
             int: The number of tokens revoked.
         """
         result = self.mongo_connection.db.refresh_tokens.update_many(
-            {"username": username, "is_revoked": False},
+            {"username": normalize_username(username), "is_revoked": False},
             {"$set": {"is_revoked": True}},
         )
         return result.modified_count
+
+    async def list_sessions(
+        self,
+        username: str,
+        limit: int = 20,
+        after: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """List the active sessions of a user, newest first.
+
+        A session is the live refresh token of a token family. Pages are
+        fetched with keyset pagination over the `username`, `is_revoked` and
+        `_id` index, so the cost of a page does not depend on its position.
+
+        Args:
+            username (str): The user whose sessions are listed.
+            limit (int): The maximum number of sessions to return.
+            after (str | None): The cursor returned with the previous page.
+
+        Returns:
+            tuple[list[dict], str | None]: The sessions and the cursor of the
+                next page, or None if this is the last page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        query = {
+            "username": normalize_username(username),
+            "is_revoked": False,
+        }
+        if after is not None:
+            if not ObjectId.is_valid(after):
+                raise ValueError("Invalid session cursor")
+            query["_id"] = {"$lt": ObjectId(after)}
+        documents = list(
+            self.mongo_connection.db.refresh_tokens.find(
+                query, SESSION_PROJECTION
+            )
+            .sort("_id", DESCENDING)
+            .limit(limit + 1)
+        )
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            next_cursor = str(documents[-1]["_id"])
+        sessions = [
+            {
+                "session_id": document["token_family"],
+                "device_info": document.get("device_info"),
+                "ip_address": document.get("ip_address"),
+                "created_at": document["created_at"],
+                "expires_at": document["expires_at"],
+            }
+            for document in documents
+        ]
+        return sessions, next_cursor
+
+    async def revoke_session(self, username: str, session_id: str) -> bool:
+        """Revoke a single session of a user.
+
+        Args:
+            username (str): The user who owns the session.
+            session_id (str): The token family identifying the session.
+
+        Returns:
+            bool: True if the session was active and has been revoked.
+        """
+        result = self.mongo_connection.db.refresh_tokens.update_many(
+            {
+                "username": normalize_username(username),
+                "token_family": session_id,
+                "is_revoked": False,
+            },
+            {"$set": {"is_revoked": True}},
+        )
+        return result.modified_count > 0
+
+    async def revoke_other_sessions(
+        self, username: str, current_session_id: str | None
+    ) -> int:
+        """Revoke every session of a user except the current one.
+
+        Args:
+            username (str): The user whose sessions are revoked.
+            current_session_id (str | None): The token family to keep. Every
+                session is revoked when None.
+
+        Returns:
+            int: The number of tokens revoked.
+        """
+        query = {
+            "username": normalize_username(username),
+            "is_revoked": False,
+        }
+        if current_session_id is not None:
+            query["token_family"] = {"$ne": current_session_id}
+        result = self.mongo_connection.db.refresh_tokens.update_many(
+            query, {"$set": {"is_revoked": True}}
+        )
+        return result.modified_count
+
+    def _index_size(self) -> int:
+        """Return the total index size of `refresh_tokens` in bytes."""
+        stats = self.mongo_connection.db.command("collStats", "refresh_tokens")
+        return int(stats.get("totalIndexSize", 0))
+
+    async def compact_retired_tokens(
+        self,
+        batch_size: int = 500,
+        pause_seconds: float = 0.5,
+        grace_minutes: int = 5,
+        max_batches: int | None = None,
+    ) -> CompactionReport:
+        """Collapse retired refresh tokens into one record per family.
+
+        Used and revoked tokens are only kept so that replaying them is
+        detected as reuse. Each batch folds them into the family collection,
+        which only tracks how many members were retired and until when they
+        could still be presented, and then deletes them from
+        `refresh_tokens`. Tokens without a family are kept, as nothing
+        would detect their replay once deleted. Batches are walked in `_id`
+        order over the `retired_tokens` partial index and throttled by
+        `pause_seconds`.
+
+        Args:
+            batch_size (int): The number of tokens compacted per batch.
+            pause_seconds (float): The pause between two batches.
+            grace_minutes (int): Tokens created more recently than this are
+                left alone so in-flight rotations are not raced.
+            max_batches (int | None): Stop after this many batches.
+
+        Returns:
+            CompactionReport: The reclaimed documents and index sizes.
+        """
+        refresh_tokens = self.mongo_connection.db.refresh_tokens
+        families = self.mongo_connection.get_collection(
+            settings.REFRESH_TOKEN_FAMILY_COLLECTION
+        )
+        cutoff = ObjectId.from_datetime(
+            datetime.now(timezone.utc) - timedelta(minutes=grace_minutes)
+        )
+        report = CompactionReport(index_size_before=self._index_size())
+        last_id = None
+        while max_batches is None or report.batches < max_batches:
+            id_range = {"$lt": cutoff}
+            if last_id is not None:
+                id_range["$gt"] = last_id
+            batch = list(
+                refresh_tokens.find(
+                    {"is_revoked": True, "_id": id_range},
+                    {
+                        "token_family": 1,
+                        "username": 1,
+                        "expires_at": 1,
+                    },
+                )
+                .sort("_id", ASCENDING)
+                .limit(batch_size)
+            )
+            if not batch:
+                break
+            last_id = batch[-1]["_id"]
+
+            retired: dict[str, dict] = {}
+            compacted_ids = []
+            for document in batch:
+                token_family = document.get("token_family")
+                if token_family is None:
+                    # Without a family record to catch its replay, a token
+                    # issued before families existed has to stay.
+                    continue
+                compacted_ids.append(document["_id"])
+                family = retired.setdefault(
+                    token_family,
+                    {
+                        "username": document["username"],
+                        "count": 0,
+                        "expires_at": document["expires_at"],
+                    },
+                )
+                family["count"] += 1
+                family["expires_at"] = max(
+                    family["expires_at"], document["expires_at"]
+                )
+
+            # Record the families before deleting their members so reuse
+            # detection never has a gap.
+            now = datetime.now(timezone.utc)
+            operations = [
+                UpdateOne(
+                    {"token_family": token_family},
+                    {
+                        "$setOnInsert": {"username": family["username"]},
+                        "$inc": {"retired_count": family["count"]},
+                        "$max": {"expires_at": family["expires_at"]},
+                        "$set": {"compacted_at": now},
+                    },
+                    upsert=True,
+                )
+                for token_family, family in retired.items()
+            ]
+            deleted = 0
+            if operations:
+                families.bulk_write(operations, ordered=False)
+                deleted = refresh_tokens.delete_many(
+                    {"_id": {"$in": compacted_ids}}
+                ).deleted_count
+
+            report.batches += 1
+            report.family_updates += len(retired)
+            report.reclaimed_documents += deleted
+            logger.info(
+                "Compacted batch %d: %d tokens into %d families",
+                report.batches,
+                deleted,
+                len(retired),
+            )
+            if len(batch) < batch_size:
+                break
+            await asyncio.sleep(pause_seconds)
+
+        report.index_size_after = self._index_size()
+        return report
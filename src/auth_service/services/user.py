@@ -1,50 +1,133 @@
 """Service for handling user endpoint related operations."""
 
-import re
+import hashlib
 import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
 
-from commons.database import MongoConnect
+import orjson
 from fastapi import status
 from fastapi.exceptions import HTTPException
 
+from auth_service.core.cache import TTLCache
 from auth_service.core.config import settings
-from auth_service.db.models import BasicUserInfo
+from auth_service.core.singleflight import SingleFlight
+from auth_service.db.connection import get_mongo_connection
+from auth_service.db.models import to_basic_user_info
+from auth_service.db.normalization import normalize_username
+from auth_service.db.queries import UserQueries
+from auth_service.db.repository import Connection
 
 logger = logging.getLogger(__file__)
 
 
+@dataclass(frozen=True)
+class UserProfile:
+    """Dataclass for a serialized profile and its cache validators."""
+
+    body: bytes
+    etag: str
+    last_modified: datetime | None = None
+
+
 class UserService:
     """User service class."""
 
-    def __init__(self):
-        """Initialize the UserService class."""
+    def __init__(self, mongo_connection: Connection | None = None):
+        """Initialize the UserService class.
+
+        Args:
+            mongo_connection (Connection | None): The connection to use,
+                e.g. a `MemoryConnection`. Defaults to the shared one.
+        """
         logging.basicConfig(
             level=logging.INFO,
             format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         )
-        self.mongo_connection = MongoConnect(
-            settings.MONGO_URI, settings.DB_NAME
+        self.mongo_connection = mongo_connection or get_mongo_connection()
+        self.user_queries = UserQueries(self.mongo_connection)
+        self.profiles = TTLCache(
+            maxsize=settings.PROFILE_CACHE_SIZE,
+            ttl=settings.PROFILE_CACHE_TTL_SECONDS,
         )
+        # Concurrent profile fetches of the same user share one read on
+        # this connection.
+        self.profile_flight = SingleFlight("user_profile")
 
-    def __del__(self):
-        """Cleanup the connections."""
-        self.mongo_connection.close()
-
-    def get_user(self, username: str) -> BasicUserInfo:
+    def get_user(self, username: str) -> dict:
         """Get basic information for a given username.
 
         Args:
             username (str): Username for basic information
 
         Returns:
-            BasicUserInfo: Basic information for the username, if available
+            dict: Basic information for the username, if available
         """
-        user_details = self.mongo_connection.get_collection(
-            settings.USER_COLLECTION
-        ).find_one({"username": re.escape(username)})
+        user_details = self.user_queries.find_basic_info(username)
         if not user_details:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User does not exists",
             )
-        return BasicUserInfo(**user_details)
+        return to_basic_user_info(user_details)
+
+    async def get_profile(self, username: str) -> UserProfile:
+        """Get the serialized basic information of a user and its version.
+
+        The ETag is derived from the serialized body and the `updated_at`
+        of the user, and the result is cached for
+        `PROFILE_CACHE_TTL_SECONDS`, so repeated polls skip both the
+        database read and the serialization. Concurrent misses for the same
+        user share one read.
+
+        Args:
+            username (str): Username for basic information
+
+        Returns:
+            UserProfile: The JSON body, ETag and last modification time.
+
+        Raises:
+            HTTPException: If the user does not exist.
+        """
+        key = normalize_username(username)
+        profile = self.profiles.get(key)
+        if profile is not None:
+            return profile
+
+        user_details = await self.profile_flight.do(
+            key, self.user_queries.find_profile, username
+        )
+        if not user_details:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User does not exists",
+            )
+        body = orjson.dumps(to_basic_user_info(user_details))
+        version = hashlib.blake2b(body, digest_size=8)
+        last_modified = user_details.get("updated_at")
+        if isinstance(last_modified, datetime):
+            if last_modified.tzinfo is None:
+                last_modified = last_modified.replace(tzinfo=timezone.utc)
+            # HTTP dates have a resolution of one second.
+            last_modified = last_modified.replace(microsecond=0)
+            version.update(last_modified.isoformat().encode())
+        else:
+            last_modified = None
+        profile = UserProfile(
+            body=body,
+            etag=f'"{version.hexdigest()}"',
+            last_modified=last_modified,
+        )
+        self.profiles.set(key, profile)
+        return profile
+
+    def invalidate_profile(self, username: str):
+        """Drop the cached profile of a user after it changed.
+
+        Only this worker's cache is cleared; other workers serve their copy
+        until `PROFILE_CACHE_TTL_SECONDS` expires.
+
+        Args:
+            username (str): The user whose profile changed.
+        """
+        self.profiles.pop(normalize_username(username))
@@ -0,0 +1,110 @@
+"""Shared fixtures: the application on the in-memory MongoDB backend.
+
+The environment is configured before `auth_service` is imported, so every
+test runs offline against `auth_service.db.memory.MemoryConnection` with
+a throwaway RSA key pair.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import rsa
+
+
+def _write_key_pair(directory: Path):
+    public_key, private_key = rsa.newkeys(2048)
+    (directory / "private.pem").write_bytes(private_key.save_pkcs1())
+    (directory / "public.pem").write_bytes(public_key.save_pkcs1())
+
+
+KEYS_DIR = Path(tempfile.mkdtemp(prefix="auth-service-keys-"))
+_write_key_pair(KEYS_DIR)
+
+os.environ.update(
+    {
+        "MONGO_BACKEND": "memory",
+        "JWT_KEYS_DIR": str(KEYS_DIR),
+        "AUDIT_EXPORT_TOKEN": "audit-secret",
+        "INTROSPECTION_TOKEN": "introspection-secret",
+        "LOGIN_LOCKOUT_THRESHOLD": "3",
+        "WARMUP_ENABLED": "false",
+    }
+)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from auth_service.api import dependencies  # noqa: E402
+from auth_service.core.circuit_breaker import CircuitBreaker  # noqa: E402
+from auth_service.db import queries  # noqa: E402
+from auth_service.db.breaker import mongo_breaker  # noqa: E402
+from auth_service.db.connection import get_mongo_connection  # noqa: E402
+from auth_service.main import api  # noqa: E402
+from auth_service.services import lockout, token  # noqa: E402
+from auth_service.services.auth import pwd_context  # noqa: E402
+
+# The cheapest bcrypt cost keeps registrations and logins fast.
+pwd_context.update(bcrypt__rounds=4)
+
+PASSWORD = "correct-horse-battery-staple"
+
+
+@pytest.fixture
+def client():
+    """A client of the application with an empty in-memory database."""
+    get_mongo_connection.cache_clear()
+    for getter in (
+        dependencies.get_auth_service,
+        dependencies.get_token_service,
+        dependencies.get_user_service,
+    ):
+        getter.cache_clear()
+    with TestClient(api) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    """A fresh MongoDB breaker, opening after two failed calls in a row."""
+    fresh_breaker = CircuitBreaker(
+        "mongo",
+        failure_exceptions=mongo_breaker.failure_exceptions,
+        failure_rate=1,
+        window_size=2,
+        minimum_calls=2,
+        open_seconds=60,
+    )
+    for module in (queries, lockout, token):
+        monkeypatch.setattr(module, "mongo_breaker", fresh_breaker)
+    return fresh_breaker
+
+
+@pytest.fixture
+def user(client):
+    """Register a user and return its username."""
+    response = client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "Alice",
+            "email": "alice@example.com",
+            "password": PASSWORD,
+        },
+    )
+    assert response.status_code == 201, response.text
+    return "Alice"
+
+
+def login(client, username: str, password: str = PASSWORD):
+    """Log in and return the response; the client keeps the cookie."""
+    return client.post(
+        "/api/v1/auth/login",
+        json={"username": username, "password": password},
+    )
+
+
+def refresh(client, refresh_token: str):
+    """Present a refresh token as the cookie of the refresh route."""
+    client.cookies.clear()
+    client.cookies.set("refresh_token", refresh_token)
+    return client.get("/api/v1/auth/refresh")
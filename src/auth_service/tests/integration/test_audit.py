@@ -0,0 +1,59 @@
+"""Audit event export."""
+
+import orjson
+
+from auth_service.services import audit
+from auth_service.services.audit import get_audit_log
+
+from conftest import login
+
+AUTHORIZATION = {"Authorization": "Bearer audit-secret"}
+
+
+def flush_audit_log():
+    """Write every buffered event."""
+    get_audit_log().stop()
+    get_audit_log().start()
+
+
+def export(client, **params):
+    """Return the exported events."""
+    response = client.get(
+        "/api/v1/audit/events", params=params, headers=AUTHORIZATION
+    )
+    assert response.status_code == 200
+    return [orjson.loads(line) for line in response.text.splitlines()]
+
+
+def test_export_pages_through_events(client, user, monkeypatch):
+    # Also export the events of the current second.
+    monkeypatch.setattr(audit, "EXPORT_SETTLE_SECONDS", -1)
+    login(client, user, "wrong-password")
+    login(client, user)
+    flush_audit_log()
+
+    events = export(client)
+
+    assert [event["event"] for event in events] == [
+        "login_failed",
+        "login_succeeded",
+    ]
+    assert events[0]["reason"] == "invalid_password"
+    assert export(client, after=events[0]["id"]) == events[1:]
+    assert export(client, limit=1) == events[:1]
+
+
+def test_export_requires_the_token(client):
+    response = client.get(
+        "/api/v1/audit/events", headers={"Authorization": "Bearer wrong"}
+    )
+
+    assert response.status_code == 403
+    assert (
+        client.get(
+            "/api/v1/audit/events",
+            params={"after": "zz"},
+            headers=AUTHORIZATION,
+        ).status_code
+        == 400
+    )
@@ -0,0 +1,45 @@
+"""Backfill of the normalized identifiers of existing users."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from auth_service.api.dependencies import get_token_service
+from auth_service.cli.backfill_normalized_users import (
+    backfill,
+    backfill_refresh_tokens,
+)
+from auth_service.core.config import settings
+from auth_service.db.connection import get_mongo_connection
+
+
+def test_backfill_makes_old_sessions_visible(client):
+    db = get_mongo_connection().db
+    db.get_collection(settings.USER_COLLECTION).insert_one(
+        {"username": "Bob", "email": "Bob@Example.com", "password": "x"}
+    )
+    now = datetime.now(timezone.utc)
+    db.refresh_tokens.insert_many(
+        [
+            {
+                "jti": f"jti-{number}",
+                "username": "Bob",
+                "token_family": f"family-{number}",
+                "created_at": now,
+                "expires_at": now + timedelta(days=1),
+                "is_revoked": False,
+                "used_at": None,
+            }
+            for number in range(2)
+        ]
+    )
+    token_service = get_token_service()
+    sessions, _ = asyncio.run(token_service.list_sessions("Bob"))
+    assert sessions == []
+
+    assert backfill(batch_size=10) == 1
+    assert backfill_refresh_tokens(batch_size=1) == 2
+    assert backfill_refresh_tokens(batch_size=1) == 0
+
+    sessions, _ = asyncio.run(token_service.list_sessions("Bob"))
+    assert len(sessions) == 2
+    assert asyncio.run(token_service.revoke_all_user_tokens("BOB")) == 2
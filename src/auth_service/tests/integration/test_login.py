@@ -0,0 +1,43 @@
+"""Login lockout and the per-user session cap."""
+
+from auth_service.core.config import settings
+
+from conftest import login, refresh
+
+
+def test_lockout_after_repeated_failures(client, user):
+    for _ in range(settings.LOGIN_LOCKOUT_THRESHOLD):
+        assert login(client, user, "wrong-password").status_code == 401
+
+    response = login(client, user)
+
+    assert response.status_code == 429
+    retry_after = int(response.headers["Retry-After"])
+    assert 0 < retry_after <= settings.LOGIN_LOCKOUT_BASE_SECONDS
+
+
+def test_success_resets_the_failure_count(client, user):
+    for _ in range(settings.LOGIN_LOCKOUT_THRESHOLD - 1):
+        assert login(client, user, "wrong-password").status_code == 401
+    assert login(client, user).status_code == 200
+
+    for _ in range(settings.LOGIN_LOCKOUT_THRESHOLD - 1):
+        assert login(client, user, "wrong-password").status_code == 401
+    assert login(client, user).status_code == 200
+
+
+def test_session_cap_evicts_the_oldest_session(client, user, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_SESSIONS_PER_USER", 2)
+    responses = [login(client, user) for _ in range(3)]
+    oldest = responses[0].cookies["refresh_token"]
+    newest = responses[-1]
+
+    sessions = client.get(
+        "/api/v1/user/sessions",
+        headers={"Authorization": f"Bearer {newest.json()['access_token']}"},
+    )
+
+    assert sessions.status_code == 200
+    assert len(sessions.json()["sessions"]) == 2
+    assert refresh(client, oldest).status_code == 401
+    assert refresh(client, newest.cookies["refresh_token"]).status_code == 200
@@ -0,0 +1,109 @@
+"""Refresh token rotation, reuse detection and compaction."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from pymongo.errors import ServerSelectionTimeoutError
+
+from auth_service.api.dependencies import get_token_service
+from auth_service.core.config import settings
+from auth_service.db.connection import get_mongo_connection
+from auth_service.db.memory import MemoryCollection
+
+from conftest import login, refresh
+
+
+def test_refresh_rotates_the_token(client, user):
+    first = login(client, user).cookies["refresh_token"]
+
+    response = refresh(client, first)
+
+    assert response.status_code == 200
+    second = response.cookies["refresh_token"]
+    assert second != first
+    assert refresh(client, second).status_code == 200
+
+
+def test_replayed_token_revokes_the_family(client, user):
+    first = login(client, user).cookies["refresh_token"]
+    second = refresh(client, first).cookies["refresh_token"]
+
+    replay = refresh(client, first)
+
+    assert replay.status_code == 401
+    assert "reuse detected" in replay.json()["detail"]
+    assert refresh(client, second).status_code == 401
+
+
+def test_compaction_keeps_reuse_detection(client, user):
+    first = login(client, user).cookies["refresh_token"]
+    second = refresh(client, first).cookies["refresh_token"]
+
+    # A negative grace period also covers the tokens of the current second.
+    report = asyncio.run(
+        get_token_service().compact_retired_tokens(
+            pause_seconds=0, grace_minutes=-1
+        )
+    )
+
+    db = get_mongo_connection().db
+    assert report.reclaimed_documents == 1
+    assert report.family_updates == 1
+    assert db.refresh_tokens.count_documents({}) == 1
+    family = db.get_collection(
+        settings.REFRESH_TOKEN_FAMILY_COLLECTION
+    ).find_one({})
+    assert family["retired_count"] == 1
+
+    replay = refresh(client, first)
+
+    assert replay.status_code == 401
+    assert "reuse detected" in replay.json()["detail"]
+    assert refresh(client, second).status_code == 401
+
+
+def test_compaction_keeps_tokens_without_a_family(client, user):
+    db = get_mongo_connection().db
+    now = datetime.now(timezone.utc)
+    db.refresh_tokens.insert_one(
+        {
+            "jti": "legacy",
+            "username": "alice",
+            "token_family": None,
+            "created_at": now - timedelta(days=1),
+            "expires_at": now + timedelta(days=1),
+            "is_revoked": True,
+            "used_at": now,
+        }
+    )
+
+    report = asyncio.run(
+        get_token_service().compact_retired_tokens(
+            pause_seconds=0, grace_minutes=-1
+        )
+    )
+
+    assert report.reclaimed_documents == 0
+    assert report.family_updates == 0
+    assert db.refresh_tokens.find_one({"jti": "legacy"}) is not None
+    families = db.get_collection(settings.REFRESH_TOKEN_FAMILY_COLLECTION)
+    assert families.count_documents({}) == 0
+
+
+def test_unknown_token_is_rejected(client):
+    assert refresh(client, "not-a-token").status_code == 401
+
+
+def test_refresh_writes_go_through_the_breaker(
+    client, user, breaker, monkeypatch
+):
+    first = login(client, user).cookies["refresh_token"]
+
+    def unavailable(*args, **kwargs):
+        raise ServerSelectionTimeoutError("MongoDB unavailable")
+
+    monkeypatch.setattr(MemoryCollection, "update_one", unavailable)
+    response = refresh(client, first)
+
+    assert response.status_code == 503
+    assert breaker.calls["failure"] == 1
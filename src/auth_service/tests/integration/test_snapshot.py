@@ -0,0 +1,41 @@
+"""Restoring snapshots into a database that already holds documents."""
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from auth_service.cli.snapshot import export_snapshot, import_snapshot
+from auth_service.core.config import settings
+from auth_service.db.connection import get_mongo_connection
+
+
+def test_import_skips_existing_documents(client, user, tmp_path):
+    export_snapshot(tmp_path, [settings.USER_COLLECTION], 2, 10)
+
+    report = import_snapshot(
+        tmp_path, [settings.USER_COLLECTION], 2, 10, False
+    )
+
+    assert report == {settings.USER_COLLECTION: (0, 1)}
+
+
+def test_import_fails_on_other_unique_conflicts(client, user, tmp_path):
+    export_snapshot(tmp_path, [settings.USER_COLLECTION], 2, 10)
+    users = get_mongo_connection().get_collection(settings.USER_COLLECTION)
+    # Same username, new `_id`: the restored user would be lost.
+    users.delete_many({})
+    response = client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "alice",
+            "email": "alice@example.org",
+            "password": "another-horse-battery-staple",
+        },
+    )
+    assert response.status_code == 201, response.text
+
+    with pytest.raises(BulkWriteError) as error:
+        import_snapshot(tmp_path, [settings.USER_COLLECTION], 2, 10, False)
+
+    assert error.value.details["writeErrors"][0]["keyPattern"] == {
+        "username_normalized": 1
+    }
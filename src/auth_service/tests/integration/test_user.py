@@ -0,0 +1,55 @@
+"""Conditional `/user/me` requests."""
+
+from auth_service.core.config import settings
+from auth_service.db.connection import get_mongo_connection
+
+from conftest import login
+
+
+def test_me_answers_304_for_a_matching_etag(client, user):
+    access_token = login(client, user).json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = client.get("/api/v1/user/me", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["username"] == user
+    etag = response.headers["ETag"]
+
+    cached = client.get(
+        "/api/v1/user/me", headers={**headers, "If-None-Match": etag}
+    )
+
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    other = client.get(
+        "/api/v1/user/me", headers={**headers, "If-None-Match": '"other"'}
+    )
+
+    assert other.status_code == 200
+
+
+def test_verifying_the_email_refreshes_me(client, user):
+    access_token = login(client, user).json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    before = client.get("/api/v1/user/me", headers=headers)
+    assert before.json()["verified"] is False
+    activation_key = (
+        get_mongo_connection()
+        .get_collection(settings.ACTIVATION_KEY_COLLECTION)
+        .find_one({})
+    )
+
+    verify = client.get(
+        "/api/v1/auth/verify", params={"token": activation_key["token"]}
+    )
+
+    assert verify.status_code == 200
+    after = client.get(
+        "/api/v1/user/me",
+        headers={**headers, "If-None-Match": before.headers["ETag"]},
+    )
+    assert after.status_code == 200
+    assert after.json()["verified"] is True
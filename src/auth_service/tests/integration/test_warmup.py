@@ -0,0 +1,68 @@
+"""Readiness after a failed warmup."""
+
+import threading
+import time
+
+from fastapi.testclient import TestClient
+from pymongo.errors import ServerSelectionTimeoutError
+
+from auth_service import warmup
+from auth_service.core.config import settings
+from auth_service.main import api
+
+
+def test_readiness_recovers_once_a_failed_step_succeeds(monkeypatch):
+    mongo_up = threading.Event()
+    open_mongo_pool = warmup.open_mongo_pool
+
+    def flaky_open_mongo_pool():
+        if not mongo_up.is_set():
+            raise ConnectionError("MongoDB unavailable")
+        open_mongo_pool()
+
+    monkeypatch.setattr(warmup, "open_mongo_pool", flaky_open_mongo_pool)
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", True)
+    monkeypatch.setattr(settings, "WARMUP_RETRY_INITIAL_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "WARMUP_RETRY_MAX_SECONDS", 0.05)
+
+    with TestClient(api) as client:
+        response = client.get("/readyz")
+        assert response.status_code == 503
+        assert response.json()["warmup"]["steps"]["mongo"]["ok"] is False
+
+        mongo_up.set()
+        deadline = time.monotonic() + 5
+        while (response := client.get("/readyz")).status_code != 200:
+            assert time.monotonic() < deadline, response.json()
+            time.sleep(0.02)
+
+    steps = response.json()["warmup"]["steps"]
+    assert all(step["ok"] for step in steps.values())
+
+
+def test_worker_starts_while_indexes_cannot_be_created(monkeypatch):
+    mongo_up = threading.Event()
+    ensure_indexes = warmup.ensure_indexes
+
+    def flaky_ensure_indexes(mongo_connection):
+        if not mongo_up.is_set():
+            raise ServerSelectionTimeoutError("MongoDB unavailable")
+        ensure_indexes(mongo_connection)
+
+    monkeypatch.setattr(warmup, "ensure_indexes", flaky_ensure_indexes)
+    monkeypatch.setattr(settings, "WARMUP_RETRY_INITIAL_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "WARMUP_RETRY_MAX_SECONDS", 0.05)
+
+    with TestClient(api) as client:
+        response = client.get("/readyz")
+        assert response.status_code == 503
+        assert response.json()["warmup"]["steps"]["indexes"]["ok"] is False
+        assert client.get("/healthz").status_code == 200
+
+        mongo_up.set()
+        deadline = time.monotonic() + 5
+        while (response := client.get("/readyz")).status_code != 200:
+            assert time.monotonic() < deadline, response.json()
+            time.sleep(0.02)
+
+    assert list(response.json()["warmup"]["steps"]) == ["indexes"]
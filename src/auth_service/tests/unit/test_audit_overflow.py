@@ -0,0 +1,62 @@
+"""Overflow policies and metrics of the audit log buffer."""
+
+import asyncio
+import time
+
+from auth_service.core import metrics
+from auth_service.db.memory import MemoryConnection
+from auth_service.services.audit import (
+    AuditLog,
+    close_audit_log,
+    get_audit_log,
+)
+
+
+def full_audit_log(block_timeout: float) -> AuditLog:
+    """Return a "block" audit log whose buffer is full and never flushed."""
+    audit_log = AuditLog(
+        MemoryConnection("audit"),
+        buffer_size=1,
+        overflow_policy="block",
+        block_timeout=block_timeout,
+    )
+    assert audit_log.record("login_succeeded", "alice")
+    return audit_log
+
+
+def test_block_waits_for_room_off_the_event_loop():
+    audit_log = full_audit_log(block_timeout=0.2)
+
+    start = time.perf_counter()
+    assert not audit_log.record("login_succeeded", "bob")
+
+    assert time.perf_counter() - start >= 0.2
+    assert audit_log.dropped == 1
+
+
+def test_block_drops_on_the_event_loop():
+    audit_log = full_audit_log(block_timeout=5)
+
+    async def record_on_the_loop():
+        return audit_log.record("refresh_succeeded", "bob")
+
+    start = time.perf_counter()
+    assert not asyncio.run(record_on_the_loop())
+
+    assert time.perf_counter() - start < 1
+    assert audit_log.dropped == 1
+
+
+def test_only_the_current_audit_log_reports_metrics():
+    get_audit_log().record("login_succeeded", "alice")
+    close_audit_log()
+    get_audit_log()
+
+    recorded = [
+        line
+        for line in metrics.render().splitlines()
+        if line.startswith('auth_audit_events_total{outcome="recorded"}')
+    ]
+
+    assert recorded == ['auth_audit_events_total{outcome="recorded"} 0']
+    close_audit_log()
@@ -0,0 +1,79 @@
+"""Building and searching the breached password digest file."""
+
+import hashlib
+
+import pytest
+
+from auth_service.cli.breached_passwords import build
+from auth_service.core.breached_passwords import (
+    RECORD_SIZE,
+    BreachedPasswordIndex,
+)
+
+PASSWORDS = [f"password-{number}" for number in range(6)]
+
+
+def sha1(password: str) -> str:
+    return hashlib.sha1(password.encode()).hexdigest().upper()
+
+
+def write_dump(path, hashes: list[str]):
+    path.write_text("".join(f"{digest}:1\n" for digest in hashes))
+
+
+def read_records(path) -> list[bytes]:
+    data = path.read_bytes()
+    return [
+        data[start : start + RECORD_SIZE]  # noqa: E203
+        for start in range(0, len(data), RECORD_SIZE)
+    ]
+
+
+@pytest.mark.parametrize(
+    "order",
+    [
+        pytest.param([0, 1, 2, 3, 4, 5], id="sorted"),
+        pytest.param([3, 4, 5, 0, 1, 2], id="chunks-swapped"),
+        pytest.param([5, 4, 3, 2, 1, 0], id="reversed"),
+    ],
+)
+def test_build_sorts_across_chunks(tmp_path, order):
+    hashes = sorted(sha1(password) for password in PASSWORDS)
+    write_dump(tmp_path / "dump.txt", [hashes[index] for index in order])
+
+    written = build(
+        str(tmp_path / "dump.txt"), str(tmp_path / "digests.bin"), 1, 3
+    )
+
+    records = read_records(tmp_path / "digests.bin")
+    assert written == 6
+    assert records == sorted(records)
+    index = BreachedPasswordIndex(str(tmp_path / "digests.bin"))
+    assert all(index.is_breached(password) for password in PASSWORDS)
+    assert not index.is_breached("not-in-the-dump")
+
+
+def test_build_drops_duplicates_between_chunks(tmp_path):
+    hashes = sorted(sha1(password) for password in PASSWORDS[:4])
+    write_dump(tmp_path / "dump.txt", hashes[:3] + hashes[2:])
+
+    written = build(
+        str(tmp_path / "dump.txt"), str(tmp_path / "digests.bin"), 1, 3
+    )
+
+    assert written == 4
+    assert len(read_records(tmp_path / "digests.bin")) == 4
+
+
+def test_empty_digest_file_matches_nothing(tmp_path):
+    write_dump(tmp_path / "dump.txt", [])
+    assert (
+        build(str(tmp_path / "dump.txt"), str(tmp_path / "digests.bin"), 1, 3)
+        == 0
+    )
+
+    index = BreachedPasswordIndex(str(tmp_path / "digests.bin"))
+
+    assert index.count == 0
+    assert not index.is_breached(PASSWORDS[0])
+    index.close()
@@ -0,0 +1,86 @@
+"""Tripping and recovery of the circuit breaker."""
+
+import time
+
+import pytest
+
+from auth_service.core.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+def call(breaker: CircuitBreaker, seconds: float = 0, fail: bool = False):
+    with breaker.guard():
+        time.sleep(seconds)
+        if fail:
+            raise ConnectionError("unavailable")
+
+
+def test_opens_on_the_failure_rate():
+    breaker = CircuitBreaker(
+        "test", failure_exceptions=(ConnectionError,), minimum_calls=4
+    )
+    call(breaker)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            call(breaker, fail=True)
+    assert breaker.state == CLOSED
+
+    call(breaker)
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as error:
+        call(breaker)
+    assert error.value.retry_after >= 1
+    assert breaker.calls["rejected"] == 1
+
+
+def test_other_exceptions_count_as_successes():
+    breaker = CircuitBreaker(
+        "test", failure_exceptions=(ConnectionError,), minimum_calls=2
+    )
+    for _ in range(2):
+        with pytest.raises(KeyError):
+            with breaker.guard():
+                raise KeyError("duplicate")
+
+    assert breaker.state == CLOSED
+
+
+def test_opens_on_the_slow_call_rate():
+    breaker = CircuitBreaker(
+        "test",
+        slow_call_seconds=0.01,
+        slow_call_rate=0.5,
+        minimum_calls=2,
+    )
+    call(breaker)
+    call(breaker, seconds=0.02)
+
+    assert breaker.state == OPEN
+    assert breaker.calls["slow"] == 1
+
+
+def test_closes_after_successful_probes():
+    breaker = CircuitBreaker(
+        "test",
+        failure_exceptions=(ConnectionError,),
+        minimum_calls=1,
+        open_seconds=0.01,
+        half_open_calls=2,
+    )
+    with pytest.raises(ConnectionError):
+        call(breaker, fail=True)
+    assert breaker.state == OPEN
+
+    time.sleep(0.02)
+    assert breaker.state == HALF_OPEN
+    call(breaker)
+    assert breaker.state == HALF_OPEN
+    call(breaker)
+
+    assert breaker.state == CLOSED
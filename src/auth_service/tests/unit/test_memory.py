@@ -0,0 +1,121 @@
+"""MongoDB semantics of the in-memory backend the services rely on."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from auth_service.db.memory import MemoryConnection
+
+
+@pytest.fixture
+def db():
+    return MemoryConnection("memory").db
+
+
+def test_unique_index_rejects_duplicates(db):
+    db.users.create_index([("username", ASCENDING)], unique=True)
+    db.users.insert_one({"username": "alice"})
+    bob = db.users.insert_one({"username": "bob"}).inserted_id
+
+    with pytest.raises(DuplicateKeyError) as error:
+        db.users.insert_one({"username": "alice"})
+    assert error.value.code == 11000
+    assert error.value.details["keyPattern"] == {"username": 1}
+    with pytest.raises(DuplicateKeyError):
+        db.users.update_one({"_id": bob}, {"$set": {"username": "alice"}})
+
+    db.users.delete_one({"username": "alice"})
+    db.users.update_one({"_id": bob}, {"$set": {"username": "alice"}})
+    assert db.users.count_documents({"username": "alice"}) == 1
+
+
+def test_unique_index_cannot_be_built_over_duplicates(db):
+    db.users.insert_many([{"username": "alice"}, {"username": "alice"}])
+
+    with pytest.raises(DuplicateKeyError):
+        db.users.create_index([("username", ASCENDING)], unique=True)
+
+
+def test_partial_unique_index_only_covers_matching_documents(db):
+    db.users.create_index(
+        [("email", ASCENDING)],
+        unique=True,
+        partialFilterExpression={"email": {"$exists": True}},
+    )
+    db.users.insert_many([{"username": "alice"}, {"username": "bob"}])
+    db.users.insert_one({"email": "carol@example.com"})
+
+    with pytest.raises(DuplicateKeyError):
+        db.users.insert_one({"email": "carol@example.com"})
+
+
+def test_bulk_write_errors_report_the_violated_index(db):
+    db.users.create_index([("username", ASCENDING)], unique=True)
+    db.users.insert_one({"_id": 1, "username": "alice"})
+
+    with pytest.raises(BulkWriteError) as error:
+        db.users.insert_many(
+            [
+                {"_id": 1, "username": "bob"},
+                {"_id": 2, "username": "alice"},
+                {"_id": 3, "username": "carol"},
+            ],
+            ordered=False,
+        )
+
+    write_errors = error.value.details["writeErrors"]
+    assert [e["keyPattern"] for e in write_errors] == [
+        {"_id": 1},
+        {"username": 1},
+    ]
+    assert db.users.count_documents({}) == 2
+
+
+def test_ttl_index_expires_documents(db):
+    now = datetime.now(timezone.utc)
+    db.keys.create_index("expires_at", expireAfterSeconds=0)
+    db.keys.insert_many(
+        [
+            {"_id": "expired", "expires_at": now - timedelta(seconds=1)},
+            {"_id": "live", "expires_at": now + timedelta(hours=1)},
+            {"_id": "no-date"},
+        ]
+    )
+
+    assert sorted(key["_id"] for key in db.keys.find()) == [
+        "live",
+        "no-date",
+    ]
+
+
+def test_ttl_index_follows_updates(db):
+    now = datetime.now(timezone.utc)
+    db.keys.create_index("expires_at", expireAfterSeconds=0)
+    db.keys.insert_one({"_id": "key", "expires_at": now + timedelta(hours=1)})
+
+    db.keys.update_one(
+        {"_id": "key"},
+        {"$set": {"expires_at": now - timedelta(seconds=1)}},
+    )
+
+    assert db.keys.find_one({"_id": "key"}) is None
+
+
+def test_capped_collection_discards_the_oldest_documents(db):
+    db.create_collection("events", capped=True, size=1 << 20, max=2)
+    for number in range(4):
+        db.events.insert_one({"number": number})
+
+    assert [event["number"] for event in db.events.find()] == [2, 3]
+
+
+def test_capped_collection_is_bounded_by_size(db):
+    db.create_collection("events", capped=True, size=200)
+    for number in range(10):
+        db.events.insert_one({"number": number, "padding": "x" * 40})
+
+    numbers = [event["number"] for event in db.events.find()]
+    assert numbers == list(range(10 - len(numbers), 10))
+    assert db.command("collStats", "events")["size"] <= 200
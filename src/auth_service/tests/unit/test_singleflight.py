@@ -0,0 +1,32 @@
+"""Metrics of single-flight groups."""
+
+import asyncio
+import gc
+
+from auth_service.core import metrics
+from auth_service.core.singleflight import SingleFlight
+
+
+def samples(name: str) -> list[str]:
+    return [
+        line
+        for line in metrics.render().splitlines()
+        if line.startswith(f'{name}{{flight="test_flight"}}')
+    ]
+
+
+def test_flights_with_one_name_report_one_series():
+    flights = [SingleFlight("test_flight") for _ in range(3)]
+    for flight in flights:
+        asyncio.run(flight.do("key", int))
+
+    assert samples("auth_singleflight_calls_total") == [
+        'auth_singleflight_calls_total{flight="test_flight"} 3'
+    ]
+
+    del flights, flight
+    gc.collect()
+
+    assert samples("auth_singleflight_calls_total") == [
+        'auth_singleflight_calls_total{flight="test_flight"} 0'
+    ]
@@ -0,0 +1,180 @@
+"""Adaptive concurrency limiting and load shedding."""
+
+import time
+
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+
+from auth_service.core import metrics
+from auth_service.core.config import settings
+
+# Route class of each path; anything else is "default".
+ROUTE_CLASSES = {
+    "/api/v1/auth/login": "login",
+    "/api/v1/auth/register": "register",
+    "/api/v1/token/validate": "validate",
+    "/api/v1/token/introspect": "validate",
+}
+
+# Operational endpoints that must answer even when the worker sheds load.
+UNLIMITED_PATHS = {"/metrics", "/workers", "/healthz", "/readyz"}
+
+
+class AIMDLimit:
+    """Concurrency limit with additive increase, multiplicative decrease.
+
+    Every request finishing within the latency target while the limit is
+    being used (at least half of it in flight) raises the limit by one; a
+    slow or failed request multiplies it by `backoff_ratio`.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        latency_target: float,
+        min_limit: int = 1,
+        backoff_ratio: float = 0.9,
+    ):
+        """Initialize the AIMDLimit class.
+
+        Args:
+            max_limit (int): The highest concurrency allowed.
+            latency_target (float): Seconds a healthy request may take.
+            min_limit (int): The lowest concurrency allowed.
+            backoff_ratio (float): Factor applied to the limit on overload.
+        """
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.latency_target = latency_target
+        self.backoff_ratio = backoff_ratio
+        self.limit = float(max(min_limit, max_limit // 4))
+        self.in_flight = 0
+        self.handled = 0
+        self.shed = 0
+
+    def try_acquire(self) -> bool:
+        """Admit a request if the limit allows it.
+
+        Returns:
+            bool: True if the request was admitted.
+        """
+        if self.in_flight >= int(self.limit):
+            self.shed += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: float, dropped: bool):
+        """Record an admitted request as finished and adjust the limit.
+
+        Args:
+            latency (float): The request duration in seconds.
+            dropped (bool): Whether the request failed with a server error.
+        """
+        self.in_flight -= 1
+        self.handled += 1
+        if dropped or latency > self.latency_target:
+            self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+        elif (self.in_flight + 1) * 2 >= self.limit:
+            self.limit = min(self.max_limit, self.limit + 1)
+
+
+class ConcurrencyLimitMiddleware:
+    """ASGI middleware shedding requests over their route class limit.
+
+    Logins, registrations, token validations and everything else are limited
+    independently, so saturated bcrypt-bound logins cannot starve
+    validation. Rejected requests get 503 with a Retry-After header.
+    """
+
+    def __init__(
+        self, app, limits: dict[str, tuple[int, float]] | None = None
+    ):
+        """Initialize the ConcurrencyLimitMiddleware class.
+
+        Args:
+            app (ASGIApp): The application to wrap.
+            limits (dict[str, tuple[int, float]] | None): Maximum limit and
+                latency target in milliseconds per route class. Defaults to
+                `settings.CONCURRENCY_LIMITS`.
+        """
+        self.app = app
+        self.limits = {
+            route_class: AIMDLimit(max_limit, latency_target_ms / 1000)
+            for route_class, (max_limit, latency_target_ms) in (
+                limits or settings.CONCURRENCY_LIMITS
+            ).items()
+        }
+        metrics.register(self.collect)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in UNLIMITED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        limit = self.limits[ROUTE_CLASSES.get(scope["path"], "default")]
+        if not limit.try_acquire():
+            response = ORJSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": "Server is overloaded, retry later"},
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        start = time.monotonic()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            limit.release(
+                time.monotonic() - start,
+                dropped=status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def collect(self) -> list[metrics.Metric]:
+        """Return the limit, in-flight and shed counters as metrics."""
+        return [
+            metrics.Metric(
+                "auth_concurrency_limit",
+                "gauge",
+                "Current adaptive concurrency limit per route class.",
+                [
+                    ({"route_class": name}, int(limit.limit))
+                    for name, limit in self.limits.items()
+                ],
+            ),
+            metrics.Metric(
+                "auth_concurrency_in_flight",
+                "gauge",
+                "Requests in flight per route class.",
+                [
+                    ({"route_class": name}, limit.in_flight)
+                    for name, limit in self.limits.items()
+                ],
+            ),
+            metrics.Metric(
+                "auth_concurrency_handled_total",
+                "counter",
+                "Requests admitted and completed per route class.",
+                [
+                    ({"route_class": name}, limit.handled)
+                    for name, limit in self.limits.items()
+                ],
+            ),
+            metrics.Metric(
+                "auth_concurrency_shed_total",
+                "counter",
+                "Requests rejected with 503 per route class.",
+                [
+                    ({"route_class": name}, limit.shed)
+                    for name, limit in self.limits.items()
+                ],
+            ),
+        ]
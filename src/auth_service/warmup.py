@@ -0,0 +1,232 @@
+"""Warmup run by every worker before it accepts requests.
+
+A fresh worker pays for its MongoDB connections, the first use of the
+signing and verification keys, the bcrypt backend and empty caches on its
+first requests. `warm_up` does this work during startup instead:
+
+- `indexes`: creates the MongoDB indexes, see `db.indexes`,
+- `mongo`: opens the connection pool with concurrent pings,
+- `signing`: signs a token on every signing worker and verifies it,
+- `bcrypt`: hashes a password,
+- `caches`: builds the shared services and caches the status of recently
+  active users.
+
+The steps run concurrently, `caches` after `mongo`. A failed step is
+logged and reported by `/readyz` but does not stop the worker from serving.
+`retry_warm_up` then reruns the failed steps with backoff, so the worker
+turns ready once its dependencies recover. With the warmup disabled only
+`indexes` runs, so a worker started while MongoDB is down still serves.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from pymongo.uri_parser import parse_uri
+
+from auth_service import server
+from auth_service.api.dependencies import (
+    get_auth_service,
+    get_token_service,
+    get_user_service,
+)
+from auth_service.core.breached_passwords import get_breached_password_index
+from auth_service.core.config import settings
+from auth_service.core.signing import get_signing_executor
+from auth_service.core.token import TokenUtils
+from auth_service.db.connection import get_mongo_connection
+from auth_service.db.enums import TokenType
+from auth_service.db.indexes import ensure_indexes
+from auth_service.services.auth import pwd_context
+
+logger = logging.getLogger(__file__)
+
+WARMUP_STEPS = ("indexes", "mongo", "signing", "bcrypt", "caches")
+
+
+@dataclass
+class WarmupReport:
+    """Dataclass for the outcome of the warmup of this worker."""
+
+    started_at: float | None = None
+    finished_at: float | None = None
+    steps: dict[str, dict] = field(default_factory=dict)
+    required: tuple[str, ...] = WARMUP_STEPS
+
+    @property
+    def warm(self) -> bool:
+        """Whether every required step has completed successfully."""
+        return self.finished_at is not None and all(
+            self.steps.get(step, {}).get("ok") for step in self.required
+        )
+
+    def as_dict(self) -> dict:
+        """Return the report as served by `/readyz`."""
+        return {
+            "warm": self.warm,
+            "duration_seconds": (
+                round(self.finished_at - self.started_at, 3)
+                if self.finished_at is not None
+                else None
+            ),
+            "steps": self.steps,
+        }
+
+
+warmup_report = WarmupReport()
+
+
+def mongo_warmup_connections() -> int:
+    """Return the number of MongoDB connections to open during warmup.
+
+    Returns:
+        int: `WARMUP_MONGO_CONNECTIONS`, or the `minPoolSize` of MONGO_URI
+            when it is 0; at least 1.
+    """
+    connections = settings.WARMUP_MONGO_CONNECTIONS
+    if connections <= 0 and settings.MONGO_BACKEND == "mongo":
+        options = parse_uri(settings.MONGO_URI)["options"]
+        connections = options.get("minPoolSize", 0)
+    return max(connections, 1)
+
+
+def open_mongo_pool():
+    """Open connections by pinging the database from concurrent threads.
+
+    Each concurrent ping checks out its own pooled connection, so the pool
+    holds at least `mongo_warmup_connections()` sockets afterwards.
+    """
+    connections = mongo_warmup_connections()
+    db = get_mongo_connection().db
+    with ThreadPoolExecutor(max_workers=connections) as executor:
+        list(executor.map(lambda _: db.command("ping"), range(connections)))
+
+
+async def sign_and_verify():
+    """Sign a token on every signing worker and verify one of them."""
+    claims, _ = TokenUtils.build_claims(
+        {"username": "warmup"}, TokenType.BEARER
+    )
+    signer = get_signing_executor()
+    # Pool workers start on demand, one batch per worker starts them all.
+    batches = await asyncio.gather(
+        *(signer.sign([claims]) for _ in range(settings.SIGNING_WORKERS))
+    )
+    TokenUtils.decode_token(batches[0][0], TokenType.BEARER)
+
+
+def prime_caches() -> int:
+    """Build the shared services and fill their caches.
+
+    Returns:
+        int: The number of user statuses cached.
+    """
+    get_auth_service()
+    get_user_service()
+    get_breached_password_index()
+    if settings.WARMUP_PRIME_USERS <= 0:
+        return 0
+    return get_token_service().prime_status_cache(settings.WARMUP_PRIME_USERS)
+
+
+async def _run_step(name: str, step, *args) -> bool:
+    start = time.perf_counter()
+    try:
+        if asyncio.iscoroutinefunction(step):
+            await step(*args)
+        else:
+            await asyncio.to_thread(step, *args)
+    except Exception as e:  # pylint: disable=broad-except
+        logger.warning("Warmup step %s failed: %s", name, e)
+        warmup_report.steps[name] = {
+            "ok": False,
+            "seconds": round(time.perf_counter() - start, 3),
+            "error": str(e),
+        }
+        return False
+    warmup_report.steps[name] = {
+        "ok": True,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    return True
+
+
+def create_indexes():
+    """Create the MongoDB indexes of every collection."""
+    ensure_indexes(get_mongo_connection())
+
+
+def _pending(name: str) -> bool:
+    return name in warmup_report.required and not (
+        warmup_report.steps.get(name, {}).get("ok")
+    )
+
+
+async def _run_pending_steps():
+    """Run the steps that have not succeeded yet and record the outcome."""
+
+    async def mongo_then_caches():
+        if "mongo" not in warmup_report.required:
+            return
+        if _pending("mongo") and not await _run_step("mongo", open_mongo_pool):
+            warmup_report.steps["caches"] = {
+                "ok": False,
+                "error": "MongoDB unavailable",
+            }
+        elif _pending("caches"):
+            await _run_step("caches", prime_caches)
+
+    steps = [mongo_then_caches()]
+    if _pending("indexes"):
+        steps.append(_run_step("indexes", create_indexes))
+    if _pending("signing"):
+        steps.append(_run_step("signing", sign_and_verify))
+    if _pending("bcrypt"):
+        steps.append(_run_step("bcrypt", pwd_context.hash, "warmup"))
+    await asyncio.gather(*steps)
+    warmup_report.finished_at = time.perf_counter()
+    server.worker_stats.set(
+        server.worker_stats.slot, "warm", float(warmup_report.warm)
+    )
+
+
+async def warm_up(steps: tuple[str, ...] = WARMUP_STEPS) -> bool:
+    """Run the warmup steps and record the outcome.
+
+    Args:
+        steps (tuple[str, ...]): The steps to run, in `WARMUP_STEPS`.
+
+    Returns:
+        bool: True if every step succeeded.
+    """
+    warmup_report.started_at = time.perf_counter()
+    warmup_report.finished_at = None
+    warmup_report.steps.clear()
+    warmup_report.required = steps
+    await _run_pending_steps()
+    logger.info("Warmup finished: %s", warmup_report.as_dict())
+    return warmup_report.warm
+
+
+async def retry_warm_up():
+    """Rerun the failed warmup steps with backoff until the worker is warm.
+
+    Each attempt is bounded by `WARMUP_TIMEOUT_SECONDS`; a step still
+    running when it expires is retried on the next attempt.
+    """
+    delay = settings.WARMUP_RETRY_INITIAL_SECONDS
+    while not warmup_report.warm:
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, settings.WARMUP_RETRY_MAX_SECONDS)
+        try:
+            await asyncio.wait_for(
+                _run_pending_steps(), settings.WARMUP_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Warmup retry did not finish within %ss",
+                settings.WARMUP_TIMEOUT_SECONDS,
+            )
+    logger.info("Warmup recovered: %s", warmup_report.as_dict())